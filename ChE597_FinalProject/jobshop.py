@@ -21,8 +21,15 @@ Style Guide:
 - Always name the model as `model`.
 """
 
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solver_log import instrument
+from optlib.solvers import select
+
 # Create the Pyomo model
 model = pyo.ConcreteModel()
 
@@ -81,8 +88,8 @@ model.seq = pyo.Constraint(model.LESS, rule=sequencing_constraint, doc="Sequenci
 # Objective
 model.objective = pyo.Objective(expr=model.t, sense=pyo.minimize)
 
-# Solver setup and solve
-solver = pyo.SolverFactory('gurobi')
+# Solver setup and solve: Gurobi when installed, else the first available MILP solver
+solver = instrument(select('milp', prefer='appsi_gurobi'))
 result = solver.solve(model, tee=True)
 
 # Display results
@@ -21,8 +21,15 @@ Style Guide:
 - Always name the model as `model`.
 """
 
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solver_log import instrument
+from optlib.solvers import select
+
 # Assuming Task dictionary is already defined
 Task = {('A', 1) : {'dur': 5, 'prec': None},
         ('A', 3) : {'dur': 3, 'prec': ('A', 1)},
@@ -71,3 +78,9 @@ for (j, m) in model.TASKS:
             model.disjunctions.add(model.start[j, m] + model.dur[j, m] <= model.start[k, n] + bigM * (1 - model.y[(j, m), (k, n)]))
             model.disjunctions.add(model.start[k, n] + model.dur[k, n] <= model.start[j, m] + bigM * model.y[(j, m), (k, n)])
 
+# Solve when run as a script (the model stays importable); the termination condition shows the infeasibility
+if __name__ == '__main__':
+    # Gurobi when installed, else the first available MILP solver; the solve is logged by instrument
+    solver = instrument(select('milp', prefer='appsi_gurobi'))
+    result = solver.solve(model, tee=True)
+    print("Termination condition:", result.solver.termination_condition)
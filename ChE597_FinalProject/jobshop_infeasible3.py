@@ -21,8 +21,15 @@ Style Guide:
 - Always name the model as `model`.
 """
 
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solver_log import instrument
+from optlib.solvers import select
+
 # Assuming Task dictionary is already defined
 Task = {('A', 1) : {'dur': 5, 'prec': None},
         ('A', 3) : {'dur': 3, 'prec': ('A', 1)},
@@ -74,3 +81,10 @@ for (j, m) in model.TASKS:
 # Add conflicting precedence constraints
 model.conflicting_precedence = pyo.ConstraintList()
 model.conflicting_precedence.add(model.start['B', 3] + model.dur['B', 3] <= model.start['B', 2])  # Logically impossible
+
+# Solve when run as a script (the model stays importable); the termination condition shows the infeasibility
+if __name__ == '__main__':
+    # Gurobi when installed, else the first available MILP solver; the solve is logged by instrument
+    solver = instrument(select('milp', prefer='appsi_gurobi'))
+    result = solver.solve(model, tee=True)
+    print("Termination condition:", result.solver.termination_condition)
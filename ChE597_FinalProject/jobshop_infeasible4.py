@@ -21,8 +21,15 @@ Style Guide:
 - Always name the model as `model`.
 """
 
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solver_log import instrument
+from optlib.solvers import select
+
 # Assuming Task dictionary is already defined
 Task = {('A', 1) : {'dur': 5, 'prec': None},
         ('A', 3) : {'dur': 3, 'prec': ('A', 1)},
@@ -83,7 +90,8 @@ model.downtime.add(model.start['A', 3] + model.dur['A', 3] + model.slack['A'] <=
 model.downtime.add(model.start['B', 3] + model.dur['B', 3] + model.slack['B'] <= model.start['C', 1])  # Adjusted downtime with slack for B
 
 # Resolve the model with adjusted or removed constraints
-solver = pyo.SolverFactory('gurobi')
+# Gurobi when installed, else the first available MILP solver; the solve is logged by instrument
+solver = instrument(select('milp', prefer='appsi_gurobi'))
 result = solver.solve(model, tee=True)
 
 print("Makespan: ", pyo.value(model.makespan))
@@ -21,8 +21,16 @@ Style Guide:
 - Always name the model as `model`.
 """
 
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.bound_tightening import big_m_report, format_report
+from optlib.solver_log import instrument
+from optlib.solvers import select
+
 # Task setup with a direct cyclic dependency introduced
 Task = {
     ('A', 1): {'dur': 5, 'prec': None},
@@ -85,8 +93,12 @@ for (j, m) in Task:
         k, n = Task[(j, m)]['prec']
         model.preceding.add(model.start[k, n] + model.dur[k, n] <= model.start[j, m])
 
+# Replace bigM in every disjunction by the smallest value the variable bounds allow, and report the effect
+print(format_report(big_m_report(model)))
+
 # Solve the model again after breaking all potential cycles
-solver = pyo.SolverFactory('gurobi')
+# Gurobi when installed, else the first available MILP solver; the solve is logged by instrument
+solver = instrument(select('milp', prefer='appsi_gurobi'))
 result = solver.solve(model, tee=True)
 
 print("Makespan:", pyo.value(model.makespan))
@@ -21,8 +21,15 @@ Style Guide:
 - Always name the model as `model`.
 """
 
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solver_log import instrument
+from optlib.solvers import select
+
 # Create the Pyomo model
 model = pyo.ConcreteModel()
 
@@ -60,8 +67,8 @@ def end_cycle_inventory(model):
     return model.inventory[model.T.last()] >= model.initial_inventory
 model.end_cycle_con = pyo.Constraint(rule=end_cycle_inventory, doc='End cycle inventory constraint')
 
-# Solve the model
-solver = pyo.SolverFactory('gurobi')
+# Solve the model: Gurobi when installed, else the first available LP solver
+solver = instrument(select('lp', prefer='appsi_gurobi'))
 solver.solve(model, tee=True)
 
 # Print the results
@@ -1,5 +1,11 @@
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solvers import select
+
 def setup_cutting_stock_model():
     # Model and parameters setup
     model = pyo.ConcreteModel()
@@ -34,7 +40,7 @@ widths = [25, 35, 40]
 
 # Create and solve the model
 model = setup_cutting_stock_model()
-solver = pyo.SolverFactory('gurobi')
+solver = select('milp', prefer='appsi_gurobi')
 result = solver.solve(model, tee=True)
 
 # Output results
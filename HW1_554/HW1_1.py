@@ -1,4 +1,12 @@
+import os
+import sys
+
 import pyomo.environ as pyo
+from scipy.stats import norm
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.gross_error import gross_error_tests, serial_elimination
+from optlib.reconciliation import Reconciler, balance_matrix
 
 # Create the data reconcilation model
 m = pyo.ConcreteModel()
@@ -78,37 +86,61 @@ m.c9 = pyo.Constraint(rule=c9_rule)
 m.c10 = pyo.Constraint(rule=c10_rule)
 m.c11 = pyo.Constraint(rule=c11_rule)
 
-# Solve the model
-solver = pyo.SolverFactory('ipopt')
-result = solver.solve(m)
+# Closed-form reconciliation: the same balances as (inlets, outlets) per node, projected once
+balances = [
+    ([1, 2, 4], [3]),                   # c1
+    ([7, 8], [5, 6, 9]),                # c2
+    ([5], [10, 1]),                     # c3
+    ([10, 11], [12]),                   # c4
+    ([3, 13], [11, 14, 15, 16, 17]),    # c5
+    ([6], [2, 13]),                     # c6
+    ([14, 18], [7, 19, 20, 21]),        # c7
+    ([15, 22], [18, 23, 24]),           # c8
+    ([12, 16], [22, 25]),               # c9
+    ([23, 27, 19], [26]),               # c10
+    ([20, 26, 28], [8]),                # c11
+]
+streams = list(range(1, 29))
+reconciler = Reconciler(balance_matrix(streams, balances), [std_devs[i] for i in streams])
+reconciled = reconciler.reconcile([measured_flows[i] for i in streams])
 
 # Display the results
-for i in range(1, 29):
-    print('F[{}] = {:.2f}'.format(i, m.F[i].value))
-
-from scipy.stats import norm
+for i, value in zip(streams, reconciled['x']):
+    print('F[{}] = {:.2f}'.format(i, value))
 
-# Reconciled flow values from Part A for the involved nodes
-reconciled_flows = {
-    7: 2.31, 18: 16.32, 19: 8.0, 20: 10.44, 21: 87.79
-}
-
-# Calculate the expected value for F[14] based on the mass balance at node 7
-# F[14] + F[18] = F[7] + F[19] + F[20] + F[21]
-expected_F14 = reconciled_flows[7] + reconciled_flows[19] + reconciled_flows[20] + reconciled_flows[21] - reconciled_flows[18]
-# expected_F14 = 125.21 # Case for Node 5
-
-# Given standard deviation for flow 14
-std_dev_F14 = 3
-
-# Z-score for 90% confidence interval (one-tailed test)
+# Cross-check with IPOPT when it is installed
+solver = pyo.SolverFactory('ipopt')
+if solver.available(exception_flag=False):
+    result = solver.solve(m)
+    difference = max(abs(m.F[i].value - value) for i, value in zip(streams, reconciled['x']))
+    print(f'Largest difference to IPOPT: {difference:.2e}')
+
+# Gross-error analysis from the reconciliation covariance: global chi-square test, a nodal test for every
+# balance and a measurement test for every stream at once, at the 10% level
+tests = gross_error_tests(reconciler, [measured_flows[i] for i in streams], alpha=0.10)
+print(f"Global test: {tests['global']:.4f} (critical {tests['global_critical']:.4f}, {tests['dof']} degrees of freedom)")
+for node, z, suspect in zip(range(1, len(balances) + 1), tests['nodal'], tests['nodal_suspects']):
+    print(f"Node {node}: z = {z:.4f}" + (" suspect" if suspect else ""))
+print(f"Nodal critical value: {tests['nodal_critical']:.4f}")
+for i, z, suspect in zip(streams, tests['measurement'], tests['measurement_suspects']):
+    print(f"F[{i}]: z = {z:.4f}" + (" suspect" if suspect else ""))
+print(f"Measurement critical value: {tests['measurement_critical']:.4f}")
+
+# Serial elimination: suspect meters are dropped one at a time until the tests pass
+elimination = serial_elimination(reconciler, [measured_flows[i] for i in streams], alpha=0.10)
+for (j, z, gamma), bias in zip(elimination['steps'], elimination['bias']):
+    print(f"Eliminated F[{streams[j]}]: z = {z:.4f}, global test {gamma:.4f} before, estimated gross error {bias:.4f}")
+print(f"Global test after elimination: {elimination['global']:.4f} (critical {elimination['global_critical']:.4f})")
+
+# Expected value of F[14] from the balance at node 7, F[14] + F[18] = F[7] + F[19] + F[20] + F[21],
+# with the reconciled flows of the other streams, and its 90% range
+x = dict(zip(streams, reconciled['x']))
+expected_F14 = x[7] + x[19] + x[20] + x[21] - x[18]
 z_score_90 = norm.ppf(0.90)
-
-# Calculate the range for F[14]
-lower_bound_F14 = expected_F14 - z_score_90 * std_dev_F14
-upper_bound_F14 = expected_F14 + z_score_90 * std_dev_F14
+lower_bound_F14 = expected_F14 - z_score_90 * std_devs[14]
+upper_bound_F14 = expected_F14 + z_score_90 * std_devs[14]
 
 # Output the expected value and the range
 print(f'Expected value for F[14]: {expected_F14}')
 print(f'Lower bound for F[14] at 90% confidence: {lower_bound_F14}')
-print(f'Upper bound for F[14] at 90% confidence: {upper_bound_F14}')
\ No newline at end of file
+print(f'Upper bound for F[14] at 90% confidence: {upper_bound_F14}')
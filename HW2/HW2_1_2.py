@@ -44,96 +44,44 @@
 
 # Problem 1.2 part (i) Gradient descent with backtracking line search
 # You can uncomment the following code to run it.
+import os
+import sys
+
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.autodiff import AutoDiff
+from optlib.descent import gradient_descent
+from optlib.newton import newton_method
+from optlib.problems import log_sum_exp, log_sum_exp_start
+
 # Define the function f
-def f(x1, x2, x3):
-    return x3 * np.log(np.exp(x1/x3) + np.exp(x2/x3)) + (x3 - 2)**2 + np.exp(1/(x1 + x2))
-
-# Gradient of the function f for numerical approximation
-def numerical_gradient(f, x1, x2, x3, h=1e-5):
-    grad = np.zeros(3)
-    for i in range(3):
-        x = np.array([x1, x2, x3])
-        x[i] += h
-        grad[i] = (f(*x) - f(x1, x2, x3)) / h
-    
-    return grad
-
-# Backtracking line search
-def backtracking_line_search(f, x1, x2, x3, grad, alpha=0.4, beta=0.5):
-    t = 1
-    while f(x1 - t*grad[0], x2 - t*grad[1], x3 - t*grad[2]) > f(x1, x2, x3) - alpha*t*np.linalg.norm(grad)**2:
-        t *= beta
-    
-    return t
-
-# Gradient descent with backtracking line search
-def gradient_descent(f, x1, x2, x3, alpha=0.4, beta=0.5, max_iter=1000, tol=1e-5):
-    for i in range(max_iter):
-        grad = numerical_gradient(f, x1, x2, x3)
-        if np.linalg.norm(grad) < tol:
-            break
-        t = backtracking_line_search(f, x1, x2, x3, grad, alpha, beta)
-        x1 -= t*grad[0]
-        x2 -= t*grad[1]
-        x3 -= t*grad[2]
-    
-    return x1, x2, x3
+# f(x) = x3 * log(exp(x1/x3) + exp(x2/x3)) + (x3 - 2)^2 + exp(1/(x1 + x2)), written for n variables
+# and for a batch of points (one point per row), so the derivative engine evaluates all perturbations at once
+f = log_sum_exp
+
+# Derivatives: exact automatic differentiation, or FiniteDifference(f, scheme='forward') as in the original code
+derivatives = AutoDiff(f)
 
 # Run gradient descent with backtracking line search
-x1, x2, x3 = gradient_descent(f, 1.1, 1.1, 1.1)
-print('x1 =', x1)
-print('x2 =', x2)
-print('x3 =', x3)
-print('min_f =', f(x1, x2, x3))
+x, iterations = gradient_descent(f, log_sum_exp_start(3), derivatives)
+print('x1 =', x[0])
+print('x2 =', x[1])
+print('x3 =', x[2])
+print('min_f =', f(x))
+print('iterations =', iterations)
 
 # Problem 1.2 part (ii) Newton's method
 # You can uncomment the following code to run it.
-import numpy as np
-
-# Define the function f
-def f(x1, x2, x3):
-    return x3 * np.log(np.exp(x1/x3) + np.exp(x2/x3)) + (x3 - 2)**2 + np.exp(1/(x1 + x2))
-
-# Gradient of the function f for numerical approximation
-def numerical_gradient(f, x1, x2, x3, h=1e-5):
-    grad = np.zeros(3)
-    for i in range(3):
-        x = np.array([x1, x2, x3])
-        x[i] += h
-        grad[i] = (f(*x) - f(x1, x2, x3)) / h
-    
-    return grad
-
-# Hessian of the function f for numerical approximation
-def numerical_hessian(f, x1, x2, x3, h=1e-5):
-    hessian = np.zeros((3, 3))
-    for i in range(3):
-        for j in range(3):
-            x = np.array([x1, x2, x3])
-            x[i] += h
-            x[j] += h
-            hessian[i, j] = (f(*x) - f(x1, x2, x3) - f(x1 + h, x2 - h, x3 - h) + f(x1 + h, x2, x3) + f(x1, x2 - h, x3) + f(x1, x2, x3 - h)) / h**2
-    
-    return hessian
-
-# Newton's method
-def newton(f, x1, x2, x3, max_iter=10000, tol=1e-5):
-    for i in range(max_iter):
-        grad = numerical_gradient(f, x1, x2, x3)
-        hessian = numerical_hessian(f, x1, x2, x3)
-        if np.linalg.norm(grad) < tol:
-            break
-        x = np.array([x1, x2, x3])
-        x -= np.linalg.inv(hessian) @ grad
-        x1, x2, x3 = x
-    
-    return x1, x2, x3
-
-# Run Newton's method
-x1, x2, x3 = newton(f, 1.1, 1.1, 1.1)
-print('x1 =', x1)
-print('x2 =', x2)
-print('x3 =', x3)
-print('min_f =', f(x1, x2, x3))
+derivatives = AutoDiff(f)
+
+# Run Newton's method: Cholesky solves with modified-Cholesky regularization, Armijo line search
+# and a trust-region fallback. Set freeze=k to reuse each Hessian factorization for k further iterations.
+result = newton_method(f, log_sum_exp_start(3), derivatives, tol=1e-5)
+x = result['x']
+print('x1 =', x[0])
+print('x2 =', x[1])
+print('x3 =', x[2])
+print('min_f =', f(x))
+print('iterations =', result['nit'])
+print('Hessian factorizations =', result['nfact'])
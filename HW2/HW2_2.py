@@ -44,55 +44,37 @@ print('min_f =', min_f)
 
 # Problem 2 Quasi-Newton method (BFGS method)
 # You can uncomment the following code to run it.
-import numpy as np
-
-# Define the function f
-def f(x1, x2, x3):
-    return x3 * np.log(np.exp(x1/x3) + np.exp(x2/x3)) + (x3 - 2)**2 + np.exp(1/(x1 + x2))
+import os
+import sys
 
-# Gradient of the function f for numerical approximation
-def numerical_gradient(f, x, h=1e-5):
-    grad = np.zeros(3)
-    for i in range(3):
-        x_plus_h = np.copy(x)
-        x_plus_h[i] += h
-        grad[i] = (f(*x_plus_h) - f(*x)) / h
-    return grad
+import numpy as np
 
-# Hessian of the function f for numerical approximation
-def numerical_hessian(f, x, h=1e-5):
-    hessian = np.zeros((3, 3))
-    for i in range(3):
-        for j in range(3):
-            x_plus_h = np.copy(x)
-            x_plus_h[i] += h
-            x_plus_h[j] += h
-            hessian[i, j] = (f(*x_plus_h) - f(*x) - numerical_gradient(f, x, h)[i]*h - numerical_gradient(f, x, h)[j]*h) / (h**2)
-    return hessian
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.autodiff import AutoDiff
+from optlib.descent import quasi_newton_method
+from optlib.lbfgs import lbfgs
+from optlib.problems import log_sum_exp, log_sum_exp_start
 
-# Quasi-Newton method (BFGS method)
-def quasi_newton_method(f, x_init, h=1e-5, tol=1e-5, max_iter=10000):
-    x = np.copy(x_init)
-    grad = numerical_gradient(f, x, h)
-    H = np.linalg.inv(numerical_hessian(f, x, h))
-    for i in range(max_iter):
-        p = -H @ grad
-        x_new = x + p
-        if np.linalg.norm(x_new - x) < tol:
-            break
-        grad_new = numerical_gradient(f, x_new, h)
-        s = x_new - x
-        y = grad_new - grad
-        rho = 1.0 / (y @ s)
-        H = (np.eye(3) - rho * np.outer(s, y)) @ H @ (np.eye(3) - rho * np.outer(y, s)) + rho * np.outer(s, s)
-        x = x_new
-        grad = grad_new
-    return x
+# Define the function f
+# f(x) = x3 * log(exp(x1/x3) + exp(x2/x3)) + (x3 - 2)^2 + exp(1/(x1 + x2)), written for n variables
+f = log_sum_exp
 
 # Run quasi-Newton method (BFGS method)
-x_init = np.array([1.1, 1.1, 1.1])
-x1, x2, x3 = quasi_newton_method(f, x_init)
+x_init = log_sum_exp_start(3)
+x, iterations = quasi_newton_method(f, x_init, AutoDiff(f))
+x1, x2, x3 = x
+print('x1 =', x1)
+print('x2 =', x2)
+print('x3 =', x3)
+print('min_f =', f(x))
+print('iterations =', iterations)
+
+# Limited-memory BFGS: two-loop recursion over the last m (s, y) pairs and a strong Wolfe
+# line search, so memory and cost per step are O(mn) instead of O(n^2)
+result = lbfgs(f, x_init, AutoDiff(f), m=10)
+x1, x2, x3 = result['x']
 print('x1 =', x1)
 print('x2 =', x2)
 print('x3 =', x3)
-print('min_f =', f(x1, x2, x3))
+print('min_f =', result['fun'])
+print('iterations =', result['nit'])
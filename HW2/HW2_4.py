@@ -1,5 +1,13 @@
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.column_generation import path_column_generation
+from optlib.solver_log import instrument
+from optlib.sparse_lp import multicommodity_flow_lp
+
 # Create a concrete model
 model = pyo.ConcreteModel()
 
@@ -38,23 +46,42 @@ def flow_conservation_rule(model, n, k):
     if n == source[k]:  # Source node for commodity k
         return sum(model.flow[k, (i, j)] for i, j in edges if i == n) == demands[k]
     elif n == sink[k]:  # Sink node for commodity k
-        return sum(model.flow[k, (i, j)] for i, j in edges if j == n) - sum(model.flow[k, (i, j)] for i, j in edges if i == n) == -demands[k]
+        return sum(model.flow[k, (i, j)] for i, j in edges if j == n) - sum(model.flow[k, (i, j)] for i, j in edges if i == n) == demands[k]
     else:  # Intermediate nodes
         return sum(model.flow[k, (i, j)] for i, j in edges if j == n) - sum(model.flow[k, (i, j)] for i, j in edges if i == n) == 0
 
 model.flow_conservation = pyo.Constraint(nodes, commodities, rule=flow_conservation_rule)
 
-# Solve
-solver = pyo.SolverFactory('gurobi')  
-solution = solver.solve(model, tee=True)
-
-# Check if the solution is feasible
-if (solution.solver.status == pyo.SolverStatus.ok) and (solution.solver.termination_condition == pyo.TerminationCondition.optimal):
-    # Print the results
+# Solve in matrix form: sparse arrays passed to HiGHS in memory, no expression building
+result = multicommodity_flow_lp(nodes, edges, commodities, source, sink, demands, costs, capacities).solve()
+if result['success']:
     for k in commodities:
         for e in edges:
-            print(f"Flow of commodity {k} through edge {e}: {model.flow[k, e].value}")
+            print(f"Flow of commodity {k} through edge {e}: {result['x']['flow'][k, e]}")
+    print(f"Total cost: {result['objective']}")
 else:
     print("No feasible solution found")
 
+# Path formulation by column generation: each commodity ships over a few source-sink paths
+paths = path_column_generation(nodes, edges, commodities, source, sink, demands, costs, capacities)
+if paths['status'] == 'optimal':
+    for k in sorted(commodities):
+        for route, f in paths['paths'][k]:
+            print(f"Commodity {k} ships {f} along {' -> '.join(route)}")
+    print(f"Total cost (paths): {paths['objective']}")
+else:
+    print(f"Column generation ended with status {paths['status']}")
+
+# Cross-check the Pyomo model with Gurobi when it is installed
+solver = instrument(pyo.SolverFactory('gurobi'))
+if solver.available(exception_flag=False):
+    solution = solver.solve(model, tee=True)
 
+    # Check if the solution is feasible
+    if (solution.solver.status == pyo.SolverStatus.ok) and (solution.solver.termination_condition == pyo.TerminationCondition.optimal):
+        # Print the results
+        for k in commodities:
+            for e in edges:
+                print(f"Flow of commodity {k} through edge {e}: {model.flow[k, e].value}")
+    else:
+        print("No feasible solution found")
@@ -1,5 +1,11 @@
-import pyomo.environ as pyo
+import os
+import sys
+
 import numpy as np
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solvers import select
 
 m = pyo.ConcreteModel()
 
@@ -16,7 +22,8 @@ def Cost(m):
 
 m.Cost = pyo.Objective(rule=Cost, sense=pyo.minimize)
 
-solver = pyo.SolverFactory('gams,')
+# A local NLP solver (IPOPT, CONOPT, or scipy's trust-constr)
+solver = select('nlp')
 solver.solve(m)
 
 print(f"Optimal radius: {m.r.value:.4f} m")
@@ -1,36 +1,29 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import minimize
 
-def barrier_method_bfgs(x0, t0=1, mu=4, epsilon=1e-4):
-    def objective(x):
-        x1, x2 = x
-        return 3 / (x1 + x2) + x2 + np.exp(x1) + (x1 - x2)**2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib import barrier
+from optlib.problems import hw5_constraints, hw5_objective
 
-    def barrier(x, t):
-        x1, x2 = x
-        # Using very small values to avoid log(0)
-        return -1/t * (np.log(max(x1, 1e-10)) + np.log(max(x2, 1e-10)) + 
-                       np.log(max(2 - x1**2 - x2**2, 1e-10)) + 
-                       np.log(max(1 - x1 + x2, 1e-10)))
-
-    def augmented_objective(x, t):
-        return objective(x) + barrier(x, t)
-    
-    path = [x0]  # To track the path of x
-    t = t0
-    x_current = np.array(x0)
-
-    while 1/t > epsilon:
-        # Minimize the augmented objective function using the BFGS method
-        res = minimize(lambda x: augmented_objective(x, t), x_current, method='BFGS', options={'disp': False})
-        
-        x_current = res.x
-        path.append(x_current.tolist())  # Update the path
-        
-        t *= mu  # Update the barrier parameter
-    
-    return x_current, path
+def barrier_method_bfgs(x0, t0=1, mu=4, epsilon=1e-4, warm_start=True):
+    # objective(x) returns the value and the analytic gradient of
+    # 3 / (x1 + x2) + x2 + exp(x1) + (x1 - x2)**2
+    # constraints(x) returns g(x) = (-x1, -x2, x1^2 + x2^2 - 2, x1 - x2 - 1) <= 0 and its Jacobian.
+    # The barrier -1/t * sum(log(-g(x))) and its gradient are formed from them; points with
+    # g(x) >= 0 are rejected by the line search instead of clamping the logarithms.
+
+    # Each outer iteration starts from the previous x and, with warm_start, the previous
+    # inverse Hessian approximation instead of restarting BFGS from scratch
+    result = barrier.barrier_method_bfgs(hw5_objective, hw5_constraints, x0, t0=t0, mu=mu, epsilon=epsilon,
+                                         warm_start=warm_start)
+
+    for k, h in enumerate(result['history']):
+        print(f"Outer step {k}: t = {h['t']:g}, BFGS iterations = {h['iterations']}, evaluations = {h['nfev']}")
+
+    return result['x'], [x.tolist() for x in result['path']]
 
 def objective(x):
         x1, x2 = x
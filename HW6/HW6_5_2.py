@@ -1,5 +1,13 @@
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.network import min_cost_flow_model
+from optlib.network_simplex import network_simplex
+from optlib.solver_log import instrument
+
 # Data
 nodes = [1, 2, 3, 4, 5, 6, 7, 8]
 edges = [
@@ -52,58 +60,38 @@ capacities = {
     (4, 7): float('inf'),
 }
 
-# Model
-model = pyo.ConcreteModel()
-
-# Sets
-model.Nodes = pyo.Set(initialize=nodes)
-model.Edges = pyo.Set(dimen=2, initialize=edges)
-
-# Parameters
-model.Demands = pyo.Param(model.Nodes, initialize=demands)
-model.Costs = pyo.Param(model.Edges, initialize=costs)
-model.Capacities = pyo.Param(model.Edges, initialize=capacities)
-
-# Variables
-model.Flow = pyo.Var(model.Edges, within=pyo.NonNegativeReals)
-
-
-# Objective
-def objective_function(model):
-    return sum(model.Costs[e] * model.Flow[e] for e in model.Edges)
-
-
-model.Objective = pyo.Objective(rule=objective_function, sense=pyo.minimize)
-
-
-# Constraints
-def flow_conservation_rule(model, node):
-    inflows = sum(model.Flow[(i, node)] for i in nodes if (i, node) in edges)
-    outflows = sum(model.Flow[(node, j)] for j in nodes if (node, j) in edges)
-    return inflows - outflows == model.Demands[node]
-
-
-model.FlowConservation = pyo.Constraint(model.Nodes, rule=flow_conservation_rule)
+# Solve with the native network simplex (spanning-tree basis, candidate-list pricing)
+result = network_simplex(nodes, edges, demands, costs, capacities)
+print(f"Network simplex: {result['status']} after {result['iterations']} pivots")
 
+# Display the flow on each edge
+for edge in edges:
+    print(f"Flow on edge {edge}: {result['flow'][edge]}")
 
-def capacity_constraints(model, i, j):
-    return model.Flow[(i, j)] <= model.Capacities[(i, j)]
+# Node potentials (duals of the flow conservation constraints, relative to node 1)
+for node in nodes:
+    print(f"Potential of node {node}: {result['potential'][node]}")
 
+# Display the total cost
+print(f"Total cost: {result['cost']:,}")
 
-model.CapacityConstraints = pyo.Constraint(model.Edges, rule=capacity_constraints)
+# Model
+# Conservation rows come from per-node in/out arc lists; only finite capacities get a row
+model = min_cost_flow_model(nodes, edges, demands, costs, capacities)
 
-# Solve using Gurobi with the primal simplex algorithm
-solver = pyo.SolverFactory('gurobi')
-solver.options['Method'] = 0  # For primal simplex
-results = solver.solve(model, tee=True)
+# Cross-check with Gurobi's primal simplex algorithm when it is installed
+solver = instrument(pyo.SolverFactory('gurobi'))
+if solver.available(exception_flag=False):
+    solver.options['Method'] = 0  # For primal simplex
+    results = solver.solve(model, tee=True)
 
-# Display results
-model.display()
-print(results)
+    # Display results
+    model.display()
+    print(results)
 
-# Display the flow on each edge
-for edge in edges:
-    print(f"Flow on edge {edge}: {model.Flow[edge].value}")
+    # Display the flow on each edge
+    for edge in edges:
+        print(f"Flow on edge {edge}: {model.Flow[edge].value}")
 
-# Display the total cost
-print(f"Total cost: {model.Objective():,}")
+    # Display the total cost
+    print(f"Total cost: {model.Objective():,}")
@@ -1,5 +1,13 @@
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.network import min_cost_flow_model
+from optlib.parametric import ParametricFlow
+from optlib.solver_log import instrument
+
 # Data
 nodes = [1, 2, 3, 4, 5, 6, 7, 8]
 edges = [
@@ -53,61 +61,42 @@ capacities = {
 }
 
 # Model
-model = pyo.ConcreteModel()
-
-# Sets
-model.Nodes = pyo.Set(initialize=nodes)
-model.Edges = pyo.Set(dimen=2, initialize=edges)
-
-# Parameters
-model.Demands = pyo.Param(model.Nodes, initialize=demands)
-model.Costs = pyo.Param(model.Edges, initialize=costs)
-model.Capacities = pyo.Param(model.Edges, initialize=capacities)
-
-# Variables
-model.Flow = pyo.Var(model.Edges, within=pyo.NonNegativeReals)
-
-
-# Objective
-def objective_function(model):
-    return sum(model.Costs[e] * model.Flow[e] for e in model.Edges)
-
-
-model.Objective = pyo.Objective(rule=objective_function, sense=pyo.minimize)
-
-
-# Constraints
-def flow_conservation_rule(model, node):
-    inflows = sum(model.Flow[(i, node)] for i in nodes if (i, node) in edges)
-    outflows = sum(model.Flow[(node, j)] for j in nodes if (node, j) in edges)
-    return inflows - outflows == model.Demands[node]
-
-
-model.FlowConservation = pyo.Constraint(model.Nodes, rule=flow_conservation_rule)
-
-
-def capacity_constraints(model, i, j):
-    return model.Flow[(i, j)] <= model.Capacities[(i, j)]
-
-
-model.CapacityConstraints = pyo.Constraint(model.Edges, rule=capacity_constraints)
-
-# Solve using Gurobi with the barrier's algorithm
-solver = pyo.SolverFactory('gurobi')
-solver.options['Method'] = 2  # For barrier's algorithm
-solver.options['Crossover'] = 0  # Disable crossover
-results = solver.solve(model, tee=True)
-
-# Display results
-model.display()
-print(results)
-
-# Display the flow on each edge
-# for edge in edges:
-#     print(f"Flow on edge {edge}: {model.Flow[edge].value:.2f}")
-
-for edge in edges:
-    print(f"Flow on edge {edge}: {model.Flow[edge].value}")
-
-# Display the total cost
-print(f"Total cost: {model.Objective()}")
+# Conservation rows come from per-node in/out arc lists; only finite capacities get a row
+model = min_cost_flow_model(nodes, edges, demands, costs, capacities)
+
+# Solve the LP once in a persistent HiGHS model
+network = ParametricFlow(nodes, edges, demands, costs, capacities)
+result = network.solve()
+for edge, flow in zip(edges, result['flow']):
+    print(f"Flow on edge {edge}: {flow}")
+print(f"Total cost: {result['objective']}")
+
+# Parametric analysis: the capacity of arcs (3,4) and (4,3) swept over 0..200, every value
+# warm-started from the basis of the previous one instead of rebuilding the model
+sweep = network.sweep(range(0, 201), capacity=[(3, 4), (4, 3)])
+print(f"Capacity sweep: {len(sweep['values'])} values, {sum(sweep['iterations'])} simplex iterations in total")
+print("Breakpoints of the optimal cost (capacity, cost):")
+for t, z in sweep['breakpoints']:
+    print(f"  {t:.4f}  {z:.4f}")
+print("Slope of the optimal cost per unit of capacity on each segment:")
+knots = [sweep['values'][0]] + [t for t, _ in sweep['breakpoints']] + [sweep['values'][-1]]
+for lo, hi in zip(knots[:-1], knots[1:]):
+    k = min(range(len(sweep['values'])), key=lambda k: abs(sweep['values'][k] - (lo + hi) / 2))
+    print(f"  [{lo:.4f}, {hi:.4f}]: {sweep['slope'][k]:.4f}")
+
+# Cross-check with Gurobi's barrier algorithm when it is installed
+solver = instrument(pyo.SolverFactory('gurobi'))
+if solver.available(exception_flag=False):
+    solver.options['Method'] = 2  # For barrier's algorithm
+    solver.options['Crossover'] = 0  # Disable crossover
+    results = solver.solve(model, tee=True)
+
+    # Display results
+    model.display()
+    print(results)
+
+    for edge in edges:
+        print(f"Flow on edge {edge}: {model.Flow[edge].value}")
+
+    # Display the total cost
+    print(f"Total cost: {model.Objective()}")
@@ -1,99 +1,22 @@
-import pyomo.environ as pyo
-
-m= pyo.ConcreteModel()
-
-# SETS
-S = ['A','B','C']   # Substances
-I = [1,2,3]   # Processes
-
-# PARAMETERS
-m.c_fix = pyo.Param(I, initialize={1:10, 2:15, 3:20})   # Fixed cost of process i [100$/hr]
-m.c_var = pyo.Param(I, initialize={1:2.5, 2:4, 3:5.5})   # Variable cost of process i [100$/ton raw]
-
-m.x = pyo.Param(I, initialize={1:0.9, 2:0.82, 3:0.95})   # Conversion of process i [*]
-
-m.p_s = pyo.Param(S, initialize={'A':5, 'B':9.5, 'C':-18}) # Price of selling (if negative) or buying (if positive) substance s [100$/ton]
-
-AUB = 16 # Maximum supply of A [ton/hr]
-CUB = 10 # Maximum demand of C [ton/hr], case1: 10, case2: 15
-
-BUB = CUB/0.82 # Upper bound of B [ton/hr]
-
-
-# VARIABLES
-m.y = pyo.Var(I, within=pyo.Binary) # If we install process p
-
-m.A = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,AUB)) # The amount of A we buy [ton/hr]
-m.B_buy = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we buy [ton/hr]
-m.B_prod = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we produce in process 1 [ton/hr]
-m.B2 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we put in process 2 [ton/hr]
-m.B3 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we put in process 3 [ton/hr]
-m.C2 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,CUB)) # The amount of C we produce in process 2 [ton/hr]
-m.C3 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,CUB)) # The amount of C we produce in process 3 [ton/hr]
-m.C = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,CUB)) # The amount of C we produce in total [ton/hr]
-
-# CONSTRAINTS
-@m.Constraint()
-def exclusive(m):
-    return m.y[2] + m.y[3] == 1
-
-@m.Constraint()
-def balance_A(m):
-    return m.A * m.x[1] == m.B_prod
+import os
+import sys
 
-@m.Constraint()
-def balance_B(m):
-    return m.B_buy + m.B_prod == m.B2 + m.B3
-
-@m.Constraint()
-def balance_C(m):
-    return m.C2 + m.C3 == m.C
-
-@m.Constraint()
-def balance_C2(m):
-    return m.C2 == m.B2 * m.x[2]
-
-@m.Constraint()
-def balance_C3(m):
-    return m.C3 == m.B3 * m.x[3]
-
-@m.Constraint()
-def A_activation(m):
-    return m.A <= AUB * m.y[1]
-
-@m.Constraint()
-def B_product_activation(m):
-    return m.B_prod <= BUB * m.y[1]
-
-@m.Constraint()
-def b_act_2(m):
-    return m.B2 <= BUB * m.y[2]
-
-@m.Constraint()
-def b_act_3(m):
-    return m.B3 <= BUB * m.y[3]
-
-@m.Constraint()
-def c_act_2(m):
-    return m.C2 <= CUB * m.y[2]
-
-@m.Constraint()
-def c_act_3(m):
-    return m.C3 <= CUB * m.y[3]
+import pyomo.environ as pyo
 
-@m.Objective()
-def obj(m):
-    fixed_costs = sum( m.c_fix[i]*m.y[i] for i in I)
-    variable_costs = m.c_var[1]*m.A +  m.c_var[2]*m.B2 + m.c_var[3]*m.B3
-    prices = m.p_s['A']*m.A + m.p_s['B']*m.B_buy + m.p_s['C']*m.C 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solver_log import instrument
+from optlib.solvers import select
+from optlib.synthesis import hw7_tables, process_model, superstructure_model
 
-    return fixed_costs + variable_costs + prices
+# Case 1: C sells up to its demand CUB = 10 [ton/hr] and no more (model in optlib/synthesis.py)
+m = process_model(AUB=16, CUB=10, CXUB=0)
 
-opt = pyo.SolverFactory('gams', solver='cplex')
+# GAMS/CPLEX as in the homework, the first available MILP solver when GAMS is not installed
+opt = instrument(select('milp', prefer='gams:cplex'))
 results = opt.solve(m, tee=True)
 
 for i in [2,3]:
-    if pyo.value(m.y[i]) == 1:
+    if round(pyo.value(m.y[i])) == 1:
         rta = i
 
 print('Build Process:', rta)
@@ -103,4 +26,13 @@ print('Produce', round(pyo.value(m.B_prod),1), 'of B')
 print('Put', round(pyo.value(m.B2),1), 'of B in process 2')
 print('Put', round(pyo.value(m.B3),1), 'of B in process 3')
 print('Produce', round(pyo.value(m.C),1), 'of C')
-print('The profit of the operation is:',round(-100*(pyo.value(m.obj)),1),'$/hr')
\ No newline at end of file
+print('The profit of the operation is:',round(-100*(pyo.value(m.obj)),1),'$/hr')
+
+
+# The same network generated from process and substance tables, with processes 2 and 3 as the required alternatives
+processes, substances = hw7_tables()
+superstructure = superstructure_model(processes, substances, required=['C'])
+pyo.SolverFactory('appsi_highs').solve(superstructure)
+print('Superstructure from tables: build process',
+      [p for p in superstructure.P if p != 1 and round(pyo.value(superstructure.y[p])) == 1][0],
+      'with profit', round(-100*(pyo.value(superstructure.obj)),1),'$/hr')
@@ -1,101 +1,23 @@
-import pyomo.environ as pyo
-
-m= pyo.ConcreteModel()
-
-# SETS
-S = ['A','B','C']   # Substances
-I = [1,2,3]   # Processes
-
-# PARAMETERS
-m.c_fix = pyo.Param(I, initialize={1:10, 2:15, 3:20})   # Fixed cost of process i [100$/hr]
-m.c_var = pyo.Param(I, initialize={1:2.5, 2:4, 3:5.5})   # Variable cost of process i [100$/ton raw]
-
-m.x = pyo.Param(I, initialize={1:0.9, 2:0.82, 3:0.95})   # Conversion of process i [*]
-
-m.p_s = pyo.Param(S, initialize={'A':5, 'B':9.5, 'C':-18}) # Price of selling (if negative) or buying (if positive) substance s [100$/ton]
-
-AUB = 16 # Maximum supply of A [ton/hr]
-CUB = 15 # Maximum demand of C [ton/hr], case1: 10, case2: 15
-
-BUB = CUB/0.82 # Upper bound of B [ton/hr]
-
-
-# VARIABLES
-m.y = pyo.Var(I, within=pyo.Binary) # If we install process p
-
-m.A = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,AUB)) # The amount of A we buy [ton/hr]
-m.B_buy = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we buy [ton/hr]
-m.B_prod = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we produce in process 1 [ton/hr]
-m.B2 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we put in process 2 [ton/hr]
-m.B3 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,BUB)) # The amount of B we put in process 3 [ton/hr]
-m.C2 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,CUB)) # The amount of C we produce in process 2 [ton/hr]
-m.C3 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,CUB)) # The amount of C we produce in process 3 [ton/hr]
-m.C = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,10)) # The amount of C we produce in total up to 10 [ton/hr]
-m.C_extra = pyo.Var(within=pyo.NonNegativeReals, bounds=(0,5)) # The amount of C we sell as excess [ton/hr]
-m.C_total = m.C + m.C_extra
-
-# CONSTRAINTS
-@m.Constraint()
-def exclusive(m):
-    return m.y[2] + m.y[3] == 1
+import os
+import sys
 
-@m.Constraint()
-def balance_A(m):
-    return m.A * m.x[1] == m.B_prod
-
-@m.Constraint()
-def balance_B(m):
-    return m.B_buy + m.B_prod == m.B2 + m.B3
-
-@m.Constraint()
-def balance_C(m):
-    return m.C2 + m.C3 == m.C + m.C_extra
-
-@m.Constraint()
-def balance_C2(m):
-    return m.C2 == m.B2 * m.x[2]
-
-@m.Constraint()
-def balance_C3(m):
-    return m.C3 == m.B3 * m.x[3]
-
-@m.Constraint()
-def A_activation(m):
-    return m.A <= AUB * m.y[1]
-
-@m.Constraint()
-def B_product_activation(m):
-    return m.B_prod <= BUB * m.y[1]
-
-@m.Constraint()
-def b_act_2(m):
-    return m.B2 <= BUB * m.y[2]
-
-@m.Constraint()
-def b_act_3(m):
-    return m.B3 <= BUB * m.y[3]
-
-@m.Constraint()
-def c_act_2(m):
-    return m.C2 <= CUB * m.y[2]
-
-@m.Constraint()
-def c_act_3(m):
-    return m.C3 <= CUB * m.y[3]
+import pyomo.environ as pyo
 
-@m.Objective()
-def obj(m):
-    fixed_costs = sum( m.c_fix[i]*m.y[i] for i in I)
-    variable_costs = m.c_var[1]*m.A +  m.c_var[2]*m.B2 + m.c_var[3]*m.B3
-    prices = m.p_s['A']*m.A + m.p_s['B']*m.B_buy + m.p_s['C']*m.C - 15*m.C_extra
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.bound_tightening import big_m_report, format_report
+from optlib.solver_log import instrument
+from optlib.solvers import select
+from optlib.synthesis import format_table, process_model, scenario_sweep
 
-    return fixed_costs + variable_costs + prices
+# Case 2: C sells up to 10 [ton/hr] at its price, and up to 5 [ton/hr] more at 1500 $/ton
+m = process_model(AUB=16, CUB=10, CXUB=5, p_extra=-15)
 
-opt = pyo.SolverFactory('gams', solver='cplex')
+# GAMS/CPLEX as in the homework, the first available MILP solver when GAMS is not installed
+opt = instrument(select('milp', prefer='gams:cplex'))
 results = opt.solve(m, tee=True)
 
 for i in [2,3]:
-    if pyo.value(m.y[i]) == 1:
+    if round(pyo.value(m.y[i])) == 1:
         rta = i
 
 print('Build Process:', rta)
@@ -105,4 +27,17 @@ print('Produce', round(pyo.value(m.B_prod),1), 'of B')
 print('Put', round(pyo.value(m.B2),1), 'of B in process 2')
 print('Put', round(pyo.value(m.B3),1), 'of B in process 3')
 print('Produce', round(pyo.value(m.C_total),1), 'of C')
-print('The profit of the operation is:',round(-100*(pyo.value(m.obj)),1),'$/hr')
\ No newline at end of file
+print('The profit of the operation is:',round(-100*(pyo.value(m.obj)),1),'$/hr')
+
+# Big-M tightening by bound propagation on a separate copy of case 2 (the tightened rows are fixed numbers,
+# while the sweep below changes the demand)
+tightened = process_model(AUB=16, CUB=10, CXUB=5, p_extra=-15)
+print(format_report(big_m_report(tightened)))
+
+# Scenario sweep: C price 1400..2200 $/ton against the demand 6..16 ton/hr, re-solved in one persistent model
+scenarios = [{'p_s': {'C': -price / 100}, 'CUB': demand} for price in range(1400, 2201, 50) for demand in range(6, 17)]
+rows = scenario_sweep(m, scenarios, report=lambda m: {
+    'process': 2 if round(pyo.value(m.y[2])) == 1 else 3, 'buy A': pyo.value(m.A), 'buy B': pyo.value(m.B_buy),
+    'C': pyo.value(m.C_total), 'profit [$/hr]': -100 * pyo.value(m.obj)})
+print(format_table(rows, columns=['p_s[C]', 'CUB', 'status', 'process', 'buy A', 'buy B', 'C', 'profit [$/hr]']))
+print(f"{len(rows)} scenarios in {sum(row['time'] for row in rows):.2f} s")
@@ -1,5 +1,11 @@
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solvers import select
+
 # Define the data and parameters
 demand = [10, 40, 20, 5, 5, 15]
 fixed_cost = 50
@@ -42,7 +48,7 @@ m.production_limit =  pyo.Constraint(range(T), rule=production_limit_rule)
 # Inventory non-negativity is ensured by variable definition
 
 # Solve the model
-solver =  pyo.SolverFactory('gurobi')
+solver = select('milp', prefer='appsi_gurobi')
 results = solver.solve(m, tee=True)
 
 # Extract the solution
@@ -1,5 +1,11 @@
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solvers import select
+
 m = pyo.ConcreteModel()
 
 m.x1 = pyo.Var(bounds=(0, 3), domain=pyo.NonNegativeReals)
@@ -9,7 +15,8 @@ m.obj = pyo.Objective(expr=m.x1 - 2*m.x2, sense=pyo.minimize)
 
 m.constraint = pyo.Constraint(expr=2*m.x1**2 + 4*m.x1*m.x2 + 2*m.x2**2 - 9*m.x1 - 5*m.x2 <= 7)
 
-solver = pyo.SolverFactory('gurobi')  
+# Gurobi when installed, else the first available solver for quadratic constraints
+solver = select('qcp', prefer='appsi_gurobi')
 results = solver.solve(m, tee=True)
 
 # Display the results
@@ -17,7 +24,7 @@ print("Status:", results.solver.status)
 print("Termination Condition:", results.solver.termination_condition)
 
 # Display the value of the variables at the optimum
-if (results.solver.status == pyo.SolverStatus.ok) and (results.solver.termination_condition == pyo.TerminationCondition.optimal):
+if (results.solver.status == pyo.SolverStatus.ok) and (results.solver.termination_condition in (pyo.TerminationCondition.optimal, pyo.TerminationCondition.locallyOptimal)):
     print("Optimal Solution:")
     print("Objective value =", round(pyo.value(m.obj),4))
     print("x1 =", round(pyo.value(m.x1),4))
@@ -1,5 +1,11 @@
+import os
+import sys
+
 import pyomo.environ as pyo
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solvers import select
+
 # Create a Pyomo m
 m = pyo.ConcreteModel()
 
@@ -16,8 +22,8 @@ def exp_constraint(m):
 
 m.exp_con = pyo.Constraint(rule=exp_constraint)
 
-# Solving the m using BARON
-solver = pyo.SolverFactory('gams', solver = 'baron')
+# Solving the m using BARON, or a local solver when no global solver is installed
+solver = select('global')
 
 results = solver.solve(m, tee=True)  # tee=True for solver output
 
@@ -26,6 +32,10 @@ if (results.solver.status == pyo.SolverStatus.ok) and (results.solver.terminatio
     print('Solution is optimal')
     print('x1 =', pyo.value(m.x1))
     print('x2 =', pyo.value(m.x2))
+elif results.solver.termination_condition == pyo.TerminationCondition.locallyOptimal:
+    print('Solution is locally optimal (' + str(solver) + ')')
+    print('x1 =', pyo.value(m.x1))
+    print('x2 =', pyo.value(m.x2))
 elif results.solver.termination_condition == pyo.TerminationCondition.infeasible:
     print('No feasible solution found')
 else:
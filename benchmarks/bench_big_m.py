@@ -0,0 +1,79 @@
+# Benchmark: big-M tightening by bound propagation (optlib/bound_tightening.py)
+# Instances:
+#   HW7        case 2 of the process-synthesis model (optlib.synthesis.process_model, CXUB=5)
+#   jobshop    random job shops in the formulation of ChE597_FinalProject/jobshop_feasible.py:
+#              jobs x stages tasks, every job visits the stages in order, and bigM is the sum of
+#              all durations; the makespan is bounded by a greedy schedule
+# Reported per instance: big-M rows rewritten, mean M before and after, LP-relaxation gap, branch
+# and bound nodes and MILP time (HiGHS) before and after tighten_big_m.
+#
+# Usage: python benchmarks/bench_big_m.py [jobs ...]      (stages = jobs)
+import os
+import sys
+
+import numpy as np
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.bound_tightening import big_m_report
+from optlib.synthesis import process_model
+
+
+def greedy_makespan(durations):
+    """Makespan of the schedule that starts every job's next task as early as possible, job by job."""
+    machine = np.zeros(durations.shape[1])
+    finish = 0.0
+    for job in durations:
+        t = 0.0
+        for stage, d in enumerate(job):
+            t = max(t, machine[stage]) + d
+            machine[stage] = t
+        finish = max(finish, t)
+    return finish
+
+
+def jobshop_model(n_jobs, n_stages, seed=0):
+    rng = np.random.default_rng(seed)
+    durations = rng.integers(1, 10, size=(n_jobs, n_stages)).astype(float)
+    tasks = [(j, s) for j in range(n_jobs) for s in range(n_stages)]
+    ub = durations.sum()
+    bigM = ub
+
+    model = pyo.ConcreteModel()
+    model.TASKS = pyo.Set(initialize=tasks, dimen=2)
+    model.dur = pyo.Param(model.TASKS, initialize={t: durations[t] for t in tasks}, mutable=True)
+    model.makespan = pyo.Var(bounds=(0, greedy_makespan(durations)))
+    model.start = pyo.Var(model.TASKS, bounds=(0, ub))
+    pairs = [(a, b) for a in tasks for b in tasks if a[1] == b[1] and a[0] < b[0]]
+    model.y = pyo.Var(pairs, within=pyo.Binary)
+    model.objective = pyo.Objective(expr=model.makespan)
+    model.finish = pyo.Constraint(model.TASKS, rule=lambda model, j, s:
+                                  model.start[j, s] + model.dur[j, s] <= model.makespan)
+    model.preceding = pyo.Constraint([(j, s) for j, s in tasks if s > 0], rule=lambda model, j, s:
+                                     model.start[j, s - 1] + model.dur[j, s - 1] <= model.start[j, s])
+    model.disjunctions = pyo.ConstraintList()
+    for a, b in pairs:
+        model.disjunctions.add(model.start[a] + model.dur[a] <= model.start[b] + bigM * (1 - model.y[a, b]))
+        model.disjunctions.add(model.start[b] + model.dur[b] <= model.start[a] + bigM * model.y[a, b])
+    return model
+
+
+def run(sizes):
+    print(f"{'instance':>12} {'rows':>5} {'M before':>9} {'M after':>8} {'gap before':>11} {'gap after':>10} "
+          f"{'nodes before':>13} {'nodes after':>12} {'time before':>12} {'time after':>11}")
+    cases = [('HW7 case 2', process_model(CXUB=5))] + [(f'jobshop {n}x{n}', jobshop_model(n, n)) for n in sizes]
+    for label, model in cases:
+        report = big_m_report(model)
+        before, after = report['before'], report['after']
+        if abs(before['mip'] - after['mip']) > 1e-6 * max(1.0, abs(before['mip'])):
+            raise RuntimeError(f"{label}: tightening changed the optimum from {before['mip']} to {after['mip']}")
+        rows = report['rows']
+        M = np.mean([row['M'] for row in rows]) if rows else float('nan')
+        new_M = np.mean([row['new_M'] for row in rows]) if rows else float('nan')
+        print(f"{label:>12} {len(rows):>5} {M:>9.2f} {new_M:>8.2f} {100 * before['gap']:>10.2f}% "
+              f"{100 * after['gap']:>9.2f}% {str(before['nodes']):>13} {str(after['nodes']):>12} "
+              f"{before['time']:>12.3f} {after['time']:>11.3f}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [3, 4, 5, 6])
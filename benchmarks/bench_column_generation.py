@@ -0,0 +1,55 @@
+# Benchmark: path column generation vs. the arc formulation of multicommodity flow (HW2_4.py)
+# On one random network the number of commodities grows into the thousands. The arc
+# formulation (one variable per commodity and arc, optlib.sparse_lp with HiGHS) grows as
+# K * m and only runs up to ARC_MAX variables; column generation keeps one warm-started
+# master and prices all commodities with one multi-source Dijkstra per round.
+#
+# Usage: python benchmarks/bench_column_generation.py [n_commodities ...]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.column_generation import path_column_generation
+from optlib.network import random_network
+from optlib.sparse_lp import multicommodity_flow_lp
+
+NODES = 300
+ARC_MAX = 400000
+
+
+def instance(K, seed=0):
+    nodes, edges, _, costs, capacities = random_network(NODES, seed=seed)
+    rng = np.random.default_rng(seed + K)
+    commodities = list(range(K))
+    ends = [rng.choice(nodes, size=2, replace=False).tolist() for _ in commodities]
+    source = {k: s for k, (s, _) in zip(commodities, ends)}
+    sink = {k: t for k, (_, t) in zip(commodities, ends)}
+    demands = dict(zip(commodities, rng.integers(10, 100, size=K).tolist()))
+    return nodes, edges, commodities, source, sink, demands, costs, capacities
+
+
+def run(sizes):
+    print(f"{'commodities':>11} {'arc vars':>9} {'rounds':>7} {'columns':>8} {'colgen [s]':>11} {'arc lp [s]':>11} "
+          f"{'objective':>14} {'same':>5}")
+    for K in sizes:
+        data = instance(K)
+        start = time.perf_counter()
+        result = path_column_generation(*data)
+        elapsed = time.perf_counter() - start
+        variables = K * len(data[1])
+        if variables <= ARC_MAX:
+            start = time.perf_counter()
+            arc = multicommodity_flow_lp(*data).solve()
+            arc_time = f"{time.perf_counter() - start:>11.3f}"
+            same = str(abs(arc['objective'] - result['objective']) <= 1e-6 * abs(arc['objective']))
+        else:
+            arc_time, same = f"{'-':>11}", '-'
+        print(f"{K:>11} {variables:>9} {result['rounds']:>7} {result['columns']:>8} {elapsed:>11.3f} {arc_time} "
+              f"{result['objective']:>14.1f} {same:>5}")
+
+
+if __name__ == '__main__':
+    run([int(k) for k in sys.argv[1:]] or [10, 100, 300, 1000, 3000, 10000])
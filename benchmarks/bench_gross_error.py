@@ -0,0 +1,92 @@
+# Benchmark: vectorized gross-error tests and serial elimination (HW1_554/HW1_1.py)
+# Snapshots of a random flowsheet (optlib.reconciliation.random_flowsheet) get random errors,
+# and every other snapshot also gets a gross error of BIAS standard deviations on one random
+# meter. Reported per batch size:
+#   tests      global, nodal and measurement tests of the whole batch (optlib.gross_error)
+#   found      share of the gross errors removed by serial elimination, and share of the
+#              clean snapshots where a meter was removed (false alarms)
+#   rank-1     serial elimination with rank-1 downdates of S^-1, per snapshot
+#   re-solve   the same elimination with the reduced balances (eliminated streams projected
+#              out) refactorized after every removal, on the first RESOLVE_MAX snapshots;
+#              same meters removed?
+#
+# Usage: python benchmarks/bench_gross_error.py [n_snapshots ...]
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.linalg import null_space
+from scipy.stats import chi2, norm
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.gross_error import gross_error_tests, serial_elimination
+from optlib.reconciliation import Reconciler, balance_matrix, random_flowsheet
+
+UNITS = 30
+BIAS = 8.0
+ELIMINATION_MAX = 2000
+RESOLVE_MAX = 200
+ALPHA = 0.05
+
+
+def resolve_elimination(A, sigma, y, alpha=ALPHA):
+    """Serial elimination by full re-solves: the balances are reduced to the combinations free of
+    the eliminated streams (a null-space basis Q of A_E') and Q' S Q is factorized again."""
+    S = A @ np.diag(sigma**2) @ A.T
+    dof = np.linalg.matrix_rank(A)
+    r = A @ y
+    eliminated = []
+    while len(eliminated) < dof - 1:
+        Q = null_space(A[:, eliminated].T) if eliminated else np.eye(len(r))
+        M = Q @ np.linalg.inv(Q.T @ S @ Q) @ Q.T
+        gamma = r @ M @ r
+        d = r @ M @ A
+        g = np.einsum('ij,jk,ki->i', A.T, M, A)
+        redundant = g > 1e-10 * g.max()
+        z = np.where(redundant, np.abs(d) / np.sqrt(np.where(redundant, g, 1.0)), 0.0)
+        z[eliminated] = 0.0
+        j = int(np.argmax(z))
+        if gamma <= chi2.ppf(1 - alpha, dof - len(eliminated)) and z[j] <= norm.ppf(1 - (1 - (1 - alpha)**(1 / redundant.sum())) / 2):
+            break
+        eliminated.append(j)
+    return eliminated
+
+
+def run(sizes):
+    streams, balances, x, sigma = random_flowsheet(UNITS, n_paths=UNITS)
+    A = balance_matrix(streams, balances)
+    reconciler = Reconciler(A, sigma, lower=None)
+    print(f"flowsheet: {len(balances)} balances, {len(streams)} streams; gross errors of {BIAS} sigma")
+    print(f"{'snapshots':>10} {'tests [s]':>10} {'global rej.':>12} {'found':>6} {'false':>6} {'rank-1 [us]':>12} "
+          f"{'re-solve [us]':>14} {'same':>5}")
+    for N in sizes:
+        rng = np.random.default_rng(N)
+        Y = x + rng.normal(size=(N, len(x))) * sigma
+        faulty = np.full(N, -1)
+        faulty[::2] = rng.integers(0, len(x), size=len(faulty[::2]))
+        rows = np.flatnonzero(faulty >= 0)
+        Y[rows, faulty[rows]] += BIAS * sigma[faulty[rows]] * rng.choice([-1, 1], size=len(rows))
+
+        start = time.perf_counter()
+        tests = gross_error_tests(reconciler, Y, alpha=ALPHA)
+        test_time = time.perf_counter() - start
+
+        k = min(N, ELIMINATION_MAX)
+        start = time.perf_counter()
+        removed = [serial_elimination(reconciler, y, alpha=ALPHA)['eliminated'] for y in Y[:k]]
+        elimination_time = (time.perf_counter() - start) / k
+        found = np.mean([faulty[i] in removed[i] for i in range(k) if faulty[i] >= 0])
+        false = np.mean([len(removed[i]) > 0 for i in range(k) if faulty[i] < 0])
+
+        k = min(N, RESOLVE_MAX)
+        start = time.perf_counter()
+        resolved = [resolve_elimination(A, sigma, y) for y in Y[:k]]
+        resolve_time = (time.perf_counter() - start) / k
+        same = all(a == b for a, b in zip(removed, resolved))
+        print(f"{N:>10} {test_time:>10.4f} {tests['global_suspect'].mean():>12.3f} {found:>6.3f} {false:>6.3f} "
+              f"{1e6 * elimination_time:>12.0f} {1e6 * resolve_time:>14.0f} {str(same):>5}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [1000, 10000, 100000])
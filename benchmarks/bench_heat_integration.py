@@ -0,0 +1,51 @@
+# Benchmark: minimum utilities by the Problem Table Algorithm and by the transshipment LP
+# (optlib/heat_integration.py, HW3/HW3_1.py)
+# Random streams (random_streams, half hot and half cold) with dT_min = 10. Reported per size:
+#   intervals   temperature intervals of the streams
+#   PTA         problem_table: intervals, net FCp by a difference array, and the cascade
+#   loads       interval_loads: the full QH and QC tables the LP needs (up to LOADS_MAX streams)
+#   LP          transshipment_model built and solved (optlib.solvers.select('lp')), up to LP_MAX
+#               streams only; same heating utility as the cascade?
+#
+# Usage: python benchmarks/bench_heat_integration.py [n_streams ...]
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.heat_integration import interval_loads, problem_table, random_streams, transshipment_model
+from optlib.solvers import select
+
+DT_MIN = 10.0
+LP_MAX = 50
+LOADS_MAX = 5000
+
+
+def run(sizes):
+    solver = select('lp')
+    print(f"{'streams':>8} {'intervals':>10} {'heating':>12} {'cooling':>12} {'PTA [ms]':>9} {'loads [ms]':>11} "
+          f"{'LP [s]':>8} {'same':>5}")
+    for n in sizes:
+        supply, target, fcp = random_streams(n, seed=n)
+        start = time.perf_counter()
+        pta = problem_table(supply, target, fcp, DT_MIN)
+        pta_time = time.perf_counter() - start
+
+        loads_time, lp_time, same = None, None, None
+        if n <= LOADS_MAX:
+            start = time.perf_counter()
+            loads = interval_loads(supply, target, fcp, DT_MIN)
+            loads_time = time.perf_counter() - start
+            if n <= LP_MAX:
+                start = time.perf_counter()
+                m = transshipment_model(loads['QH'], loads['QC'])
+                solver.solve(m)
+                lp_time = time.perf_counter() - start
+                same = abs(m.QM[1].value - pta['heating']) <= 1e-6 * max(1.0, pta['heating'])
+        print(f"{n:>8} {len(pta['surplus']):>10} {pta['heating']:>12.2f} {pta['cooling']:>12.2f} "
+              f"{1e3 * pta_time:>9.3f} {'-' if loads_time is None else f'{1e3 * loads_time:.3f}':>11} "
+              f"{'-' if lp_time is None else f'{lp_time:.3f}':>8} {str(same) if same is not None else '-':>5}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [10, 50, 1000, 100000])
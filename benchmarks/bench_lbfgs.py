@@ -0,0 +1,43 @@
+# Benchmark: L-BFGS vs. dense BFGS on the n-dimensional HW2 objective
+# Grows the log-sum-exp objective of HW2 from 3 to 10^5 variables and reports iterations,
+# objective/gradient evaluations, wall time and the memory held by the quasi-Newton state.
+# Dense BFGS stores an n x n inverse Hessian, so it only runs up to DENSE_MAX variables.
+#
+# Usage: python benchmarks/bench_lbfgs.py [n ...]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.autodiff import AutoDiff
+from optlib.descent import quasi_newton_method
+from optlib.lbfgs import lbfgs
+from optlib.problems import LOG_SUM_EXP_MIN, log_sum_exp, log_sum_exp_start
+
+DENSE_MAX = 1000
+MEMORY = 10
+
+
+def row(n, name, iterations, evaluations, elapsed, x, state_bytes):
+    gap = log_sum_exp(x) - LOG_SUM_EXP_MIN
+    print(f"{n:>7} {name:>11} {iterations:>6} {evaluations:>7} {elapsed:>9.4f} {gap:>10.1e} {state_bytes / 2**20:>11.3f}")
+
+
+def run(n_values):
+    print(f"{'n':>7} {'method':>11} {'iter':>6} {'evals':>7} {'time [s]':>9} {'f - f*':>10} {'state [MB]':>11}")
+    for n in n_values:
+        start = time.perf_counter()
+        result = lbfgs(log_sum_exp, log_sum_exp_start(n), AutoDiff(log_sum_exp), m=MEMORY)
+        row(n, 'l-bfgs', result['nit'], result['nfev'], time.perf_counter() - start, result['x'], 2 * MEMORY * n * 8)
+
+        if n <= DENSE_MAX:
+            d = AutoDiff(log_sum_exp)
+            start = time.perf_counter()
+            x, iterations = quasi_newton_method(log_sum_exp, log_sum_exp_start(n), d)
+            row(n, 'dense bfgs', iterations, d.nfev + d.ngev + d.nhvp, time.perf_counter() - start, x, n * n * 8)
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [3, 10, 100, 1000, 10000, 100000])
@@ -0,0 +1,63 @@
+# Benchmark: building the HW6 min-cost flow model with and without adjacency indexes
+# The homework rule tests (i, node) in edges for every node pair, which is O(N^2 E); the
+# indexed builder of optlib.network walks precomputed in-arc and out-arc lists and skips the
+# infinite-capacity rows. Reports the build time and the number of constraints for random
+# networks from 8 to 100,000 nodes. The naive build only runs up to NAIVE_MAX nodes.
+#
+# Usage: python benchmarks/bench_network_build.py [n_nodes ...]
+import os
+import sys
+import time
+
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.network import min_cost_flow_model, random_network
+
+NAIVE_MAX = 200
+
+
+def naive_model(nodes, edges, demands, costs, capacities):
+    """The model exactly as built in HW6/HW6_5_2.py."""
+    model = pyo.ConcreteModel()
+    model.Nodes = pyo.Set(initialize=nodes)
+    model.Edges = pyo.Set(dimen=2, initialize=edges)
+    model.Demands = pyo.Param(model.Nodes, initialize=demands)
+    model.Costs = pyo.Param(model.Edges, initialize=costs)
+    model.Capacities = pyo.Param(model.Edges, initialize=capacities)
+    model.Flow = pyo.Var(model.Edges, within=pyo.NonNegativeReals)
+    model.Objective = pyo.Objective(expr=sum(model.Costs[e] * model.Flow[e] for e in model.Edges),
+                                    sense=pyo.minimize)
+
+    def flow_conservation_rule(model, node):
+        inflows = sum(model.Flow[(i, node)] for i in nodes if (i, node) in edges)
+        outflows = sum(model.Flow[(node, j)] for j in nodes if (node, j) in edges)
+        return inflows - outflows == model.Demands[node]
+
+    model.FlowConservation = pyo.Constraint(model.Nodes, rule=flow_conservation_rule)
+
+    def capacity_constraints(model, i, j):
+        return model.Flow[(i, j)] <= model.Capacities[(i, j)]
+
+    model.CapacityConstraints = pyo.Constraint(model.Edges, rule=capacity_constraints)
+    return model
+
+
+def constraints(model):
+    return sum(len(c) for c in model.component_objects(pyo.Constraint, active=True))
+
+
+def run(sizes):
+    print(f"{'nodes':>7} {'arcs':>8} {'builder':>8} {'time [s]':>9} {'constraints':>12}")
+    for n in sizes:
+        network = random_network(n)
+        builders = [('indexed', min_cost_flow_model)] + ([('naive', naive_model)] if n <= NAIVE_MAX else [])
+        for name, builder in builders:
+            start = time.perf_counter()
+            model = builder(*network)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>7} {len(network[1]):>8} {name:>8} {elapsed:>9.4f} {constraints(model):>12}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [8, 100, 200, 1000, 10000, 100000])
@@ -0,0 +1,75 @@
+# Benchmark: native network simplex vs. the Pyomo LP path of HW6_5_2.py
+# Solves random transshipment networks with optlib.network_simplex and with the Pyomo model
+# solved by Gurobi's primal simplex (Method=0), falling back to HiGHS when Gurobi is not
+# installed. Reports pivots, wall times (model build and solve for Pyomo), whether the costs
+# agree, and the largest violation of the optimality conditions by the node potentials of the
+# network simplex and by the LP duals of the conservation rows, each with its own flow:
+# reduced costs c_ij + pi_i - pi_j >= 0 on arcs at zero flow, <= 0 on arcs at capacity and 0
+# on arcs in between. On degenerate optima the two sets of potentials differ, but both must
+# satisfy these conditions.
+#
+# Usage: python benchmarks/bench_network_simplex.py [n_nodes ...]
+import os
+import sys
+import time
+
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.network import min_cost_flow_model, random_network
+from optlib.network_simplex import network_simplex
+
+
+def lp_solver():
+    solver = pyo.SolverFactory('gurobi')
+    if solver.available(exception_flag=False):
+        solver.options['Method'] = 0  # For primal simplex
+        return 'gurobi', solver
+    return 'highs', pyo.SolverFactory('highs')
+
+
+def solve_lp(network, solver):
+    start = time.perf_counter()
+    model = min_cost_flow_model(*network)
+    model.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
+    built = time.perf_counter()
+    solver.solve(model)
+    solved = time.perf_counter()
+    nodes = network[0]
+    duals = {node: model.dual[model.FlowConservation[node]] for node in nodes}
+    potential = {node: duals[node] - duals[nodes[0]] for node in nodes}
+    flow = {e: model.Flow[e].value for e in network[1]}
+    return pyo.value(model.Objective), flow, potential, built - start, solved - built
+
+
+def optimality_violation(network, flow, potential, tol=1e-7):
+    """Largest violation of the reduced-cost sign conditions of the flow by the potentials."""
+    _, edges, _, costs, capacities = network
+    worst = 0.0
+    for (i, j) in edges:
+        rc = costs[i, j] + potential[i] - potential[j]
+        if flow[i, j] < capacities[i, j] - tol:
+            worst = max(worst, -rc)   # may still increase: rc >= 0
+        if flow[i, j] > tol:
+            worst = max(worst, rc)    # may still decrease: rc <= 0
+    return worst
+
+
+def run(sizes):
+    name, solver = lp_solver()
+    print(f"{'nodes':>7} {'arcs':>8} {'pivots':>8} {'simplex [s]':>12} {name + ' build [s]':>17} "
+          f"{name + ' solve [s]':>17} {'cost':>14} {'same cost':>10} {'simplex viol.':>14} {'LP viol.':>9}")
+    for n in sizes:
+        network = random_network(n)
+        start = time.perf_counter()
+        result = network_simplex(*network)
+        elapsed = time.perf_counter() - start
+        cost, flow, potential, build, solve = solve_lp(network, solver)
+        simplex_violation = optimality_violation(network, result['flow'], result['potential'])
+        lp_violation = optimality_violation(network, flow, potential)
+        print(f"{n:>7} {len(network[1]):>8} {result['iterations']:>8} {elapsed:>12.3f} {build:>17.3f} {solve:>17.3f} "
+              f"{result['cost']:>14.1f} {str(abs(result['cost'] - cost) <= 1e-6 * abs(cost)):>10} {simplex_violation:>14.1e} {lp_violation:>9.1e}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [100, 1000, 5000, 10000])
@@ -0,0 +1,228 @@
+# Benchmark: the hand-written NLP algorithms against Pyomo/IPOPT references
+# Runs every method on parameterized problem families (the n-dimensional HW2 and HW5
+# problems and Rosenbrock) and records wall time, iterations, objective evaluations and
+# the optimality gap f - f_ref. The reference f_ref is the Pyomo model of the same problem
+# solved with IPOPT (HW2/HW2_2.py, HW5/HW5_0.py); without IPOPT the known optimum is used,
+# or scipy's SLSQP when none is known, and the source is recorded with every result.
+#
+# Every run is appended as JSON lines to --output and compared with the previous run in
+# that file: more evaluations, a worse gap or a slowdown beyond --slowdown is reported.
+#
+# Usage: python benchmarks/bench_nlp.py [--problems hw2 hw5 ...] [--sizes n ...] [--repeat r]
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pyomo.environ as pyo
+from scipy.optimize import minimize
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.autodiff import AutoDiff
+from optlib.barrier import barrier_method, barrier_method_bfgs
+from optlib.descent import gradient_descent, newton, quasi_newton_method
+from optlib.interior_point import primal_dual_interior_point
+from optlib.lbfgs import lbfgs
+from optlib.newton import newton_method
+from optlib.problems import (HW5_MIN, LOG_SUM_EXP_MIN, hw5_constraint_hessian, hw5_constraints, hw5_objective,
+                             hw5_start, log_sum_exp, log_sum_exp_start, rosenbrock, rosenbrock_start)
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'bench_nlp.jsonl')
+
+
+# Pyomo reference models
+def hw2_model(n):
+    """HW2_2.py in n variables: x1..x_{n-1} and t = x_n."""
+    m = n - 1
+    model = pyo.ConcreteModel()
+    model.I = pyo.RangeSet(m)
+    model.z = pyo.Var(model.I, initialize=1.1, within=pyo.Reals)
+    model.t = pyo.Var(initialize=1.1, within=pyo.PositiveReals)
+    model.objective = pyo.Objective(
+        expr=model.t * pyo.log(2 / m * sum(pyo.exp(model.z[i] / model.t) for i in model.I))
+        + (model.t - 2)**2 + pyo.exp(m / (2 * sum(model.z[i] for i in model.I))),
+        sense=pyo.minimize)
+    model.constraint1 = pyo.Constraint(expr=sum(model.z[i] for i in model.I) >= 0)
+    return model
+
+
+def hw5_model(n):
+    """HW5_0.py in n variables."""
+    model = pyo.ConcreteModel()
+    model.I = pyo.RangeSet(n)
+    model.x = pyo.Var(model.I, initialize=float(hw5_start(n)[0]), domain=pyo.NonNegativeReals)
+    x = model.x
+    model.objective = pyo.Objective(
+        expr=3 / sum(x[i] for i in model.I) + sum(x[i] for i in model.I if i > 1) / (n - 1) + pyo.exp(x[1])
+        + sum((x[i] - x[i + 1])**2 for i in model.I if i < n),
+        sense=pyo.minimize)
+    model.ball = pyo.Constraint(expr=sum(x[i]**2 for i in model.I) <= 2)
+    model.difference = pyo.Constraint(pyo.RangeSet(n - 1), rule=lambda model, i: x[i] - x[i + 1] <= 1)
+    return model
+
+
+def rosenbrock_model(n):
+    model = pyo.ConcreteModel()
+    model.I = pyo.RangeSet(n)
+    model.x = pyo.Var(model.I, initialize=lambda model, i: float(rosenbrock_start(n)[i - 1]))
+    x = model.x
+    model.objective = pyo.Objective(
+        expr=sum(100 * (x[i + 1] - x[i]**2)**2 + (1 - x[i])**2 for i in model.I if i < n), sense=pyo.minimize)
+    return model
+
+
+def hw5_slsqp(n):
+    result = minimize(lambda x: hw5_objective(x)[:2], hw5_start(n), jac=True, method='SLSQP', tol=1e-14,
+                      constraints={'type': 'ineq', 'fun': lambda x: -hw5_constraints(x)[0],
+                                   'jac': lambda x: -hw5_constraints(x)[1]})
+    return hw5_objective(result.x)[0]
+
+
+# Problem families: objective, start, Pyomo model, and the fallback reference
+PROBLEMS = {
+    'hw2': {'kind': 'unconstrained', 'f': log_sum_exp, 'start': log_sum_exp_start, 'model': hw2_model,
+            'known': lambda n: (LOG_SUM_EXP_MIN, 'known'), 'sizes': [3, 10, 30, 100]},
+    'rosenbrock': {'kind': 'unconstrained', 'f': rosenbrock, 'start': rosenbrock_start, 'model': rosenbrock_model,
+                   'known': lambda n: (0.0, 'known'), 'sizes': [2, 10, 30]},
+    'hw5': {'kind': 'constrained', 'model': hw5_model, 'start': hw5_start,
+            'known': lambda n: (HW5_MIN, 'known') if n == 2 else (hw5_slsqp(n), 'slsqp'), 'sizes': [2, 10, 30]},
+}
+
+
+# Every method returns the solution and its iteration count
+UNCONSTRAINED = {
+    'gradient descent': lambda f, x0: gradient_descent(f, x0, AutoDiff(f)),
+    'newton': lambda f, x0: newton(f, x0, AutoDiff(f)),
+    'bfgs': lambda f, x0: quasi_newton_method(f, x0, AutoDiff(f)),
+    'newton (cholesky)': lambda f, x0: (lambda r: (r['x'], r['nit']))(newton_method(f, x0, AutoDiff(f))),
+    'l-bfgs': lambda f, x0: (lambda r: (r['x'], r['nit']))(lbfgs(f, x0, AutoDiff(f))),
+}
+
+CONSTRAINED = {
+    'barrier newton': lambda obj, con, x0: (lambda r: (r['x'], r['newton_iterations']))(
+        barrier_method(obj, con, x0, hw5_constraint_hessian)),
+    'barrier bfgs': lambda obj, con, x0: (lambda r: (r['x'], sum(h['iterations'] for h in r['history'])))(
+        barrier_method_bfgs(obj, con, x0)),
+    'interior point': lambda obj, con, x0: (lambda r: (r['x'], r['nit']))(
+        primal_dual_interior_point(obj, con, x0, hw5_constraint_hessian)),
+}
+
+
+def counted(fun, counter):
+    # Count the calls to the problem functions, whatever the derivative backend does with them
+    def wrapper(x, *args):
+        counter[0] += 1
+        return fun(x, *args)
+    return wrapper
+
+
+def reference(name, n):
+    """Optimal objective of the Pyomo model from IPOPT, or the fallback of the problem family."""
+    solver = pyo.SolverFactory('ipopt')
+    if solver.available(exception_flag=False):
+        model = PROBLEMS[name]['model'](n)
+        results = solver.solve(model)
+        if results.solver.termination_condition == pyo.TerminationCondition.optimal:
+            return pyo.value(model.objective), 'ipopt'
+    return PROBLEMS[name]['known'](n)
+
+
+def run_one(name, n, method, repeat):
+    problem = PROBLEMS[name]
+    x0 = problem['start'](n)
+    elapsed = np.inf
+    for _ in range(repeat):
+        counter = [0]
+        start = time.perf_counter()
+        if problem['kind'] == 'unconstrained':
+            f = counted(problem['f'], counter)
+            x, iterations = UNCONSTRAINED[method](f, x0)
+        else:
+            x, iterations = CONSTRAINED[method](counted(hw5_objective, counter), hw5_constraints, x0)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    if problem['kind'] == 'unconstrained':
+        fx, violation = float(problem['f'](x)), 0.0
+    else:
+        fx, violation = float(hw5_objective(x)[0]), float(max(0.0, np.max(hw5_constraints(x)[0])))
+    return {'x_norm': float(np.linalg.norm(x)), 'f': fx, 'violation': violation, 'time': elapsed,
+            'iterations': int(iterations), 'evaluations': counter[0]}
+
+
+def load_previous(path):
+    """Records of the last run stored in path, keyed by (problem, n, method)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    if not records:
+        return {}
+    last = records[-1]['run']
+    return {(r['problem'], r['n'], r['method']): r for r in records if r['run'] == last}
+
+
+def regressions(record, previous, slowdown):
+    old = previous.get((record['problem'], record['n'], record['method']))
+    if old is None:
+        return []
+    found = []
+    if record['evaluations'] > 1.1 * old['evaluations']:
+        found.append(f"evaluations {old['evaluations']} -> {record['evaluations']}")
+    if record['gap'] > max(10 * old['gap'], old['gap'] + 1e-8):
+        found.append(f"gap {old['gap']:.1e} -> {record['gap']:.1e}")
+    if record['time'] > slowdown * old['time'] and record['time'] > 1e-3:
+        found.append(f"time {old['time']:.4f} -> {record['time']:.4f} s")
+    return found
+
+
+def run(problems, sizes, repeat, output, slowdown):
+    previous = load_previous(output)
+    stamp = datetime.now().isoformat(timespec='seconds')
+    records = []
+    flagged = []
+    print(f"{'problem':>10} {'n':>5} {'method':>17} {'iter':>6} {'evals':>7} {'time [s]':>9} {'f':>12} "
+          f"{'f - f_ref':>10} {'ref':>6}")
+    for name in problems:
+        for n in sizes or PROBLEMS[name]['sizes']:
+            f_ref, source = reference(name, n)
+            methods = UNCONSTRAINED if PROBLEMS[name]['kind'] == 'unconstrained' else CONSTRAINED
+            for method in methods:
+                record = {'run': stamp, 'problem': name, 'n': n, 'method': method}
+                try:
+                    record.update(run_one(name, n, method, repeat))
+                except (RuntimeError, FloatingPointError) as error:
+                    # A failed run has no answer to record; report it and go on
+                    print(f"{name:>10} {n:>5} {method:>17} failed: {error}")
+                    continue
+                record.update({'reference': f_ref, 'reference_source': source, 'gap': record['f'] - f_ref})
+                records.append(record)
+                print(f"{name:>10} {n:>5} {method:>17} {record['iterations']:>6} {record['evaluations']:>7} "
+                      f"{record['time']:>9.4f} {record['f']:>12.8f} {record['gap']:>10.1e} {source:>6}")
+                flagged += [(record, r) for r in regressions(record, previous, slowdown)]
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'a') as file:
+        for record in records:
+            file.write(json.dumps(record) + '\n')
+    print(f"\n{len(records)} results appended to {output}")
+    if previous:
+        print(f"Compared with the run of {next(iter(previous.values()))['run']}: {len(flagged)} regressions")
+        for record, message in flagged:
+            print(f"  {record['problem']} n = {record['n']} {record['method']}: {message}")
+    return records
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the NLP algorithms against Pyomo/IPOPT references')
+    parser.add_argument('--problems', nargs='+', choices=list(PROBLEMS), default=list(PROBLEMS))
+    parser.add_argument('--sizes', nargs='+', type=int, help='problem sizes (default: per problem family)')
+    parser.add_argument('--repeat', type=int, default=1, help='timing repetitions, the fastest is kept')
+    parser.add_argument('--output', default=OUTPUT, help='JSON lines file the results are appended to')
+    parser.add_argument('--slowdown', type=float, default=1.5, help='time ratio reported as a regression')
+    args = parser.parse_args()
+    # Full-step iterates can leave the domain of the logarithms; the line searches handle that
+    np.seterr(all='ignore')
+    run(args.problems, args.sizes, args.repeat, args.output, args.slowdown)
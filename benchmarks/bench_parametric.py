@@ -0,0 +1,72 @@
+# Benchmark: warm-started capacity sweep vs. cold re-solves (HW6_5_3.py)
+# On random transshipment networks the capacity of a few capacitated arcs is swept over
+# VALUES points between 0 and twice their largest capacity. Three ways to get the curve:
+#   warm   one optlib.parametric.ParametricFlow, bounds changed in place, basis kept
+#   cold   a fresh HiGHS model per value (same matrix, no basis)
+#   pyomo  the HW6_5_3 path: rebuild the Pyomo model and solve it with HiGHS, only for the
+#          first PYOMO_VALUES values and reported per value
+# The warm and cold objectives are checked to agree at every value.
+#
+# Usage: python benchmarks/bench_parametric.py [n_nodes ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.network import min_cost_flow_model, random_network
+from optlib.parametric import ParametricFlow
+
+VALUES = 200
+SWEPT_ARCS = 5
+PYOMO_VALUES = 5
+
+
+def instance(n):
+    nodes, edges, demands, costs, capacities = random_network(n)
+    capacitated = [e for e in edges if np.isfinite(capacities[e])]
+    rng = np.random.default_rng(n)
+    swept = [capacitated[k] for k in rng.choice(len(capacitated), size=SWEPT_ARCS, replace=False)]
+    values = np.linspace(0, 2 * max(capacities[e] for e in swept), VALUES)
+    return (nodes, edges, demands, costs, capacities), swept, values
+
+
+def run(sizes):
+    print(f"{'nodes':>7} {'arcs':>8} {'warm [s]':>9} {'warm iters':>10} {'cold [s]':>9} {'cold iters':>10} "
+          f"{'pyomo [s/value]':>15} {'breakpoints':>11} {'same':>5}")
+    for n in sizes:
+        network, swept, values = instance(n)
+
+        start = time.perf_counter()
+        warm = ParametricFlow(*network).sweep(values, capacity=swept)
+        warm_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cold, cold_iterations = [], 0
+        for t in values:
+            problem = ParametricFlow(*network)
+            for e in swept:
+                problem.set_capacity(e, t)
+            result = problem.solve()
+            cold.append(result['objective'])
+            cold_iterations += result['iterations']
+        cold_time = time.perf_counter() - start
+
+        solver = pyo.SolverFactory('highs')
+        start = time.perf_counter()
+        for t in values[:PYOMO_VALUES]:
+            capacities = dict(network[4])
+            capacities.update((e, t) for e in swept)
+            solver.solve(min_cost_flow_model(*network[:4], capacities))
+        pyomo_time = (time.perf_counter() - start) / PYOMO_VALUES
+
+        same = all((a is None and b is None) or (a is not None and b is not None and abs(a - b) <= 1e-6 * max(1, abs(b)))
+                   for a, b in zip(warm['objective'], cold))
+        print(f"{n:>7} {len(network[1]):>8} {warm_time:>9.3f} {sum(warm['iterations']):>10} {cold_time:>9.3f} "
+              f"{cold_iterations:>10} {pyomo_time:>15.3f} {len(warm['breakpoints']):>11} {str(same):>5}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [100, 1000, 5000])
@@ -0,0 +1,71 @@
+# Benchmark: closed-form batch reconciliation vs. one optimization per snapshot (HW1_554/HW1_1.py)
+# Noisy snapshots of a random flowsheet (optlib.reconciliation.random_flowsheet) are reconciled
+# by the projection of optlib.reconciliation.Reconciler in one matrix product, with the bounded
+# QP only for the snapshots where a flow would turn negative. The per-snapshot alternatives run
+# on the first snapshots only and are reported per snapshot:
+#   qp     the bounded QP (HiGHS) for every snapshot, checked against the batch result
+#   ipopt  the Pyomo model of HW1_1.py solved by IPOPT, when it is installed
+#
+# Usage: python benchmarks/bench_reconciliation.py [n_snapshots ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.reconciliation import Reconciler, balance_matrix, random_flowsheet
+
+UNITS = 30
+QP_MAX = 200
+IPOPT_MAX = 20
+
+
+def pyomo_model(streams, balances, y, sigma):
+    """HW1_1.py for one snapshot."""
+    m = pyo.ConcreteModel()
+    m.F = pyo.Var(range(len(streams)), within=pyo.NonNegativeReals)
+    column = {s: k for k, s in enumerate(streams)}
+    m.objective = pyo.Objective(expr=sum(((m.F[k] - y[k]) / sigma[k])**2 for k in m.F), sense=pyo.minimize)
+    m.balances = pyo.ConstraintList()
+    for inlets, outlets in balances:
+        m.balances.add(sum(m.F[column[s]] for s in inlets) == sum(m.F[column[s]] for s in outlets))
+    return m
+
+
+def run(sizes):
+    streams, balances, x, sigma = random_flowsheet(UNITS)
+    A = balance_matrix(streams, balances)
+    reconciler = Reconciler(A, sigma)
+    ipopt = pyo.SolverFactory('ipopt')
+    has_ipopt = ipopt.available(exception_flag=False)
+    print(f"flowsheet: {len(balances)} balances, {len(streams)} streams")
+    print(f"{'snapshots':>10} {'batch [s]':>10} {'bounded':>8} {'batch [us/snap]':>16} {'qp [us/snap]':>13} {'qp same':>8} "
+          f"{'ipopt [us/snap]':>16}")
+    for N in sizes:
+        rng = np.random.default_rng(N)
+        Y = x + rng.normal(size=(N, len(x))) * sigma
+        start = time.perf_counter()
+        result = reconciler.reconcile(Y)
+        elapsed = time.perf_counter() - start
+
+        k = min(N, QP_MAX)
+        start = time.perf_counter()
+        X = np.array([reconciler.solve_bounded(y) for y in Y[:k]])
+        qp_time = (time.perf_counter() - start) / k
+        same = np.abs(X - result['x'][:k]).max() <= 1e-6 * max(1.0, np.abs(X).max())
+
+        ipopt_time = '-'
+        if has_ipopt:
+            k = min(N, IPOPT_MAX)
+            start = time.perf_counter()
+            for y in Y[:k]:
+                ipopt.solve(pyomo_model(streams, balances, y, sigma))
+            ipopt_time = f"{1e6 * (time.perf_counter() - start) / k:.0f}"
+        print(f"{N:>10} {elapsed:>10.4f} {len(result['bounded']):>8} {1e6 * elapsed / N:>16.2f} {1e6 * qp_time:>13.0f} "
+              f"{str(same):>8} {ipopt_time:>16}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,52 @@
+# Benchmark: write/solve/load split of the solver backends of optlib/solvers.py
+# Random superstructures (optlib.synthesis.random_superstructure) of n processes are solved
+# twice, with the prices changed in between, by every available MILP candidate and by the
+# Pyomo 'highs' interface that rebuilds the model on every solve. Reported per backend:
+#   write   model into the solver (set_instance/update, or the LP/GMS file)
+#   solve   the solver run
+#   load    solution back into the Pyomo variables
+# for the first solve and for the re-solve, in milliseconds ('-' when the backend does not
+# split its time).
+#
+# Usage: python benchmarks/bench_solvers.py [n_processes ...]
+import os
+import sys
+
+import numpy as np
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solvers import CANDIDATES, Solver
+from optlib.synthesis import random_superstructure, superstructure_model
+
+
+def _ms(value):
+    return '-' if value is None else f"{1e3 * value:.1f}"
+
+
+def run(sizes):
+    names = [name for name in CANDIDATES['milp'] if Solver(name).available()] + ['highs']
+    print(f"backends: {', '.join(names)}")
+    print(f"{'processes':>10} {'backend':>12} {'objective':>12} | {'write':>8} {'solve':>8} {'load':>8} | "
+          f"{'write':>8} {'solve':>8} {'load':>8} | {'total':>8} {'total':>8}")
+    for n in sizes:
+        processes, substances = random_superstructure(n)
+        for name in names:
+            rng = np.random.default_rng(n)
+            m = superstructure_model(processes, substances)
+            solver = Solver(name, 'milp')
+            solver.solve(m)
+            # Same model with 10 % noise on the product values
+            for s in m.S:
+                m.value[s] = pyo.value(m.value[s]) * (1 + 0.1 * rng.standard_normal())
+            solver.solve(m)
+            first, second = solver.timings
+            objective = m.obj()
+            print(f"{n:>10} {name:>12} {objective:>12.2f} | "
+                  f"{_ms(first['write']):>8} {_ms(first['solve']):>8} {_ms(first['load']):>8} | "
+                  f"{_ms(second['write']):>8} {_ms(second['solve']):>8} {_ms(second['load']):>8} | "
+                  f"{_ms(first['total']):>8} {_ms(second['total']):>8}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [50, 200, 500])
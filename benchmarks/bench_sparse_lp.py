@@ -0,0 +1,93 @@
+# Benchmark: matrix-form LPs (scipy.sparse + HiGHS) vs. Pyomo model building
+# Solves random transshipment networks and multicommodity flow instances both through the
+# indexed Pyomo model and through optlib.sparse_lp, which assembles the incidence data as
+# sparse arrays and calls HiGHS in memory. Reports the build and solve time of each path and
+# whether the optimal costs agree. The Pyomo path uses Gurobi when installed, else HiGHS.
+#
+# Usage: python benchmarks/bench_sparse_lp.py [n_nodes ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.network import min_cost_flow_model, random_network
+from optlib.sparse_lp import min_cost_flow_lp, multicommodity_flow_lp
+
+COMMODITIES = 5
+
+
+def pyomo_solver():
+    solver = pyo.SolverFactory('gurobi')
+    if solver.available(exception_flag=False):
+        return 'gurobi', solver
+    return 'highs', pyo.SolverFactory('highs')
+
+
+def multicommodity_model(nodes, edges, commodities, source, sink, demands, costs, capacities):
+    """Pyomo model of HW2_4.py built from adjacency lists."""
+    in_arcs = {node: [] for node in nodes}
+    out_arcs = {node: [] for node in nodes}
+    for e in edges:
+        out_arcs[e[0]].append(e)
+        in_arcs[e[1]].append(e)
+    model = pyo.ConcreteModel()
+    model.flow = pyo.Var(commodities, edges, within=pyo.NonNegativeReals)
+    model.objective = pyo.Objective(expr=pyo.quicksum(costs[e] * model.flow[k, e] for k in commodities for e in edges))
+    finite = [e for e in edges if np.isfinite(capacities[e])]
+    model.capacity_constraints = pyo.Constraint(
+        finite, rule=lambda model, i, j: pyo.quicksum(model.flow[k, (i, j)] for k in commodities) <= capacities[i, j])
+
+    def flow_conservation_rule(model, n, k):
+        rhs = demands[k] if n == sink[k] else -demands[k] if n == source[k] else 0
+        return (pyo.quicksum(model.flow[k, e] for e in in_arcs[n])
+                - pyo.quicksum(model.flow[k, e] for e in out_arcs[n]) == rhs)
+
+    model.flow_conservation = pyo.Constraint(nodes, commodities, rule=flow_conservation_rule)
+    return model
+
+
+def multicommodity_instance(n, seed=0):
+    nodes, edges, _, costs, capacities = random_network(n, seed=seed)
+    rng = np.random.default_rng(seed)
+    commodities = [f'd{k}' for k in range(1, COMMODITIES + 1)]
+    ends = rng.choice(nodes, size=(COMMODITIES, 2), replace=False).tolist()
+    source = {k: s for k, (s, _) in zip(commodities, ends)}
+    sink = {k: t for k, (_, t) in zip(commodities, ends)}
+    demands = dict(zip(commodities, rng.integers(10, 100, size=COMMODITIES).tolist()))
+    return nodes, edges, commodities, source, sink, demands, costs, capacities
+
+
+def time_both(label, n, pyomo_build, matrix_build, solver):
+    start = time.perf_counter()
+    model = pyomo_build()
+    built = time.perf_counter()
+    solver.solve(model)
+    solved = time.perf_counter()
+    pyomo_cost = pyo.value(next(model.component_data_objects(pyo.Objective, active=True)))
+
+    lp = matrix_build()
+    built_lp = time.perf_counter()
+    result = lp.solve()
+    solved_lp = time.perf_counter()
+    same = abs(result['objective'] - pyomo_cost) <= 1e-6 * max(1.0, abs(pyomo_cost))
+    print(f"{label:>15} {n:>7} {built - start:>11.3f} {solved - built:>11.3f} {built_lp - solved:>12.3f} "
+          f"{solved_lp - built_lp:>12.3f} {(solved - start) / (solved_lp - solved):>8.1f} {str(same):>6}")
+
+
+def run(sizes):
+    name, solver = pyomo_solver()
+    print(f"{'problem':>15} {'nodes':>7} {'pyomo build':>11} {name + ' solve':>11} {'matrix build':>12} "
+          f"{'highs solve':>12} {'speedup':>8} {'same':>6}")
+    for n in sizes:
+        network = random_network(n)
+        time_both('min-cost flow', n, lambda: min_cost_flow_model(*network), lambda: min_cost_flow_lp(*network), solver)
+        instance = multicommodity_instance(n)
+        time_both('multicommodity', n, lambda: multicommodity_model(*instance),
+                  lambda: multicommodity_flow_lp(*instance), solver)
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [1000, 2000, 5000])
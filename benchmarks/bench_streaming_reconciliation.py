@@ -0,0 +1,115 @@
+# Benchmark: replay of a synthetic day of one-second measurements through the streaming reconciler
+# The 28 streams and 11 balances of HW1_554/HW1_1.py: the true flows are the reconciled flows of
+# the homework, scaled by a slow daily load cycle (which keeps every balance closed), and each
+# second is measured with the homework standard deviations. The samples are written to a CSV
+# file and replayed from it with optlib.reconciliation.read_samples, so memory does not grow with
+# the stream. Reported per mode of StreamingReconciler:
+#   latency   time of update() per sample (mean, median, 99th percentile)
+#   error     RMS of (estimate - truth) / sigma for the reconciled sample and the window mean
+#   memory    peak Python allocation during a replay (tracemalloc, in a separate pass)
+# The recompute line refactorizes the window covariance for every sample, on the first
+# RECOMPUTE_MAX samples, for comparison with the rank-2 updates.
+#
+# Usage: python benchmarks/bench_streaming_reconciliation.py [n_seconds] [window]
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.reconciliation import Reconciler, StreamingReconciler, balance_matrix, read_samples
+
+MEASURED = [0.90, 1.0, 112.82, 109.95, 53.27, 113.27, 2.32, 165.0, 0.86, 52.41, 15.0, 67.30, 111.27, 91.86,
+            61.0, 23.64, 33.0, 16.23, 8.0, 10.50, 88.20, 5.45, 2.60, 46.64, 85.45, 81.32, 70.77, 73.33]
+SIGMA = [0.25, 0.25, 3, 3, 3, 3, 0.25, 3, 0.25, 3, 1, 3, 3, 3, 3, 1, 1, 1, 0.25, 1, 3, 0.25, 0.25, 3, 3, 3, 3, 3]
+BALANCES = [([1, 2, 4], [3]), ([7, 8], [5, 6, 9]), ([5], [10, 1]), ([10, 11], [12]), ([3, 13], [11, 14, 15, 16, 17]),
+            ([6], [2, 13]), ([14, 18], [7, 19, 20, 21]), ([15, 22], [18, 23, 24]), ([12, 16], [22, 25]),
+            ([23, 27, 19], [26]), ([20, 26, 28], [8])]
+RECOMPUTE_MAX = 5000
+
+
+def synthetic_day(path, seconds, A, sigma, seed=0):
+    """Write the measurements to path; returns the true flows of every second."""
+    base = Reconciler(A, sigma).reconcile(MEASURED)['x']
+    rng = np.random.default_rng(seed)
+    load = 1 + 0.15 * np.sin(2 * np.pi * np.arange(seconds) / 86400 - np.pi / 2)
+    truth = load[:, None] * base
+    np.savetxt(path, truth + rng.normal(size=truth.shape) * sigma, delimiter=',', fmt='%.6f',
+               header=','.join(f'F{i}' for i in range(1, 29)), comments='')
+    return truth
+
+
+def replay(path, reconciler, truth, sigma):
+    latency = np.empty(len(truth))
+    error_sample = error_mean = 0.0
+    start = time.perf_counter()
+    for t, y in enumerate(read_samples(path)):
+        tick = time.perf_counter()
+        x, x_mean = reconciler.update(y)
+        latency[t] = time.perf_counter() - tick
+        error_sample += np.sum(((x - truth[t]) / sigma)**2)
+        error_mean += np.sum(((x_mean - truth[t]) / sigma)**2)
+    total = time.perf_counter() - start
+    n = truth.size
+    return latency, np.sqrt(error_sample / n), np.sqrt(error_mean / n), total
+
+
+def peak_memory(path, reconciler):
+    """Peak Python allocation of a replay; tracemalloc slows allocation, so this is a separate pass."""
+    tracemalloc.start()
+    for y in read_samples(path):
+        reconciler.update(y)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def recompute(path, A, window, count):
+    """Window covariance and its inverse from scratch for every sample."""
+    buffer = []
+    latency = []
+    for t, y in enumerate(read_samples(path)):
+        if t == count:
+            break
+        tick = time.perf_counter()
+        buffer.append(y)
+        if len(buffer) > window:
+            buffer.pop(0)
+        if len(buffer) == window:
+            Y = np.array(buffer)
+            R = Y @ A.T
+            Yc, Rc = Y - Y.mean(axis=0), R - R.mean(axis=0)
+            K = (Yc.T @ Rc) @ np.linalg.inv(Rc.T @ Rc)
+            x = y - K @ (A @ y)
+        latency.append(time.perf_counter() - tick)
+    return np.array(latency[window:])
+
+
+def run(seconds, window):
+    A = balance_matrix(range(1, 29), BALANCES)
+    sigma = np.array(SIGMA, dtype=float)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'measurements.csv')
+        truth = synthetic_day(path, seconds, A, sigma)
+        print(f"{seconds} samples of {A.shape[1]} streams, {A.shape[0]} balances, window {window}, "
+              f"file {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"{'mode':>10} {'mean [us]':>10} {'p50 [us]':>9} {'p99 [us]':>9} {'replay [s]':>11} {'rms sample':>11} "
+              f"{'rms window':>11} {'peak [kB]':>10}")
+        for name, adaptive in [('adaptive', True), ('fixed', False)]:
+            reconciler = StreamingReconciler(A, sigma, window=window, adaptive=adaptive)
+            latency, rms_sample, rms_mean, total = replay(path, reconciler, truth, sigma)
+            peak = peak_memory(path, StreamingReconciler(A, sigma, window=window, adaptive=adaptive))
+            print(f"{name:>10} {1e6 * latency.mean():>10.1f} {1e6 * np.median(latency):>9.1f} "
+                  f"{1e6 * np.percentile(latency, 99):>9.1f} {total:>11.2f} {rms_sample:>11.3f} {rms_mean:>11.3f} "
+                  f"{peak / 1e3:>10.1f}")
+        latency = recompute(path, A, window, min(seconds, RECOMPUTE_MAX))
+        print(f"{'recompute':>10} {1e6 * latency.mean():>10.1f} {1e6 * np.median(latency):>9.1f} "
+              f"{1e6 * np.percentile(latency, 99):>9.1f}")
+
+
+if __name__ == '__main__':
+    arguments = [int(a) for a in sys.argv[1:]]
+    run(*(arguments + [86400, 600][len(arguments):]))
@@ -0,0 +1,45 @@
+# Benchmark: build and solve time of generated process-synthesis superstructures (optlib/synthesis.py)
+# Random three-layer superstructures (raw materials, intermediates, products) with n candidate
+# processes, from the tables of random_superstructure. Reported per size:
+#   build     superstructure_model from the tables (big-M bounds and Pyomo model)
+#   solve     appsi HiGHS MILP solve, including loading the model into the solver
+#   installed processes in the optimal design, and the optimal profit
+# The first line is the HW7 network (hw7_tables) for comparison with HW7_1_1.py.
+#
+# Usage: python benchmarks/bench_superstructure.py [n_processes ...]
+import os
+import sys
+import time
+
+import pyomo.environ as pyo
+from pyomo.contrib.appsi.solvers import Highs
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.synthesis import hw7_tables, random_superstructure, superstructure_model
+
+
+def measure(processes, substances, required=()):
+    start = time.perf_counter()
+    m = superstructure_model(processes, substances, required=required)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    results = Highs().solve(m)
+    solve_time = time.perf_counter() - start
+    installed = sum(round(m.y[p].value) for p in m.P)
+    return m, build_time, solve_time, results.termination_condition.name, installed, 0.0 - results.best_feasible_objective
+
+
+def run(sizes):
+    print(f"{'processes':>10} {'substances':>11} {'variables':>10} {'constraints':>12} {'build [s]':>10} "
+          f"{'solve [s]':>10} {'status':>8} {'installed':>10} {'profit':>10}")
+    cases = [('HW7', hw7_tables(), ['C'])] + [(n, random_superstructure(n), ()) for n in sizes]
+    for label, (processes, substances), required in cases:
+        m, build_time, solve_time, status, installed, profit = measure(processes, substances, required)
+        variables = m.nvariables()
+        constraints = m.nconstraints()
+        print(f"{label:>10} {len(substances):>11} {variables:>10} {constraints:>12} {build_time:>10.4f} "
+              f"{solve_time:>10.3f} {status:>8} {installed:>10} {profit:>10.2f}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [3, 10, 30, 100, 300, 500])
@@ -0,0 +1,70 @@
+# Benchmark: price/demand scenario sweeps of the HW7 process-synthesis MILP (optlib/synthesis.py)
+# Random scenarios change the prices of A, B and C, the demand of C and the supply of A. Per
+# number of scenarios, the time of the sweep with:
+#   persistent  scenario_sweep: one appsi HiGHS instance, only the changed Params pushed per solve
+#   auto        one appsi HiGHS instance with its default checks for changed model components
+#   rebuild     process_model and a new HiGHS solver for every scenario, as the homework scripts did
+# and whether all three agree on every objective.
+#
+# Usage: python benchmarks/bench_synthesis_sweep.py [n_scenarios ...]
+import os
+import sys
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.contrib.appsi.solvers import Highs
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.synthesis import PRICES, process_model, scenario_sweep
+
+
+def random_scenarios(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{'p_s': {'A': rng.uniform(3, 7), 'B': rng.uniform(7, 12), 'C': -rng.uniform(12, 24)},
+             'CUB': rng.uniform(4, 16), 'AUB': rng.uniform(8, 20)} for _ in range(count)]
+
+
+def auto(scenarios):
+    m = process_model(CXUB=5)
+    opt = Highs()
+    objectives = []
+    for scenario in scenarios:
+        for index, value in scenario['p_s'].items():
+            m.p_s[index] = value
+        m.CUB, m.AUB = scenario['CUB'], scenario['AUB']
+        opt.solve(m)
+        objectives.append(pyo.value(m.obj))
+    return objectives
+
+
+def rebuild(scenarios):
+    objectives = []
+    for scenario in scenarios:
+        m = process_model(AUB=scenario['AUB'], CUB=scenario['CUB'], CXUB=5, p_s={**PRICES, **scenario['p_s']})
+        pyo.SolverFactory('appsi_highs').solve(m)
+        objectives.append(pyo.value(m.obj))
+    return objectives
+
+
+def run(sizes):
+    print(f"{'scenarios':>10} {'persistent [s]':>15} {'auto [s]':>9} {'rebuild [s]':>12} {'per solve [ms]':>15} {'agree':>6}")
+    for count in sizes:
+        scenarios = random_scenarios(count)
+        start = time.perf_counter()
+        rows = scenario_sweep(process_model(CXUB=5), scenarios, report=lambda m: {})
+        persistent_time = time.perf_counter() - start
+        start = time.perf_counter()
+        auto_objectives = auto(scenarios)
+        auto_time = time.perf_counter() - start
+        start = time.perf_counter()
+        rebuild_objectives = rebuild(scenarios)
+        rebuild_time = time.perf_counter() - start
+        objectives = [row['objective'] for row in rows]
+        agree = np.allclose(objectives, auto_objectives) and np.allclose(objectives, rebuild_objectives)
+        print(f"{count:>10} {persistent_time:>15.3f} {auto_time:>9.3f} {rebuild_time:>12.3f} "
+              f"{1e3 * persistent_time / count:>15.2f} {str(agree):>6}")
+
+
+if __name__ == '__main__':
+    run([int(n) for n in sys.argv[1:]] or [100, 300, 1000])
@@ -0,0 +1,60 @@
+# Report: solver runs recorded by optlib.solver_log
+# Every solve of an instrumented solver (instrument(pyo.SolverFactory(...))) is appended to
+# the JSONL store. This prints the recorded runs, then one line per setting (script, solver,
+# options, tag) with the number of runs, the median wall time and how the last run compares
+# with the one before it.
+#
+# Usage: python benchmarks/solver_runs.py [--store path] [--script text] [--solver name] [--last n]
+import argparse
+import json
+import os
+import sys
+from statistics import median
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from optlib.solver_log import STORE, load
+
+COLUMNS = ['iterations', 'barrier_iterations', 'nodes', 'gap', 'presolve_rows_removed', 'solve_time']
+
+
+def _format(value):
+    if value is None:
+        return '-'
+    return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+
+def run(records, last):
+    print(f"{'time':>19} {'script':>32} {'solver':>8} {'termination':>12} {'wall [s]':>9} "
+          + ' '.join(f"{c:>{len(c)}}" for c in COLUMNS))
+    for r in records[-last:]:
+        metrics = r.get('metrics', {})
+        print(f"{r['time']:>19} {str(r['script'])[-32:]:>32} {r['solver']:>8} {r.get('termination', r['status'])[:12]:>12} "
+              f"{r['wall_time']:>9.3f} " + ' '.join(f"{_format(metrics.get(c)):>{len(c)}}" for c in COLUMNS))
+
+    settings = {}
+    for r in records:
+        key = (r['script'], r['solver'], json.dumps(r['options'], sort_keys=True, default=str), r.get('tag'))
+        settings.setdefault(key, []).append(r)
+    print()
+    print(f"{'script':>32} {'solver':>8} {'options':>30} {'tag':>10} {'runs':>5} {'median [s]':>11} {'last/previous':>14} "
+          f"{'iterations':>16}")
+    for (script, solver, options, tag), runs in settings.items():
+        ratio, iterations = '-', _format(runs[-1].get('metrics', {}).get('iterations'))
+        if len(runs) > 1:
+            ratio = f"{runs[-1]['wall_time'] / max(runs[-2]['wall_time'], 1e-9):.2f}x"
+            iterations = f"{_format(runs[-2].get('metrics', {}).get('iterations'))} -> {iterations}"
+        print(f"{str(script)[-32:]:>32} {solver:>8} {options[-30:]:>30} {str(tag)[-10:]:>10} {len(runs):>5} "
+              f"{median(r['wall_time'] for r in runs):>11.3f} {ratio:>14} {iterations:>16}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Print the solver runs recorded by optlib.solver_log.')
+    parser.add_argument('--store', default=STORE, help='JSONL store of solver runs')
+    parser.add_argument('--script', help='only runs whose script path contains this text')
+    parser.add_argument('--solver', help='only runs of this solver')
+    parser.add_argument('--last', type=int, default=20, help='number of individual runs to list')
+    args = parser.parse_args()
+    records = [r for r in load(args.store)
+               if (args.script is None or args.script in str(r['script']))
+               and (args.solver is None or r['solver'] == args.solver)]
+    run(records, args.last)
@@ -0,0 +1 @@
+"""Shared numerical engines used by the homework and project scripts."""
@@ -0,0 +1,296 @@
+"""Small forward/reverse-mode automatic differentiation for NumPy objectives.
+
+Objectives are written with ordinary NumPy calls (np.exp, np.log, np.sum,
+indexing, arithmetic). Reverse mode records them on a tape through
+__array_ufunc__ and returns the exact gradient for about the cost of one
+extra function evaluation. Forward mode (Dual) carries a batch of k tangent
+directions; running the reverse sweep on Dual values differentiates the
+gradient along those directions, which gives k Hessian-vector products in
+a single pass.
+"""
+import itertools
+
+import numpy as np
+
+
+# Derivative rules of the supported ufuncs. For every input there is one
+# function returning the incoming adjoint (or tangent) g times the partial
+# derivative of the output with respect to that input.
+_RULES = {
+    np.add: (lambda g, a, b, out: g, lambda g, a, b, out: g),
+    np.subtract: (lambda g, a, b, out: g, lambda g, a, b, out: -g),
+    np.multiply: (lambda g, a, b, out: g * b, lambda g, a, b, out: g * a),
+    np.true_divide: (lambda g, a, b, out: g / b, lambda g, a, b, out: -g * out / b),
+    np.power: (lambda g, a, b, out: g * b * a**(b - 1), lambda g, a, b, out: g * out * np.log(a)),
+    np.negative: (lambda g, a, out: -g,),
+    np.exp: (lambda g, a, out: g * out,),
+    np.log: (lambda g, a, out: g / a,),
+    np.sqrt: (lambda g, a, out: 0.5 * g / out,),
+    np.square: (lambda g, a, out: 2 * g * a,),
+}
+
+
+def _index(idx):
+    return idx if isinstance(idx, tuple) else (idx,)
+
+
+def _unbroadcast(g, shape):
+    """Sum g over the axes that broadcasting added to an array of this shape."""
+    extra = g.ndim - len(shape)
+    if extra:
+        g = g.sum(axis=tuple(range(extra)))
+    axes = tuple(i for i, s in enumerate(shape) if s == 1 and g.shape[i] != 1)
+    if axes:
+        g = g.sum(axis=axes, keepdims=True)
+    return g
+
+
+def _scatter(shape, idx, g):
+    """Adjoint of x[idx]: an array of the given shape holding g at idx."""
+    if isinstance(g, Dual):
+        return Dual(_scatter(shape, idx, g.value), _scatter((g.k,) + shape, (slice(None),) + _index(idx), g.tangent))
+    out = np.zeros(shape)
+    np.add.at(out, idx, g)
+    return out
+
+
+def _operand(x):
+    return x if isinstance(x, _Operators) else np.asarray(x, dtype=float)
+
+
+def _matmul(a, b):
+    # Written with broadcasting and sums so that Var and Dual need no extra rules
+    if a.ndim == 1 and b.ndim == 1:
+        return (a * b).sum()
+    if a.ndim == 1:
+        return (a[:, None] * b).sum(axis=0)
+    if b.ndim == 1:
+        return (a * b).sum(axis=-1)
+    return (a[:, :, None] * b[None, :, :]).sum(axis=1)
+
+
+class _Operators:
+    """Python operators routed through the NumPy ufuncs."""
+
+    __array_priority__ = 1000
+
+    def __add__(self, other): return np.add(self, other)
+    def __radd__(self, other): return np.add(other, self)
+    def __sub__(self, other): return np.subtract(self, other)
+    def __rsub__(self, other): return np.subtract(other, self)
+    def __mul__(self, other): return np.multiply(self, other)
+    def __rmul__(self, other): return np.multiply(other, self)
+    def __truediv__(self, other): return np.true_divide(self, other)
+    def __rtruediv__(self, other): return np.true_divide(other, self)
+    def __pow__(self, other): return np.power(self, other)
+    def __rpow__(self, other): return np.power(other, self)
+    def __neg__(self): return np.negative(self)
+    def __matmul__(self, other): return _matmul(self, _operand(other))
+    def __rmatmul__(self, other): return _matmul(_operand(other), self)
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    @property
+    def size(self):
+        return self.value.size
+
+    def __len__(self):
+        return len(self.value)
+
+
+class Dual(_Operators):
+    """Forward-mode value with k tangent directions, tangent.shape == (k,) + value.shape."""
+
+    def __init__(self, value, tangent):
+        self.value = np.asarray(value, dtype=float)
+        self.tangent = np.asarray(tangent, dtype=float)
+        self.k = self.tangent.shape[0]
+
+    def _lift(self, ndim):
+        # Align the tangent with an output of ndim dimensions (batch axis first)
+        return self.tangent.reshape((self.k,) + (1,) * (ndim - self.value.ndim) + self.value.shape)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if ufunc is np.matmul and method == '__call__' and not kwargs:
+            return _matmul(*map(_operand, inputs))
+        if method != '__call__' or kwargs or ufunc not in _RULES:
+            return NotImplemented
+        values = [x.value if isinstance(x, Dual) else x for x in inputs]
+        out = ufunc(*values)
+        tangent = None
+        for i, x in enumerate(inputs):
+            if isinstance(x, Dual):
+                term = _RULES[ufunc][i](x._lift(np.ndim(out)), *values, out)
+                tangent = term if tangent is None else tangent + term
+        return Dual(out, np.broadcast_to(tangent, (self.k,) + np.shape(out)))
+
+    def __getitem__(self, idx):
+        return Dual(self.value[idx], self.tangent[(slice(None),) + _index(idx)])
+
+    def sum(self, axis=None, dtype=None, out=None, keepdims=False):
+        if axis is None:
+            axis = tuple(range(self.value.ndim))
+        axes = tuple(a % self.value.ndim + 1 for a in np.atleast_1d(axis))
+        return Dual(self.value.sum(axis=axis, keepdims=keepdims), self.tangent.sum(axis=axes, keepdims=keepdims))
+
+    def reshape(self, *shape):
+        shape = shape[0] if len(shape) == 1 else shape
+        value = self.value.reshape(shape)
+        return Dual(value, self.tangent.reshape((self.k,) + value.shape))
+
+
+class Var(_Operators):
+    """Reverse-mode node on the tape. value may be an ndarray or a Dual."""
+
+    _ids = itertools.count()
+
+    def __init__(self, value, parents=()):
+        self.value = value if isinstance(value, Dual) else np.asarray(value, dtype=float)
+        self.parents = parents  # tuple of (Var, vjp) pairs
+        self.id = next(Var._ids)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if ufunc is np.matmul and method == '__call__' and not kwargs:
+            return _matmul(*map(_operand, inputs))
+        if method != '__call__' or kwargs or ufunc not in _RULES:
+            return NotImplemented
+        values = [x.value if isinstance(x, Var) else x for x in inputs]
+        out = ufunc(*values)
+        parents = []
+        for i, x in enumerate(inputs):
+            if isinstance(x, Var):
+                def vjp(g, i=i, shape=x.shape):
+                    return _unbroadcast(_RULES[ufunc][i](g, *values, out), shape)
+                parents.append((x, vjp))
+        return Var(out, tuple(parents))
+
+    def __getitem__(self, idx):
+        shape = self.shape
+        return Var(self.value[idx], ((self, lambda g: _scatter(shape, idx, g)),))
+
+    def sum(self, axis=None, dtype=None, out=None, keepdims=False):
+        shape = self.shape
+
+        def vjp(g):
+            if axis is not None and not keepdims:
+                axes = [a % len(shape) for a in np.atleast_1d(axis)]
+                g = g.reshape(tuple(1 if i in axes else s for i, s in enumerate(shape)))
+            return g + np.zeros(shape)
+
+        return Var(self.value.sum(axis=axis, keepdims=keepdims), ((self, vjp),))
+
+    def reshape(self, *shape):
+        shape = shape[0] if len(shape) == 1 else shape
+        old = self.shape
+        return Var(self.value.reshape(shape), ((self, lambda g: g.reshape(old)),))
+
+    def backward(self):
+        """Adjoints of this scalar node with respect to every node on its tape."""
+        order, stack, seen = [], [self], {self.id}
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for parent, _ in node.parents:
+                if parent.id not in seen:
+                    seen.add(parent.id)
+                    stack.append(parent)
+        order.sort(key=lambda node: node.id, reverse=True)
+        grads = {self.id: np.ones(self.shape)}
+        for node in order:
+            g = grads.pop(node.id, None)
+            if g is None:
+                continue
+            node.grad = g
+            for parent, vjp in node.parents:
+                contrib = vjp(g)
+                grads[parent.id] = contrib if parent.id not in grads else grads[parent.id] + contrib
+
+
+def value_and_grad(f, x):
+    """f(x) and its exact gradient from one taped forward pass and one reverse sweep."""
+    xv = Var(np.asarray(x, dtype=float))
+    out = f(xv)
+    out.backward()
+    return float(out.value), np.asarray(xv.grad + np.zeros(xv.shape))
+
+
+def batch_value_and_grad(f, X):
+    """Values and gradients of a batched objective at every row of X.
+
+    The rows do not interact, so one reverse sweep of sum(f(X)) gives every
+    row's gradient at once.
+    """
+    Xv = Var(np.asarray(X, dtype=float))
+    out = f(Xv)
+    out.sum().backward()
+    return np.asarray(out.value), np.asarray(Xv.grad + np.zeros(Xv.shape))
+
+
+def hessian_vector_products(f, x, V):
+    """Gradient of f at x and the products H @ v for every row v of V.
+
+    The reverse sweep runs on Dual values seeded with the directions V, so all
+    products come from one forward-over-reverse pass.
+    """
+    x = np.asarray(x, dtype=float)
+    V = np.atleast_2d(np.asarray(V, dtype=float))
+    xv = Var(Dual(x, V))
+    out = f(xv)
+    out.backward()
+    g = xv.grad + Dual(np.zeros(x.shape), np.zeros(V.shape))
+    return g.value, g.tangent
+
+
+class AutoDiff:
+    """Exact derivatives of f with the same interface as FiniteDifference.
+
+    nfev counts plain evaluations, ngev taped gradient passes and nhvp
+    Hessian-vector products.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.nfev = 0
+        self.ngev = 0
+        self.nhvp = 0
+        self._x = None
+        self._cache = {}
+
+    def _point(self, x):
+        x = np.asarray(x, dtype=float)
+        if self._x is None or self._x.shape != x.shape or not np.array_equal(self._x, x):
+            self._x = x.copy()
+            self._cache = {}
+        return self._x
+
+    def value(self, x):
+        x = self._point(x)
+        if 'f' not in self._cache:
+            self.nfev += 1
+            self._cache['f'] = float(self.f(x))
+        return self._cache['f']
+
+    def gradient(self, x):
+        x = self._point(x)
+        if 'g' not in self._cache:
+            self.ngev += 1
+            self._cache['f'], self._cache['g'] = value_and_grad(self.f, x)
+        return self._cache['g']
+
+    def hvp(self, x, v):
+        x = self._point(x)
+        v = np.asarray(v, dtype=float)
+        self.nhvp += 1 if v.ndim == 1 else v.shape[0]
+        g, Hv = hessian_vector_products(self.f, x, v)
+        self._cache['g'] = g
+        return Hv[0] if v.ndim == 1 else Hv
+
+    def hessian(self, x):
+        H = self.hvp(x, np.eye(np.size(x)))
+        return 0.5 * (H + H.T)
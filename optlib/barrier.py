@@ -0,0 +1,197 @@
+"""Log-barrier method for min f(x) subject to g(x) <= 0 in n variables.
+
+The centering problem min t*f(x) - sum_i log(-g_i(x)) is solved by Newton's
+method. Its gradient and Hessian are assembled from the constraint values
+and Jacobian with matrix operations over all constraints at once:
+
+    grad = t*grad_f + J' (1/-g)
+    hess = t*hess_f + J' diag(1/g^2) J + sum_i (1/-g_i) hess_g_i
+
+Every centering step is warm-started from the previous center, and the
+outer loop stops when the duality gap bound m/t falls below epsilon.
+"""
+import numpy as np
+
+from optlib.line_search import LineSearch
+from optlib.newton import newton_direction
+
+
+def linear_constraints(A, b):
+    """Callback for the constraints A x - b <= 0."""
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    return lambda x: (A @ x - b, A)
+
+
+def stack_constraints(*blocks):
+    """Combine (constraints, constraint_hessian) pairs into one pair.
+
+    constraint_hessian may be None for linear blocks.
+    """
+    def constraints(x):
+        values = [c(x) for c, _ in blocks]
+        return np.concatenate([g for g, _ in values]), np.vstack([J for _, J in values])
+
+    def constraint_hessian(x, w):
+        H = np.zeros((len(x), len(x)))
+        start = 0
+        for c, hess in blocks:
+            size = len(c(x)[0])
+            if hess is not None:
+                H += hess(x, w[start:start + size])
+            start += size
+        return H
+
+    return constraints, constraint_hessian
+
+
+def barrier_value(x, t, objective, constraints):
+    """t*f(x) - sum_i log(-g_i(x)), or None when x is not strictly feasible."""
+    g, _ = constraints(x)
+    if np.any(g >= 0):
+        return None
+    return t * objective(x)[0] - np.sum(np.log(-g))
+
+
+def barrier_derivatives(x, t, objective, constraints, constraint_hessian=None):
+    """Gradient and Hessian of t*f(x) - sum_i log(-g_i(x)) at a strictly feasible x."""
+    g, J = constraints(x)
+    _, grad_f, hess_f = objective(x)
+    inv = 1 / -g
+    grad = t * grad_f + J.T @ inv
+    hess = t * hess_f + (J.T * inv**2) @ J
+    if constraint_hessian is not None:
+        hess += constraint_hessian(x, inv)
+    return grad, hess
+
+
+def barrier_method(objective, constraints, x0, constraint_hessian=None, t0=1.0, mu=10.0, epsilon=1e-8,
+                   newton_tol=1e-10, max_newton=100, alpha=0.01, beta=0.5, line_search=None):
+    """Log-barrier method with warm-started Newton centering.
+
+    objective(x) returns (f, grad, hess); constraints(x) returns the values g(x)
+    (feasible when all are < 0) and the Jacobian; constraint_hessian(x, w)
+    returns sum_i w_i * hess g_i(x) and may be omitted when all constraints are
+    linear. x0 must be strictly feasible. The Armijo line search counts
+    infeasible trial points as +inf, so every step stays strictly inside.
+
+    Returns a dict with the solution, objective, final duality-gap bound, the
+    path of centers, a per-outer-iteration history and the counts of barrier
+    values (nfev) and barrier gradient/Hessian assemblies (ndev).
+    """
+    ls = line_search or LineSearch('armijo', c1=alpha, beta=beta)
+    x = np.array(x0, dtype=float)
+    g, _ = constraints(x)
+    if np.any(g >= 0):
+        raise ValueError('The starting point must be strictly feasible')
+    m = len(g)
+    t = t0
+    path = [x.copy()]
+    history = []
+    nfev = ndev = newton_iterations = 0
+    ls_nfev = ls.nfev
+
+    def fun(z):
+        value = barrier_value(z, t, objective, constraints)
+        return np.inf if value is None else value
+
+    while True:
+        # Centering step, warm-started from the previous center
+        value = fun(x)
+        nfev += 1
+        for k in range(max_newton):
+            grad, hess = barrier_derivatives(x, t, objective, constraints, constraint_hessian)
+            ndev += 1
+            dx, _ = newton_direction(hess, grad)
+            decrement = -grad @ dx
+            if decrement / 2 <= newton_tol:
+                break
+            step, new_value, _ = ls(fun, x, dx, value, grad)
+            if step is None:
+                break
+            x = x + step * dx
+            value = new_value
+            newton_iterations += 1
+
+        path.append(x.copy())
+        history.append({'t': t, 'gap': m / t, 'newton_iterations': k, 'f': objective(x)[0]})
+        if m / t < epsilon:
+            break
+        t *= mu
+
+    return {'x': x, 'fun': objective(x)[0], 'gap': m / t, 'path': path, 'history': history,
+            'newton_iterations': newton_iterations, 'nfev': nfev + ls.nfev - ls_nfev, 'ndev': ndev}
+
+
+def barrier_method_bfgs(objective, constraints, x0, t0=1.0, mu=4.0, epsilon=1e-4, gtol=1e-6, max_iter=500,
+                        warm_start=True, line_search=None):
+    """Log-barrier method with BFGS centering on f(x) - (1/t) * sum_i log(-g_i(x)).
+
+    Only the objective value and gradient are used: objective(x) returns
+    (f, grad, ...) and constraints(x) returns (g, J). The barrier gradient
+    grad_f + J' (1/-g) / t is computed analytically over all constraints at
+    once. Trial points outside the strictly feasible region count as +inf, so
+    the strong Wolfe line search shrinks back into the region instead of
+    clamping the logarithms.
+
+    With warm_start=True the inverse Hessian approximation is carried from
+    one value of t to the next (the iterate is always carried). Returns a
+    dict with the solution, path of centers and a per-outer-step history of
+    BFGS iterations and evaluations.
+    """
+    x = np.array(x0, dtype=float)
+    n = x.size
+    if np.any(constraints(x)[0] >= 0):
+        raise ValueError('The starting point must be strictly feasible')
+    t = t0
+    H, fresh = np.eye(n), True
+    path = [x.copy()]
+    history = []
+    ls = line_search or LineSearch('wolfe')
+    cache = {}
+
+    def evaluate(z):
+        # The value and gradient share the constraint evaluation at z
+        key = z.tobytes()
+        if key not in cache:
+            g, J = constraints(z)
+            if np.any(g >= 0):
+                cache[key] = np.inf, None
+            else:
+                f, grad_f = objective(z)[:2]
+                cache[key] = f - np.sum(np.log(-g)) / t, grad_f + J.T @ (1 / -g) / t
+        return cache[key]
+
+    while 1 / t > epsilon:
+        cache.clear()
+        start = ls.nfev
+        if not warm_start:
+            H, fresh = np.eye(n), True
+        fx, grad = evaluate(x)
+        for k in range(max_iter):
+            if np.linalg.norm(grad, np.inf) < gtol:
+                break
+            p = -H @ grad
+            if grad @ p >= 0:  # the carried approximation is no longer positive definite
+                H, fresh = np.eye(n), True
+                p = -grad
+            alpha, f_new, grad_new = ls(lambda z: evaluate(z)[0], x, p, fx, grad, grad=lambda z: evaluate(z)[1])
+            if alpha is None:
+                break
+            s = alpha * p
+            y = grad_new - grad
+            sy = s @ y
+            if sy > 1e-12 * np.linalg.norm(s) * np.linalg.norm(y):
+                if fresh:
+                    # Scale the identity to the curvature seen along the first step
+                    H, fresh = (sy / (y @ y)) * np.eye(n), False
+                Hy = H @ y
+                H += ((sy + y @ Hy) * np.outer(s, s)) / sy**2 - (np.outer(Hy, s) + np.outer(s, Hy)) / sy
+            x, fx, grad = x + s, f_new, grad_new
+            cache.clear()
+        path.append(x.copy())
+        history.append({'t': t, 'iterations': k, 'nfev': ls.nfev - start + 1, 'f': objective(x)[0]})
+        t *= mu
+
+    return {'x': x, 'fun': objective(x)[0], 'path': path, 'history': history,
+            'nfev': sum(h['nfev'] for h in history)}
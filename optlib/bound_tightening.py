@@ -0,0 +1,237 @@
+"""Big-M tightening by feasibility-based bound tightening (FBBT).
+
+The linear constraints of a Pyomo model are collected into a sparse
+matrix with row bounds lo <= A x <= hi. FBBT then shrinks the variable
+bounds: every row bounds each of its variables by the row bound minus the
+extreme activity of the other entries,
+
+    a_j x_j <= hi - min(sum_{k != j} a_k x_k)
+
+over all rows at once, until no bound moves or the passes run out
+(integer variables are rounded).
+
+A row with one binary y,  a'x + c y <= b, holds a'x <= b in one state of y
+and a'x <= b + M in the other, M = |c|. Any feasible point lies in the
+propagated bounds, so M may be lowered to max(a'x) - b over them without
+cutting it off; tighten_big_m rewrites those rows (HW7 activation rows
+x <= M y, and both forms of the job-shop disjunctions).
+"""
+import io
+import math
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.common.tee import capture_output
+from pyomo.repn import generate_standard_repn
+from scipy.sparse import csr_matrix
+
+from optlib.solver_log import parse_log
+
+
+def linear_rows(model):
+    """Active linear constraints of the model as (constraints, variables, A, lo, hi).
+
+    The constants of the bodies are moved into lo and hi (-inf/inf when a
+    side is missing). Nonlinear constraints are left out.
+    """
+    constraints, variables, column = [], [], {}
+    rows, cols, data, lo, hi = [], [], [], [], []
+    for con in model.component_data_objects(pyo.Constraint, active=True, descend_into=True):
+        repn = generate_standard_repn(con.body, compute_values=True, quadratic=False)
+        if not repn.is_linear():
+            continue
+        row = len(constraints)
+        constraints.append(con)
+        for v, a in zip(repn.linear_vars, repn.linear_coefs):
+            if id(v) not in column:
+                column[id(v)] = len(variables)
+                variables.append(v)
+            rows.append(row)
+            cols.append(column[id(v)])
+            data.append(a)
+        constant = repn.constant
+        lo.append(-math.inf if con.lower is None else pyo.value(con.lower) - constant)
+        hi.append(math.inf if con.upper is None else pyo.value(con.upper) - constant)
+    A = csr_matrix((data, (rows, cols)), shape=(len(constraints), len(variables)))
+    A.sum_duplicates()
+    return constraints, variables, A, np.array(lo), np.array(hi)
+
+
+def _activity(A, lower, upper):
+    # Per entry the smallest and largest value of a_ij x_j, and per row their finite sums and infinite counts
+    rows = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+    a, l, u = A.data, lower[A.indices], upper[A.indices]
+    with np.errstate(invalid='ignore'):
+        low = np.where(a > 0, a * l, a * u)
+        high = np.where(a > 0, a * u, a * l)
+    low_inf, high_inf = np.isinf(low), np.isinf(high)
+    m = A.shape[0]
+    low_sum = np.bincount(rows, np.where(low_inf, 0.0, low), minlength=m)
+    high_sum = np.bincount(rows, np.where(high_inf, 0.0, high), minlength=m)
+    return rows, low, high, low_sum, high_sum, np.bincount(rows, low_inf, minlength=m), \
+        np.bincount(rows, high_inf, minlength=m)
+
+
+def fbbt(A, lo, hi, lower, upper, integer=None, passes=20, tol=1e-9):
+    """Propagate the rows lo <= A x <= hi into the variable bounds; returns the tightened (lower, upper).
+
+    Raises ValueError when the propagation empties a variable's domain (the
+    constraints are infeasible).
+    """
+    lower, upper = np.array(lower, dtype=float), np.array(upper, dtype=float)
+    integer = np.zeros(len(lower), dtype=bool) if integer is None else np.asarray(integer, dtype=bool)
+    A = csr_matrix(A)
+    A.data[np.abs(A.data) < 1e-12] = 0.0
+    A.eliminate_zeros()
+    a, cols = A.data, A.indices
+    for _ in range(passes):
+        rows, low, high, low_sum, high_sum, low_count, high_count = _activity(A, lower, upper)
+        # Activity of the rest of the row without entry e
+        rest_low = np.where(low_count[rows] - np.isinf(low) > 0, -np.inf,
+                            low_sum[rows] - np.where(np.isinf(low), 0.0, low))
+        rest_high = np.where(high_count[rows] - np.isinf(high) > 0, np.inf,
+                             high_sum[rows] - np.where(np.isinf(high), 0.0, high))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            from_hi = (hi[rows] - rest_low) / a      # a x_j <= hi - rest_low
+            from_lo = (lo[rows] - rest_high) / a     # a x_j >= lo - rest_high
+        positive = a > 0
+        new_upper = np.full(len(upper), np.inf)
+        new_lower = np.full(len(lower), -np.inf)
+        np.minimum.at(new_upper, cols, np.nan_to_num(np.where(positive, from_hi, from_lo), nan=np.inf,
+                                                     posinf=np.inf, neginf=-np.inf))
+        np.maximum.at(new_lower, cols, np.nan_to_num(np.where(positive, from_lo, from_hi), nan=-np.inf,
+                                                     posinf=np.inf, neginf=-np.inf))
+        new_upper = np.where(integer, np.floor(new_upper + tol), new_upper)
+        new_lower = np.where(integer, np.ceil(new_lower - tol), new_lower)
+        # Accept only moves larger than the tolerance, so the passes stop instead of creeping
+        scale = tol * (1 + np.abs(upper))
+        tighter_upper = new_upper < upper - np.where(np.isinf(upper), 0.0, scale)
+        scale = tol * (1 + np.abs(lower))
+        tighter_lower = new_lower > lower + np.where(np.isinf(lower), 0.0, scale)
+        if not (tighter_upper.any() or tighter_lower.any()):
+            break
+        upper = np.where(tighter_upper, new_upper, upper)
+        lower = np.where(tighter_lower, new_lower, lower)
+        empty = lower > upper + tol * (1 + np.abs(upper))
+        if empty.any():
+            raise ValueError(f"Bound propagation empties the domain of {int(empty.sum())} variables: "
+                             "the constraints are infeasible")
+    return lower, upper
+
+
+def _bounds(variables):
+    lower = np.array([-math.inf if v.lb is None else v.lb for v in variables], dtype=float)
+    upper = np.array([math.inf if v.ub is None else v.ub for v in variables], dtype=float)
+    integer = np.array([v.is_integer() for v in variables])
+    binary = np.array([v.is_binary() or (v.is_integer() and v.lb == 0 and v.ub == 1) for v in variables])
+    return lower, upper, integer, binary
+
+
+def tighten_big_m(model, passes=20, tol=1e-9):
+    """Rewrite every one-sided linear row with a single binary to the smallest valid big-M, in place.
+
+    The variable bounds are propagated over all linear rows (they are not
+    changed in the model). A row a'x + c y <= b (or >=) with y binary is
+    rewritten with numeric coefficients when max(a'x) over the propagated
+    bounds is below its relaxed right-hand side; equality and range rows
+    are left alone. A rewritten row no longer follows the Params it was
+    built from, so tighten a model after its data are final. Returns one
+    dict per rewritten row: the constraint, the binary, and the old and new M.
+    """
+    constraints, variables, A, lo, hi = linear_rows(model)
+    lower, upper, integer, binary = _bounds(variables)
+    lower, upper = fbbt(A, lo, hi, lower, upper, integer, passes=passes, tol=tol)
+    report = []
+    for r, con in enumerate(constraints):
+        if np.isfinite(lo[r]) == np.isfinite(hi[r]):
+            continue
+        start, end = A.indptr[r], A.indptr[r + 1]
+        cols, coefs = A.indices[start:end], A.data[start:end]
+        is_binary = binary[cols] & (coefs != 0)
+        if is_binary.sum() != 1 or len(cols) < 2:
+            continue
+        # As a'x + c y <= b
+        sign = 1.0 if np.isfinite(hi[r]) else -1.0
+        b = hi[r] if sign > 0 else -lo[r]
+        coefs = sign * coefs
+        k = int(np.flatnonzero(is_binary)[0])
+        c = coefs[k]
+        rest = np.delete(np.arange(len(cols)), k)
+        a, x = coefs[rest], cols[rest]
+        top = np.sum(np.where(a > 0, a * upper[x], a * lower[x]))
+        if not np.isfinite(top):
+            continue
+        # Tight state: y = 0 when c < 0 (a'x <= b), y = 1 when c > 0 (a'x <= b - c)
+        tight = b if c < 0 else b - c
+        M, new_M = abs(c), max(top - tight, 0.0)
+        if new_M >= M - tol * (1 + M):
+            continue
+        y = variables[cols[k]]
+        body = sum(float(coef) * variables[j] for coef, j in zip(a, x))
+        if c < 0:
+            con.set_value(body - new_M * y <= tight)
+        else:
+            con.set_value(body + new_M * y <= tight + new_M)
+        report.append({'constraint': con.name, 'binary': y.name, 'M': M, 'new_M': new_M})
+    return report
+
+
+def _relaxed_bound(model, solver):
+    # Optimum of the LP relaxation, with the integer variables made continuous within their bounds and restored
+    integers = [v for v in model.component_data_objects(pyo.Var) if v.is_integer()]
+    saved = [(v.domain, v.lower, v.upper) for v in integers]
+    for v in integers:
+        v.setlb(v.lb)
+        v.setub(v.ub)
+        v.domain = pyo.Reals
+    try:
+        pyo.SolverFactory(solver).solve(model)
+        return pyo.value(next(model.component_data_objects(pyo.Objective, active=True)))
+    finally:
+        for v, (domain, lower, upper) in zip(integers, saved):
+            v.domain = domain
+            v.lower, v.upper = lower, upper
+
+
+def relaxation_stats(model, solver='appsi_highs'):
+    """LP relaxation and MILP optimum of a model, the relative gap between them and the B&B nodes.
+
+    The MILP is solved with the log captured and parsed by
+    optlib.solver_log (nodes is None if the solver does not report them),
+    and timed; the model keeps the MILP solution.
+    """
+    lp = _relaxed_bound(model, solver)
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with capture_output(buffer):
+        results = pyo.SolverFactory(solver).solve(model, tee=True)
+    elapsed = time.perf_counter() - start
+    mip = pyo.value(next(model.component_data_objects(pyo.Objective, active=True)))
+    metrics = parse_log(buffer.getvalue())
+    return {'lp': lp, 'mip': mip, 'gap': abs(mip - lp) / max(abs(mip), 1e-10), 'nodes': metrics.get('nodes'),
+            'time': elapsed, 'termination': str(results.solver.termination_condition)}
+
+
+def big_m_report(model, solver='appsi_highs', passes=20):
+    """Tighten the big-M rows of the model in place, with relaxation_stats before and after.
+
+    Returns a dict with the rewritten rows (tighten_big_m) and the
+    statistics of the original (before) and the tightened model (after).
+    """
+    before = relaxation_stats(model, solver)
+    rows = tighten_big_m(model, passes=passes)
+    after = relaxation_stats(model, solver)
+    return {'rows': rows, 'before': before, 'after': after}
+
+
+def format_report(report):
+    """The big_m_report as text: the rewritten rows and the gap and node count before and after."""
+    lines = [f"{len(report['rows'])} big-M rows tightened"]
+    lines += [f"  {row['constraint']}: M {row['M']:.4g} -> {row['new_M']:.4g}" for row in report['rows']]
+    lines.append(f"{'':>8} {'LP bound':>12} {'MILP':>12} {'gap':>8} {'nodes':>6}")
+    for key in ('before', 'after'):
+        stats = report[key]
+        lines.append(f"{key:>8} {stats['lp']:>12.4f} {stats['mip']:>12.4f} {100 * stats['gap']:>7.2f}% "
+                     f"{str(stats['nodes']):>6}")
+    return '\n'.join(lines)
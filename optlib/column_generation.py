@@ -0,0 +1,131 @@
+"""Path-based column generation for the multicommodity flow problem of HW2_4.py.
+
+Dantzig-Wolfe path formulation: commodity k ships demands[k] from source[k]
+to sink[k] split over source-sink paths, and the paths of all commodities
+share the arc capacities.
+
+    min  sum_p c_p lam_p
+    s.t. sum_{p of k} lam_p = d_k               (dual sigma_k)
+         sum_{p uses e} lam_p <= u_e            (dual w_e <= 0, finite u_e only)
+         lam >= 0
+
+The restricted master starts from one expensive artificial column per
+commodity and is kept in one highspy.Highs instance, so every re-solve after
+adding columns starts from the previous simplex basis. A path of commodity k
+prices out when its length under the arc lengths c_e - w_e is below
+sigma_k. Pricing runs Dijkstra from every distinct source at once
+(scipy.sparse.csgraph) and adds the shortest path of every commodity with a
+negative reduced cost. A commodity whose source is its sink is shipped on
+the empty path, with no arcs and zero cost.
+"""
+import highspy
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+
+def _shortest_arcs(n, tails, heads, length):
+    # Among parallel arcs keep the shortest: CSR graph on unique (tail, head) and the arc kept for each pair
+    key = tails * n + heads
+    order = np.lexsort((length, key))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = key[order][1:] != key[order][:-1]
+    kept = order[first]
+    graph = csr_matrix((length[kept], (tails[kept], heads[kept])), shape=(n, n))
+    return graph, key[kept], kept
+
+
+def path_column_generation(nodes, edges, commodities, source, sink, demands, costs, capacities, tol=1e-9,
+                           max_rounds=1000, big_m=None):
+    """Multicommodity min-cost flow by column generation over paths.
+
+    Takes the data of optlib.sparse_lp.multicommodity_flow_lp. Returns a
+    dict with the status ('optimal', 'infeasible' or 'max_rounds'), the
+    objective, the paths with positive flow per commodity as (node list,
+    flow) pairs, the arc flow per (commodity, edge) with a nonzero value, the
+    number of pricing rounds and columns, and the arc duals w_e.
+    """
+    nodes, edges, commodities = list(nodes), list(edges), list(commodities)
+    n, m, K = len(nodes), len(edges), len(commodities)
+    index = {node: i for i, node in enumerate(nodes)}
+    tails = np.array([index[i] for i, _ in edges], dtype=np.int64)
+    heads = np.array([index[j] for _, j in edges], dtype=np.int64)
+    cost = np.array([costs[e] for e in edges], dtype=float)
+    if np.any(cost < 0):
+        raise ValueError('Path pricing by Dijkstra needs nonnegative arc costs')
+    capacity = np.array([capacities[e] for e in edges], dtype=float)
+    capacitated = np.flatnonzero(np.isfinite(capacity))
+    row_of_edge = np.full(m, -1, dtype=np.int64)
+    row_of_edge[capacitated] = K + np.arange(len(capacitated))
+    demand = np.array([demands[k] for k in commodities], dtype=float)
+    src = np.array([index[source[k]] for k in commodities])
+    dst = np.array([index[sink[k]] for k in commodities])
+    # An artificial column costs more than any simple path
+    big_m = big_m or 1.0 + n * max(1.0, cost.max(initial=0.0))
+
+    inf = highspy.kHighsInf
+    master = highspy.Highs()
+    master.setOptionValue('output_flag', False)
+    master.addRows(K, demand, demand, 0, np.zeros(K, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0))
+    master.addRows(len(capacitated), np.full(len(capacitated), -inf), capacity[capacitated], 0,
+                   np.zeros(len(capacitated), dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0))
+    master.addCols(K, np.full(K, big_m), np.zeros(K), np.full(K, inf), K, np.arange(K, dtype=np.int32),
+                   np.arange(K, dtype=np.int32), np.ones(K))
+    columns = [(k, None) for k in range(K)]   # (commodity, arc indices of the path); None is artificial
+
+    sources, source_row = np.unique(src, return_inverse=True)
+    status = 'max_rounds'
+    for rounds in range(1, max_rounds + 1):
+        master.run()
+        solution = master.getSolution()
+        duals = np.asarray(solution.row_dual)
+        sigma = duals[:K]
+        w = np.zeros(m)
+        w[capacitated] = np.minimum(duals[K:], 0.0)
+
+        # Pricing: shortest paths under c_e - w_e from every distinct source
+        graph, keys, kept = _shortest_arcs(n, tails, heads, cost - w)
+        dist, pred = dijkstra(graph, indices=sources, return_predecessors=True)
+        length = dist[source_row, dst]
+        improving = np.flatnonzero(length - sigma < -tol * np.maximum(1.0, np.abs(sigma)))
+        if len(improving) == 0:
+            status = 'optimal'
+            break
+
+        starts, indices, values, path_costs = [], [], [], []
+        nnz = 0
+        for k in improving.tolist():
+            row = pred[source_row[k]]
+            path = [dst[k]]
+            while path[-1] != src[k]:
+                path.append(row[path[-1]])
+            path = np.array(path[::-1])
+            arcs = kept[np.searchsorted(keys, path[:-1] * n + path[1:])]
+            rows = row_of_edge[arcs]
+            rows = np.concatenate([[k], rows[rows >= 0]])
+            starts.append(nnz)
+            indices.append(rows)
+            values.append(np.ones(len(rows)))
+            path_costs.append(cost[arcs].sum())
+            nnz += len(rows)
+            columns.append((k, arcs))
+        master.addCols(len(improving), np.array(path_costs), np.zeros(len(improving)), np.full(len(improving), inf),
+                       nnz, np.array(starts, dtype=np.int32), np.concatenate(indices).astype(np.int32),
+                       np.concatenate(values))
+
+    flow = np.asarray(master.getSolution().col_value)
+    if status == 'optimal' and np.any(flow[:K] > tol * np.maximum(1.0, demand)):
+        status = 'infeasible'
+    paths = {k: [] for k in commodities}
+    arc_flow = {}
+    for (k, arcs), value in zip(columns, flow.tolist()):
+        if arcs is None or value <= tol:
+            continue
+        commodity = commodities[k]
+        route = [source[commodity]] + [nodes[h] for h in heads[arcs].tolist()]
+        paths[commodity].append((route, value))
+        for e in arcs.tolist():
+            arc_flow[commodity, edges[e]] = arc_flow.get((commodity, edges[e]), 0.0) + value
+    return {'status': status, 'objective': master.getInfo().objective_function_value,
+            'paths': paths, 'flow': arc_flow, 'rounds': rounds, 'columns': len(columns) - K,
+            'duals': dict(zip(edges, w.tolist()))}
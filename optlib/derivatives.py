@@ -0,0 +1,166 @@
+"""Batched finite-difference derivatives.
+
+The objective must accept an array of shape (k, n) and return k values, so
+that all perturbed points of a gradient or Hessian go through f in a single
+call. f(x) is cached for the current x and shared by value(), gradient()
+and hessian(). The points x +- h e_i are cached by step size, so the Hessian
+reuses those of the gradient only when h_hess == h; with the default steps
+(GRADIENT_STEPS, HESSIAN_STEPS) they differ and only f(x) is shared.
+"""
+import numpy as np
+
+# Default step sizes for the gradient and the Hessian of each scheme
+GRADIENT_STEPS = {'forward': 1e-7, 'central': 1e-5, 'complex': 1e-20}
+HESSIAN_STEPS = {'forward': 1e-4, 'central': 1e-4, 'complex': 1e-4}
+
+
+class FiniteDifference:
+    """Forward, central or complex-step derivatives of a batched objective f.
+
+    nfev counts evaluated points and ncalls counts calls to f.
+    """
+
+    def __init__(self, f, scheme='central', h=None, h_hess=None):
+        if scheme not in GRADIENT_STEPS:
+            raise ValueError(f"Unknown scheme '{scheme}', use 'forward', 'central' or 'complex'")
+        self.f = f
+        self.scheme = scheme
+        self.h = GRADIENT_STEPS[scheme] if h is None else h
+        self.h_hess = HESSIAN_STEPS[scheme] if h_hess is None else h_hess
+        self.nfev = 0
+        self.ncalls = 0
+        self._x = None
+        self._cache = {}
+
+    def _eval(self, X):
+        """Evaluate f on the rows of X in one call."""
+        self.nfev += X.shape[0]
+        self.ncalls += 1
+        return np.asarray(self.f(X))
+
+    def _point(self, x):
+        """Reset the cache when x moves."""
+        x = np.asarray(x, dtype=float)
+        if self._x is None or self._x.shape != x.shape or not np.array_equal(self._x, x):
+            self._x = x.copy()
+            self._cache = {}
+        return self._x
+
+    def _steps(self, x, h):
+        # Relative step per coordinate
+        return h * np.maximum(1.0, np.abs(x))
+
+    def value(self, x):
+        x = self._point(x)
+        if 'f' not in self._cache:
+            self._cache['f'] = self._eval(x[None, :])[0].real
+        return self._cache['f']
+
+    def gradient(self, x):
+        x = self._point(x)
+        n = x.size
+        if self.scheme == 'complex':
+            h = self._steps(x, self.h)
+            X = x + 1j * np.diag(h)
+            return self._eval(X).imag / h
+
+        h = self._steps(x, self.h)
+        E = np.diag(h)
+        if self.scheme == 'forward':
+            if 'f' in self._cache:
+                X = x + E
+                plus = self._eval(X)
+            else:
+                values = self._eval(np.vstack([x, x + E]))
+                self._cache['f'], plus = values[0], values[1:]
+            self._cache['plus', self.h] = plus
+            return (plus - self._cache['f']) / h
+
+        values = self._eval(np.vstack([x + E, x - E]))
+        plus, minus = values[:n], values[n:]
+        self._cache['plus', self.h] = plus
+        self._cache['minus', self.h] = minus
+        return (plus - minus) / (2 * h)
+
+    def hessian(self, x):
+        x = self._point(x)
+        n = x.size
+        h = self._steps(x, self.h_hess)
+        E = np.diag(h)
+        iu, ju = np.triu_indices(n)
+        H = np.empty((n, n))
+
+        if self.scheme == 'forward':
+            # H_ij = (f(x + h_i e_i + h_j e_j) - f(x + h_i e_i) - f(x + h_j e_j) + f(x)) / (h_i h_j)
+            pairs = x + E[iu] + E[ju]
+            need_plus = ('plus', self.h_hess) not in self._cache
+            need_f = 'f' not in self._cache
+            rows = [pairs]
+            if need_plus:
+                rows.append(x + E)
+            if need_f:
+                rows.append(x[None, :])
+            values = self._eval(np.vstack(rows))
+            fij = values[:len(iu)]
+            if need_plus:
+                self._cache['plus', self.h_hess] = values[len(iu):len(iu) + n]
+            if need_f:
+                self._cache['f'] = values[-1]
+            plus, fx = self._cache['plus', self.h_hess], self._cache['f']
+            H[iu, ju] = (fij - plus[iu] - plus[ju] + fx) / (h[iu] * h[ju])
+
+        elif self.scheme == 'central':
+            # Off-diagonal: four-point stencil, diagonal: three-point stencil
+            io, jo = np.triu_indices(n, k=1)
+            Ei, Ej = E[io], E[jo]
+            rows = [x + Ei + Ej, x + Ei - Ej, x - Ei + Ej, x - Ei - Ej]
+            have_diag = ('plus', self.h_hess) in self._cache and ('minus', self.h_hess) in self._cache
+            if not have_diag:
+                rows += [x + E, x - E]
+            need_f = 'f' not in self._cache
+            if need_f:
+                rows.append(x[None, :])
+            values = self._eval(np.vstack(rows))
+            m = len(io)
+            fpp, fpm, fmp, fmm = (values[k * m:(k + 1) * m] for k in range(4))
+            if not have_diag:
+                self._cache['plus', self.h_hess] = values[4 * m:4 * m + n]
+                self._cache['minus', self.h_hess] = values[4 * m + n:4 * m + 2 * n]
+            if need_f:
+                self._cache['f'] = values[-1]
+            plus, minus = self._cache['plus', self.h_hess], self._cache['minus', self.h_hess]
+            H[io, jo] = (fpp - fpm - fmp + fmm) / (4 * h[io] * h[jo])
+            H[np.arange(n), np.arange(n)] = (plus - 2 * self._cache['f'] + minus) / h**2
+
+        else:
+            # Complex step in e_i, central real step in e_j:
+            # H_ij = Im(f(x + i h_i e_i + h_j e_j) - f(x + i h_i e_i - h_j e_j)) / (2 h_i h_j)
+            hi = self._steps(x, GRADIENT_STEPS['complex'])
+            Ei = 1j * np.diag(hi)
+            values = self._eval(np.vstack([x + Ei[iu] + E[ju], x + Ei[iu] - E[ju]]))
+            m = len(iu)
+            H[iu, ju] = (values[:m].imag - values[m:].imag) / (2 * hi[iu] * h[ju])
+
+        H[ju, iu] = H[iu, ju]
+        return H
+
+
+def batch_gradient(f, X, scheme='forward', h=None):
+    """Values and finite-difference gradients of f at every row of X, in one call to f."""
+    X = np.asarray(X, dtype=float)
+    N, n = X.shape
+    h = (GRADIENT_STEPS[scheme] if h is None else h) * np.maximum(1.0, np.abs(X))
+    # Perturbed copies of every row, shape (N, n, n)
+    E = h[:, :, None] * np.eye(n)
+    if scheme == 'forward':
+        values = f(np.concatenate([X, (X[:, None, :] + E).reshape(-1, n)]))
+        F = values[:N]
+        return F, (values[N:].reshape(N, n) - F[:, None]) / h
+    if scheme == 'central':
+        values = f(np.concatenate([X, (X[:, None, :] + E).reshape(-1, n), (X[:, None, :] - E).reshape(-1, n)]))
+        plus, minus = values[N:N + N * n].reshape(N, n), values[N + N * n:].reshape(N, n)
+        return values[:N], (plus - minus) / (2 * h)
+    if scheme == 'complex':
+        values = f(np.concatenate([X, (X[:, None, :] + 1j * E).reshape(-1, n)]))
+        return values[:N].real, values[N:].imag.reshape(N, n) / h
+    raise ValueError(f"Unknown scheme '{scheme}', use 'forward', 'central' or 'complex'")
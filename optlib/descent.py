@@ -0,0 +1,95 @@
+"""Descent methods of HW2 on n-dimensional problems.
+
+Every method takes a derivative backend (FiniteDifference or AutoDiff)
+providing value(), gradient() and hessian(), and an optional LineSearch
+from optlib.line_search; the counters of both record the cost of the run.
+Each method returns the final point and the number of steps taken; a
+count of max_iter means the iteration limit was hit before convergence.
+They raise FloatingPointError when the gradient stops being finite
+(diverged) and RuntimeError when the line search finds no acceptable step
+before the gradient norm is below tol.
+"""
+import numpy as np
+from scipy.linalg import LinAlgError, cho_solve
+
+from optlib.derivatives import FiniteDifference
+from optlib.line_search import LineSearch
+from optlib.newton import modified_cholesky
+
+
+def _check(name, i, grad):
+    if not np.all(np.isfinite(grad)):
+        raise FloatingPointError(f"{name} diverged at iteration {i}: the gradient is not finite")
+
+
+def _line_search_failed(name, i, grad):
+    raise RuntimeError(f"{name}: the line search found no acceptable step at iteration {i} "
+                       f"(|grad| = {np.linalg.norm(grad):.2e})")
+
+
+# Gradient descent with backtracking line search
+def gradient_descent(f, x0, derivatives=None, alpha=0.4, beta=0.5, max_iter=1000, tol=1e-5, line_search=None):
+    d = derivatives or FiniteDifference(f, scheme='forward')
+    ls = line_search or LineSearch('armijo', c1=alpha, beta=beta)
+    x = np.array(x0, dtype=float)
+    for i in range(max_iter):
+        grad = d.gradient(x)
+        _check('Gradient descent', i, grad)
+        if np.linalg.norm(grad) < tol:
+            return x, i
+        t, _, _ = ls(d.value, x, -grad, d.value(x), grad)
+        if t is None:
+            _line_search_failed('Gradient descent', i, grad)
+        x = x - t*grad
+    return x, max_iter
+
+
+# Newton's method, with the modified Cholesky factorization of optlib.newton so that an indefinite
+# Hessian still gives a descent direction (steepest descent when the Hessian is not finite)
+def newton(f, x0, derivatives=None, max_iter=10000, tol=1e-5, line_search=None):
+    d = derivatives or FiniteDifference(f, scheme='central')
+    ls = line_search or LineSearch('armijo')
+    x = np.array(x0, dtype=float)
+    for i in range(max_iter):
+        grad = d.gradient(x)
+        _check("Newton's method", i, grad)
+        if np.linalg.norm(grad) < tol:
+            return x, i
+        try:
+            factor, _, _ = modified_cholesky(d.hessian(x))
+            p = -cho_solve(factor, grad, check_finite=False)
+        except LinAlgError:
+            p = -grad
+        t, _, _ = ls(d.value, x, p, d.value(x), grad)
+        if t is None:
+            _line_search_failed("Newton's method", i, grad)
+        x = x + t*p
+    return x, max_iter
+
+
+# Quasi-Newton method (BFGS method)
+def quasi_newton_method(f, x0, derivatives=None, tol=1e-5, max_iter=10000, line_search=None):
+    d = derivatives or FiniteDifference(f, scheme='central')
+    ls = line_search or LineSearch('wolfe')
+    x = np.array(x0, dtype=float)
+    I = np.eye(x.size)
+    grad = d.gradient(x)
+    H = np.linalg.inv(d.hessian(x))
+    for i in range(max_iter):
+        _check('BFGS', i, grad)
+        if np.linalg.norm(grad) < tol:
+            return x, i
+        p = -H @ grad
+        t, _, grad_new = ls(d.value, x, p, d.value(x), grad, grad=d.gradient)
+        if t is None:
+            _line_search_failed('BFGS', i, grad)
+        x_new = x + t*p
+        if np.linalg.norm(x_new - x) < tol:
+            return x_new, i + 1
+        s = x_new - x
+        y = grad_new - grad
+        rho = 1.0 / (y @ s)
+        H = (I - rho * np.outer(s, y)) @ H @ (I - rho * np.outer(y, s)) + rho * np.outer(s, s)
+        x = x_new
+        grad = grad_new
+    return x, max_iter
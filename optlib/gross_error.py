@@ -0,0 +1,137 @@
+"""Gross-error detection for the linear reconciliation of optlib.reconciliation.
+
+Under the null hypothesis (random errors only) the balance residuals
+r = A y of the measurements have covariance S = A V A'. The tests:
+
+    global       r' S^-1 r, chi-square with rank(A) degrees of freedom
+    nodal        r_i / sqrt(S_ii) for every balance
+    measurement  d_j / sqrt(G_jj) for every stream, with d = A' S^-1 r and
+                 G = A' S^-1 A (the adjustment y - x over its standard deviation)
+
+are computed for every balance and stream, and for a batch of snapshots, with
+a few matrix products. Individual tests use the Sidak-corrected level
+1 - (1 - alpha)^(1/k) over the k tests of their kind.
+
+Serial elimination removes the meter with the largest measurement test while
+the global test or a measurement test fails. A removed meter becomes an
+unmeasured stream, which is the limit V_jj -> inf: S^-1 loses the direction
+of the column a_j of A,
+
+    M <- M - (M a_j)(M a_j)' / (a_j' M a_j)
+
+a rank-1 downdate, so no elimination step re-solves the reconciliation.
+"""
+from functools import lru_cache
+
+import numpy as np
+from scipy.stats import chi2, norm
+
+
+@lru_cache(maxsize=None)
+def _sidak(alpha, k):
+    """Two-sided normal critical value at the Sidak level for k tests."""
+    return float(norm.ppf(1 - (1 - (1 - alpha)**(1 / max(k, 1))) / 2))
+
+
+@lru_cache(maxsize=None)
+def _chi2_critical(alpha, dof):
+    return float(chi2.ppf(1 - alpha, dof))
+
+
+def _measurement_tests(A, M, R, tol):
+    # Measurement tests of all streams for the residuals R (N, m) with M in place of S^-1
+    D = R @ M @ A
+    g = np.sum(A * (M @ A), axis=0)
+    redundant = g > tol * max(1.0, g.max(initial=0.0))
+    z = np.zeros_like(D)
+    z[:, redundant] = np.abs(D[:, redundant]) / np.sqrt(g[redundant])
+    return z, redundant
+
+
+def gross_error_tests(reconciler, Y, alpha=0.05, tol=1e-10):
+    """Global, nodal and measurement tests of one snapshot (n,) or a batch (N, n).
+
+    Returns a dict with the statistics, their critical values and the
+    suspects: the global statistic with its degrees of freedom, p-value and
+    critical value, the nodal and measurement test values (shape (N, m) and
+    (N, n), or (m,) and (n,) for one snapshot) with their critical values,
+    and boolean masks of the balances and streams over them. Streams that
+    no balance makes redundant get a measurement test of 0.
+    """
+    Y = np.asarray(Y, dtype=float)
+    batch = np.atleast_2d(Y)
+    A, M = reconciler.A, reconciler.S_inv
+    m, n = A.shape
+    R = batch @ A.T
+    dof = reconciler.dof
+    gamma = np.einsum('ij,jk,ik->i', R, M, R)
+    S = A @ reconciler.V @ A.T
+    nodal = np.abs(R) / np.sqrt(np.diag(S))
+    measurement, redundant = _measurement_tests(A, M, R, tol)
+    nodal_critical, measurement_critical = _sidak(alpha, m), _sidak(alpha, int(redundant.sum()))
+    result = {'global': gamma, 'dof': dof, 'global_p': chi2.sf(gamma, dof), 'global_critical': _chi2_critical(alpha, dof),
+              'nodal': nodal, 'nodal_critical': nodal_critical, 'nodal_suspects': nodal > nodal_critical,
+              'measurement': measurement, 'measurement_critical': measurement_critical,
+              'measurement_suspects': measurement > measurement_critical}
+    result['global_suspect'] = gamma > result['global_critical']
+    if Y.ndim == 1:
+        for key in ('global', 'global_p', 'global_suspect', 'nodal', 'nodal_suspects', 'measurement',
+                    'measurement_suspects'):
+            result[key] = result[key][0]
+    return result
+
+
+def serial_elimination(reconciler, y, alpha=0.05, max_eliminations=None, tol=1e-10):
+    """Remove suspect meters one at a time until the global and the measurement tests pass.
+
+    At every step the meter with the largest measurement test is treated as
+    unmeasured (a rank-1 downdate of S^-1) and the tests are recomputed.
+    Returns a dict with the eliminated streams (in order, as column indices
+    of A), the estimated gross error of each, the
+    steps (stream, measurement test, global statistic before removal), the
+    final global statistic with its degrees of freedom and critical value,
+    whether it passes, and the reconciled flows with the eliminated meters
+    unmeasured (their values follow from the balances).
+    """
+    y = np.asarray(y, dtype=float)
+    A, V = reconciler.A, reconciler.V
+    M = reconciler.S_inv.copy()
+    r = A @ y
+    dof = reconciler.dof
+    max_eliminations = dof - 1 if max_eliminations is None else max_eliminations
+    eliminated, steps = [], []
+    # d = A' M r and g = diag(A' M A) follow the downdates of M
+    MA = M @ A
+    d, g = r @ MA, np.sum(A * MA, axis=0)
+    gamma = r @ M @ r
+    while True:
+        critical = _chi2_critical(alpha, dof - len(eliminated))
+        redundant = g > tol * max(1.0, g.max(initial=0.0))
+        redundant[eliminated] = False
+        z = np.zeros_like(d)
+        z[redundant] = np.abs(d[redundant]) / np.sqrt(g[redundant])
+        j = int(np.argmax(z))
+        suspect = z[j] > _sidak(alpha, int(redundant.sum()))
+        if (gamma <= critical and not suspect) or len(eliminated) >= max_eliminations or not redundant.any():
+            break
+        steps.append((j, float(z[j]), float(gamma)))
+        eliminated.append(j)
+        w, c = MA[:, j].copy(), g[j]
+        Aw, rw = w @ A, r @ w
+        M -= np.outer(w, w) / c
+        MA -= np.outer(w, Aw) / c
+        d -= rw * Aw / c
+        g -= Aw**2 / c
+        gamma -= rw**2 / c
+
+    # Gross errors b_E from the eliminated columns, then x = y - V A' M r - b on E
+    bias = np.zeros(0)
+    x = y - V @ A.T @ M @ r
+    if eliminated:
+        A_E = A[:, eliminated]
+        S_inv = reconciler.S_inv
+        bias = np.linalg.solve(A_E.T @ S_inv @ A_E, A_E.T @ S_inv @ r)
+        x[eliminated] -= bias
+    return {'eliminated': eliminated, 'bias': bias, 'steps': steps, 'global': float(gamma),
+            'dof': dof - len(eliminated), 'global_critical': critical,
+            'passed': bool(gamma <= critical and not suspect), 'x': x}
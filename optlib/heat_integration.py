@@ -0,0 +1,172 @@
+"""Minimum utilities by the Problem Table Algorithm, and the transshipment LP for matches.
+
+Streams are given by supply and target temperatures and heat-capacity
+flowrates FCp; a stream with supply > target is hot. Cold temperatures are
+shifted up by dT_min, so that heat can flow from a hot stream to a cold one
+inside a temperature interval. The interval boundaries are the sorted
+distinct shifted temperatures, highest first.
+
+The Problem Table cascades the surplus of every interval,
+
+    s_k = (sum of hot FCp - sum of cold FCp over interval k) * dT_k
+
+from the top: the heat flowing out of interval k is R_k = Q_heat + s_1 +
+... + s_k, and the smallest heating that keeps every R_k >= 0 is
+Q_heat = max(0, -min_k(s_1 + ... + s_k)). The cooling is the heat that
+leaves the last interval, and the pinch is where R_k = 0. Net FCp per
+interval comes from a difference array over the stream ends, so the
+cascade costs O(streams + intervals) and never forms the interval loads.
+
+Questions about matches (forbidden or required pairs, heat exchanged per
+pair) need the loads of every stream in every interval (interval_loads)
+and the transshipment LP of HW3_1 (transshipment_model).
+"""
+import numpy as np
+import pyomo.environ as pyo
+
+
+def _shift(supply, target, dt_min):
+    # Hot mask and the upper and lower shifted temperatures of every stream
+    supply, target = np.asarray(supply, dtype=float), np.asarray(target, dtype=float)
+    hot = supply > target
+    shift = np.where(hot, 0.0, dt_min)
+    return hot, np.maximum(supply, target) + shift, np.minimum(supply, target) + shift
+
+
+def temperature_intervals(supply, target, dt_min=10.0):
+    """Interval boundaries: the distinct shifted temperatures, highest first (K intervals, K + 1 boundaries)."""
+    _, upper, lower = _shift(supply, target, dt_min)
+    return np.unique(np.concatenate([upper, lower]))[::-1]
+
+
+def interval_loads(supply, target, fcp, dt_min=10.0):
+    """Heat released by every hot stream and taken by every cold stream in every interval.
+
+    Returns a dict with the boundaries (temperatures), the indices of the
+    hot and cold streams, and QH (hot streams x intervals) and QC (cold
+    streams x intervals), FCp times the overlap of the stream with the
+    interval.
+    """
+    hot, upper, lower = _shift(supply, target, dt_min)
+    temperatures = temperature_intervals(supply, target, dt_min)
+    overlap = np.clip(np.minimum(upper[:, None], temperatures[:-1]) - np.maximum(lower[:, None], temperatures[1:]),
+                      0.0, None)
+    Q = np.asarray(fcp, dtype=float)[:, None] * overlap
+    return {'temperatures': temperatures, 'hot': np.flatnonzero(hot), 'cold': np.flatnonzero(~hot),
+            'QH': Q[hot], 'QC': Q[~hot]}
+
+
+def cascade(surplus):
+    """Problem Table cascade of the interval surpluses s_k (heat released minus heat taken, top first).
+
+    Returns a dict with the minimum heating and cooling, the residuals
+    R_0..R_K (R_0 is the heating, R_K the cooling) and the pinch: the
+    indices of the interior boundaries with no heat flow.
+    """
+    total = np.concatenate([[0.0], np.cumsum(surplus)])
+    heating = max(0.0, -total.min())
+    residuals = heating + total
+    scale = 1e-9 * max(1.0, np.abs(surplus).sum())
+    pinch = np.flatnonzero(residuals[1:-1] <= scale) + 1
+    return {'heating': heating, 'cooling': residuals[-1], 'residuals': residuals, 'pinch': pinch}
+
+
+def problem_table(supply, target, fcp, dt_min=10.0):
+    """Minimum heating and cooling of the streams by the Problem Table Algorithm.
+
+    Returns the cascade dict with the boundaries (temperatures), the
+    interval surpluses and the pinch temperatures of the hot and the cold
+    streams (empty when there is no pinch).
+    """
+    hot, upper, lower = _shift(supply, target, dt_min)
+    temperatures = temperature_intervals(supply, target, dt_min)
+    # Net FCp is constant between boundaries: add it at the upper end of every stream, remove it at the lower end
+    descending = -temperatures
+    net = np.where(hot, 1.0, -1.0) * np.asarray(fcp, dtype=float)
+    change = np.zeros(len(temperatures))
+    np.add.at(change, np.searchsorted(descending, -upper), net)
+    np.add.at(change, np.searchsorted(descending, -lower), -net)
+    surplus = np.cumsum(change)[:-1] * -np.diff(temperatures)
+    result = cascade(surplus)
+    pinch = temperatures[result['pinch']]
+    result.update(temperatures=temperatures, surplus=surplus, pinch_hot=pinch, pinch_cold=pinch - dt_min)
+    return result
+
+
+def transshipment_model(QH, QC, hot=None, cold=None, forbidden=()):
+    """Transshipment LP of the minimum utilities with match restrictions (the HW3_1 formulation).
+
+    QH (hot streams x intervals) and QC (cold streams x intervals) are the
+    interval loads, intervals from the top. Every hot stream i cascades its
+    residual heat R[i,k] to lower intervals and gives Q[i,j,k] to cold stream
+    j or QIN[i,k] to cooling; heating enters at the top (QM) and cascades
+    through RM, cooling leaves at the bottom (QN). forbidden lists (hot, cold)
+    name pairs that may not exchange heat. The objective obj is the total
+    utility.
+    """
+    QH, QC = np.asarray(QH, dtype=float), np.asarray(QC, dtype=float)
+    if QH.shape[1] != QC.shape[1]:
+        raise ValueError(f"QH has {QH.shape[1]} intervals and QC {QC.shape[1]}")
+    hot = [f'H{i + 1}' for i in range(len(QH))] if hot is None else list(hot)
+    cold = [f'C{j + 1}' for j in range(len(QC))] if cold is None else list(cold)
+    K = list(range(1, QH.shape[1] + 1))
+    first, last = K[0], K[-1]
+
+    m = pyo.ConcreteModel()
+    m.I = pyo.Set(initialize=hot)
+    m.J = pyo.Set(initialize=cold)
+    m.K = pyo.Set(initialize=K)
+    m.QH = pyo.Param(m.I, m.K, initialize={(i, k): QH[a, k - 1] for a, i in enumerate(hot) for k in K})
+    m.QC = pyo.Param(m.J, m.K, initialize={(j, k): QC[b, k - 1] for b, j in enumerate(cold) for k in K})
+
+    m.R = pyo.Var(m.I, m.K, within=pyo.NonNegativeReals)
+    m.RM = pyo.Var(m.K, within=pyo.NonNegativeReals)
+    m.QM = pyo.Var(m.K, within=pyo.NonNegativeReals)
+    m.QN = pyo.Var(m.K, within=pyo.NonNegativeReals)
+    m.Q = pyo.Var(m.I, m.J, m.K, within=pyo.NonNegativeReals)
+    m.QIN = pyo.Var(m.I, m.K, within=pyo.NonNegativeReals)
+    m.QMJ = pyo.Var(m.J, m.K, within=pyo.NonNegativeReals)
+
+    # No heat leaves the last interval as residual; heating enters at the top, cooling leaves at the bottom
+    for i in hot:
+        m.R[i, last].fix(0)
+    m.RM[last].fix(0)
+    for k in K:
+        if k != first:
+            m.QM[k].fix(0)
+        if k != last:
+            m.QN[k].fix(0)
+    for i, j in forbidden:
+        for k in K:
+            m.Q[i, j, k].fix(0)
+
+    @m.Constraint(m.I, m.K)
+    def heatik(m, i, k):
+        above = m.R[i, k - 1] if k != first else 0
+        return m.R[i, k] - above + sum(m.Q[i, j, k] for j in m.J) + m.QIN[i, k] == m.QH[i, k]
+
+    @m.Constraint(m.K)
+    def heatmk(m, k):
+        above = m.RM[k - 1] if k != first else 0
+        return m.RM[k] - above + sum(m.QMJ[j, k] for j in m.J) - m.QM[k] == 0
+
+    @m.Constraint(m.J, m.K)
+    def heatjk(m, j, k):
+        return sum(m.Q[i, j, k] for i in m.I) + m.QMJ[j, k] == m.QC[j, k]
+
+    @m.Constraint(m.K)
+    def heatnk(m, k):
+        return sum(m.QIN[i, k] for i in m.I) - m.QN[k] == 0
+
+    m.obj = pyo.Objective(expr=sum(m.QM[k] + m.QN[k] for k in m.K), sense=pyo.minimize)
+    return m
+
+
+def random_streams(n_streams, seed=0, low=40.0, high=400.0):
+    """Random hot and cold streams (half of each): (supply, target, fcp) arrays."""
+    rng = np.random.default_rng(seed)
+    a, b = rng.uniform(low, high, size=(2, n_streams)).round()
+    hot = np.arange(n_streams) % 2 == 0
+    supply = np.where(hot, np.maximum(a, b), np.minimum(a, b))
+    target = np.where(hot, np.minimum(a, b), np.maximum(a, b))
+    return supply, target, rng.uniform(0.5, 5.0, size=n_streams).round(2)
@@ -0,0 +1,121 @@
+"""Primal-dual interior-point method for min f(x) subject to g(x) <= 0.
+
+With slacks s and multipliers lam the perturbed KKT conditions are
+
+    r_d = grad f(x) + J(x)' lam = 0
+    r_p = g(x) + s = 0
+    r_c = S lam - sigma*mu*e = 0,   s, lam > 0
+
+Each iteration takes a Mehrotra predictor-corrector step. The Newton system
+is reduced by block elimination to the n x n matrix H + J' (Lam S^-1) J, which
+is factored once and used for both the predictor and the corrector solves.
+Steps follow the fraction-to-boundary rule and a backtracking test that
+asks for a sufficient decrease of the centered KKT residual norm (r_c with
+the sigma*mu of the iteration). If 30 halvings of the corrector step find no
+acceptable step, the plain centered Newton step with one step length for
+the primal and the dual variables is tried; if that fails too, the method
+stops with status 'step_failed' at the last accepted iterate.
+"""
+import numpy as np
+from scipy.linalg import cho_solve
+
+from optlib.newton import modified_cholesky
+
+
+def _max_step(v, dv, tau):
+    """Largest step in (0, 1] with v + step*dv >= (1 - tau)*v."""
+    negative = dv < 0
+    if not negative.any():
+        return 1.0
+    return min(1.0, tau * np.min(-v[negative] / dv[negative]))
+
+
+def primal_dual_interior_point(objective, constraints, x0, constraint_hessian=None, tol=1e-8, max_iter=100,
+                               s_min=1e-2):
+    """Mehrotra predictor-corrector interior-point method.
+
+    Uses the callbacks of optlib.barrier.barrier_method: objective(x) returns
+    (f, grad, hess), constraints(x) returns (g, J) with feasibility g <= 0, and
+    constraint_hessian(x, w) returns sum_i w_i * hess g_i(x) (None if linear).
+    x0 need not be feasible, but f must be defined there.
+
+    Returns a dict with the solution, objective, multipliers, slacks,
+    iteration count, status and a per-iteration history of mu, the primal
+    and dual residual norms, the centering parameter and the step lengths.
+    """
+    x = np.array(x0, dtype=float)
+    g, J = constraints(x)
+    m = len(g)
+    s = np.maximum(-g, s_min)
+    lam = np.ones(m)
+    history = []
+    status = 'max_iter'
+
+    def residuals(x, s, lam):
+        f, grad, hess = objective(x)
+        g, J = constraints(x)
+        return f, grad, hess, g, J, grad + J.T @ lam, g + s
+
+    f, grad, hess, g, J, r_d, r_p = residuals(x, s, lam)
+    if not np.isfinite(f):
+        raise ValueError('The objective is not defined at the starting point')
+    for k in range(max_iter):
+        mu = s @ lam / m
+        history.append({'mu': mu, 'dual_residual': np.linalg.norm(r_d, np.inf),
+                        'primal_residual': np.linalg.norm(r_p, np.inf), 'f': f})
+        if max(history[-1]['dual_residual'], history[-1]['primal_residual'], mu) < tol:
+            status = 'converged'
+            break
+
+        # Block elimination: (H + J' D J) dx = -r_d - J' (D r_p - r_c / s), D = lam / s
+        H = hess if constraint_hessian is None else hess + constraint_hessian(x, lam)
+        D = lam / s
+        factor, _, _ = modified_cholesky(H + (J.T * D) @ J)
+
+        def solve(r_c):
+            dx = cho_solve(factor, -r_d - J.T @ (D * r_p - r_c / s), check_finite=False)
+            dlam = D * (J @ dx + r_p) - r_c / s
+            ds = -(r_c + s * dlam) / lam
+            return dx, ds, dlam
+
+        # Predictor (affine scaling) step
+        dx, ds, dlam = solve(s * lam)
+        alpha_p = _max_step(s, ds, 1.0)
+        alpha_d = _max_step(lam, dlam, 1.0)
+        mu_aff = (s + alpha_p * ds) @ (lam + alpha_d * dlam) / m
+        sigma = (mu_aff / mu)**3
+
+        # Corrector step with the second-order term and centering; if no step along it is acceptable,
+        # the centered Newton step without the second-order term and with one step length for the primal
+        # and the dual variables, a descent direction of the residual below
+        tau = max(0.99, 1 - mu)
+        norm = np.linalg.norm(np.concatenate([r_d, r_p, s * lam - sigma * mu]))
+        for r_c, common in ((s * lam + ds * dlam - sigma * mu, False), (s * lam - sigma * mu, True)):
+            dx, ds, dlam = solve(r_c)
+            alpha_p = _max_step(s, ds, tau)
+            alpha_d = _max_step(lam, dlam, tau)
+            if common:
+                alpha_p = alpha_d = min(alpha_p, alpha_d)
+            # Backtrack until f is defined and the centered KKT residual decreases sufficiently
+            for _ in range(30):
+                x_new, s_new, lam_new = x + alpha_p * dx, s + alpha_p * ds, lam + alpha_d * dlam
+                with np.errstate(all='ignore'):
+                    new = residuals(x_new, s_new, lam_new)
+                new_norm = np.linalg.norm(np.concatenate([new[5], new[6], s_new * lam_new - sigma * mu]))
+                if np.isfinite(new[0]) and new_norm <= (1 - 1e-4 * min(alpha_p, alpha_d)) * norm:
+                    break
+                alpha_p *= 0.5
+                alpha_d *= 0.5
+            else:
+                continue
+            break
+        else:
+            # No acceptable step: keep the last accepted iterate
+            history[-1].update({'sigma': sigma, 'alpha_primal': 0.0, 'alpha_dual': 0.0})
+            status = 'step_failed'
+            break
+        x, s, lam = x_new, s_new, lam_new
+        f, grad, hess, g, J, r_d, r_p = new
+        history[-1].update({'sigma': sigma, 'alpha_primal': alpha_p, 'alpha_dual': alpha_d})
+
+    return {'x': x, 'fun': f, 'lam': lam, 's': s, 'nit': k, 'status': status, 'history': history}
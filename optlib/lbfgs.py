@@ -0,0 +1,79 @@
+"""Limited-memory BFGS.
+
+The inverse Hessian is never stored. The last m pairs s = x_new - x and
+y = g_new - g live in a ring buffer of two (m, n) arrays, and the
+two-loop recursion applies the implicit inverse Hessian to the gradient in
+O(mn) operations. Steps satisfy the strong Wolfe conditions, which keeps
+every stored pair curvature-positive.
+"""
+import numpy as np
+
+from optlib.derivatives import FiniteDifference
+from optlib.line_search import LineSearch
+
+
+def two_loop_recursion(g, S, Y, rho, newest, count):
+    """Product of the L-BFGS inverse Hessian with g, using count pairs ending at slot newest."""
+    m = len(rho)
+    order = [(newest - i) % m for i in range(count)]  # newest to oldest
+    q = g.copy()
+    a = np.empty(count)
+    for i, j in enumerate(order):
+        a[i] = rho[j] * (S[j] @ q)
+        q -= a[i] * Y[j]
+    # Initial inverse Hessian gamma*I from the newest pair
+    if count:
+        j = order[0]
+        q *= (S[j] @ Y[j]) / (Y[j] @ Y[j])
+    for i, j in reversed(list(enumerate(order))):
+        b = rho[j] * (Y[j] @ q)
+        q += (a[i] - b) * S[j]
+    return q
+
+
+def lbfgs(f, x0, derivatives=None, m=10, tol=1e-5, max_iter=10000, c1=1e-4, c2=0.9, line_search=None):
+    """Minimize f from x0 with L-BFGS and a strong Wolfe line search.
+
+    Stops when the gradient norm drops below tol. Returns a dict with the
+    solution, objective, gradient norm, iteration count, line-search
+    evaluations, status, the derivative backend and the line search.
+    """
+    d = derivatives or FiniteDifference(f, scheme='central')
+    x = np.array(x0, dtype=float)
+    n = x.size
+    S = np.zeros((m, n))
+    Y = np.zeros((m, n))
+    rho = np.zeros(m)
+    newest, count = -1, 0
+
+    ls = line_search or LineSearch('wolfe', c1=c1, c2=c2)
+    g = d.gradient(x)
+    fx = d.value(x)
+    status = 'max_iter'
+    for k in range(max_iter):
+        if np.linalg.norm(g) < tol:
+            status = 'converged'
+            break
+        p = -two_loop_recursion(g, S, Y, rho, newest, count)
+        # First iteration: scale the steepest-descent step to unit length
+        alpha0 = 1.0 if count else min(1.0, 1.0 / np.linalg.norm(g))
+        alpha, f_new, g_new = ls(d.value, x, p, fx, g, grad=d.gradient, alpha=alpha0)
+        if alpha is None:
+            if count == 0:
+                status = 'line_search_failed'
+                break
+            # Drop the memory and retry along steepest descent
+            count = 0
+            continue
+        s = alpha * p
+        y = g_new - g
+        sy = s @ y
+        if sy > 1e-12 * np.linalg.norm(s) * np.linalg.norm(y):
+            newest = (newest + 1) % m
+            S[newest], Y[newest], rho[newest] = s, y, 1.0 / sy
+            count = min(count + 1, m)
+        x = x + s
+        fx, g = f_new, g_new
+
+    return {'x': x, 'fun': fx, 'grad_norm': np.linalg.norm(g), 'nit': k, 'nfev': ls.nfev + 1, 'status': status,
+            'derivatives': d, 'line_search': ls}
@@ -0,0 +1,185 @@
+"""Line searches shared by the descent and barrier methods.
+
+A LineSearch object holds the settings and counts every objective and
+gradient evaluation it makes. Along a direction p the line function
+phi(alpha) = f(x + alpha*p) is memoized: phi(0) and phi'(0) come from the
+caller's f(x) and grad f(x) when available and are computed at most once,
+and no trial step is evaluated twice. Two modes are available:
+
+    'armijo'  backtracking until phi(alpha) <= phi(0) + c1*alpha*phi'(0),
+              with quadratic then cubic interpolation of the trial steps
+    'wolfe'   strong Wolfe conditions, bracketing plus zoom with cubic
+              interpolation (Nocedal and Wright, Algorithms 3.5 and 3.6)
+
+Points where f is not finite (e.g. outside a barrier's domain) are treated
+as too long a step.
+"""
+import numpy as np
+
+
+def _cubic_min(a, fa, da, b, fb, db):
+    """Minimizer of the cubic interpolating f and f' at a and b, or None if it does not exist."""
+    if not np.all(np.isfinite([fa, da, fb, db])):
+        return None
+    d1 = da + db - 3 * (fa - fb) / (a - b)
+    radicand = d1**2 - da * db
+    if radicand < 0:
+        return None
+    d2 = np.sign(b - a) * np.sqrt(radicand)
+    return b - (b - a) * (db + d2 - d1) / (db - da + 2 * d2)
+
+
+def _quadratic_min(f0, d0, a, fa):
+    """Minimizer of the quadratic through phi(0), phi'(0) and phi(a)."""
+    return -d0 * a**2 / (2 * (fa - f0 - d0 * a))
+
+
+def _cubic_backtrack(f0, d0, a0, f_a0, a1, f_a1):
+    """Minimizer of the cubic through phi(0), phi'(0), phi(a0) and phi(a1)."""
+    r1 = f_a1 - f0 - d0 * a1
+    r0 = f_a0 - f0 - d0 * a0
+    denom = a0**2 * a1**2 * (a1 - a0)
+    c3 = (a0**2 * r1 - a1**2 * r0) / denom
+    c2 = (-a0**3 * r1 + a1**3 * r0) / denom
+    if c3 == 0:
+        return -d0 / (2 * c2)
+    radicand = c2**2 - 3 * c3 * d0
+    if radicand < 0:
+        return None
+    return (-c2 + np.sqrt(radicand)) / (3 * c3)
+
+
+class LineFunction:
+    """phi(alpha) = f(x + alpha*p) and phi'(alpha), memoized by alpha."""
+
+    def __init__(self, search, fun, grad, x, p, f0=None, g0=None):
+        self.search = search
+        self.fun, self.grad = fun, grad
+        self.x, self.p = x, p
+        self.values = {}
+        self.gradients = {}
+        if f0 is not None:
+            self.values[0.0] = f0
+        if g0 is not None:
+            self.gradients[0.0] = g0
+
+    def value(self, alpha):
+        if alpha not in self.values:
+            self.search.nfev += 1
+            with np.errstate(all='ignore'):
+                f = self.fun(self.x + alpha * self.p)
+            self.values[alpha] = f if np.isfinite(f) else np.inf
+        return self.values[alpha]
+
+    def gradient(self, alpha):
+        if alpha not in self.gradients:
+            self.search.ngev += 1
+            self.gradients[alpha] = self.grad(self.x + alpha * self.p)
+        return self.gradients[alpha]
+
+    def slope(self, alpha):
+        if self.value(alpha) == np.inf:
+            return np.inf
+        return self.gradient(alpha) @ self.p
+
+
+class LineSearch:
+    """Configurable line search with evaluation counters nfev (f) and ngev (gradient)."""
+
+    def __init__(self, mode='armijo', c1=1e-4, c2=0.9, beta=0.5, interpolation=True, max_iter=50,
+                 alpha_min=1e-16, alpha_max=1e10):
+        if mode not in ('armijo', 'wolfe'):
+            raise ValueError(f"Unknown line search mode '{mode}', use 'armijo' or 'wolfe'")
+        self.mode = mode
+        self.c1, self.c2 = c1, c2
+        self.beta = beta
+        self.interpolation = interpolation
+        self.max_iter = max_iter
+        self.alpha_min, self.alpha_max = alpha_min, alpha_max
+        self.nfev = 0
+        self.ngev = 0
+        self.ncalls = 0
+        self.nfail = 0
+
+    def __call__(self, fun, x, p, f0=None, g0=None, grad=None, alpha=1.0):
+        """Step length along p from x.
+
+        fun(x) returns f and grad(x) its gradient; grad is needed for the
+        Wolfe mode and for phi'(0) when g0 is not given. Returns the step
+        (None if the search failed), f at the new point and the gradient at
+        the new point when it was evaluated (otherwise None).
+        """
+        self.ncalls += 1
+        phi = LineFunction(self, fun, grad, x, p, f0, g0)
+        if self.mode == 'armijo':
+            alpha = self._armijo(phi, alpha)
+        else:
+            alpha = self._strong_wolfe(phi, alpha)
+        if alpha is None:
+            self.nfail += 1
+            return None, None, None
+        return alpha, phi.values[alpha], phi.gradients.get(alpha)
+
+    def _armijo(self, phi, alpha):
+        f0, d0 = phi.value(0.0), phi.slope(0.0)
+        if d0 >= 0:
+            return None
+        prev = None
+        while alpha >= self.alpha_min:
+            f = phi.value(alpha)
+            if f <= f0 + self.c1 * alpha * d0:
+                return alpha
+            new = None
+            if self.interpolation and f < np.inf:
+                if prev is None or prev[1] == np.inf:
+                    new = _quadratic_min(f0, d0, alpha, f)
+                else:
+                    new = _cubic_backtrack(f0, d0, prev[0], prev[1], alpha, f)
+            prev = (alpha, f)
+            if new is None or not np.isfinite(new):
+                alpha *= self.beta
+            else:
+                # Safeguard: shrink by at least 1/2 and at most 1/10
+                alpha = min(max(new, 0.1 * alpha), 0.5 * alpha)
+        return None
+
+    def _strong_wolfe(self, phi, alpha):
+        f0, d0 = phi.value(0.0), phi.slope(0.0)
+        if d0 >= 0:
+            return None
+        c1, c2 = self.c1, self.c2
+
+        def zoom(lo, hi):
+            for _ in range(self.max_iter):
+                f_lo, d_lo = phi.value(lo), phi.slope(lo)
+                f_hi, d_hi = phi.value(hi), (phi.slope(hi) if phi.value(hi) < np.inf else np.inf)
+                a = _cubic_min(lo, f_lo, d_lo, hi, f_hi, d_hi) if self.interpolation else None
+                # Fall back to bisection when the cubic step is missing or too close to an end
+                if a is None or not np.isfinite(a) or min(abs(a - lo), abs(a - hi)) < 0.1 * abs(hi - lo):
+                    a = 0.5 * (lo + hi)
+                f = phi.value(a)
+                if f > f0 + c1 * a * d0 or f >= f_lo:
+                    hi = a
+                else:
+                    d = phi.slope(a)
+                    if abs(d) <= -c2 * d0:
+                        return a
+                    if d * (hi - lo) >= 0:
+                        hi = lo
+                    lo = a
+                if abs(hi - lo) < 1e-14 * max(1.0, abs(lo)):
+                    break
+            return None
+
+        prev = 0.0
+        for i in range(self.max_iter):
+            f = phi.value(alpha)
+            if f > f0 + c1 * alpha * d0 or (i > 0 and f >= phi.value(prev)):
+                return zoom(prev, alpha)
+            d = phi.slope(alpha)
+            if abs(d) <= -c2 * d0:
+                return alpha
+            if d >= 0:
+                return zoom(alpha, prev)
+            prev, alpha = alpha, min(2 * alpha, self.alpha_max)
+        return None
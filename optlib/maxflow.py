@@ -0,0 +1,267 @@
+"""Maximum flow and minimum cut on a CSR residual graph.
+
+Every arc (u, v) of the network becomes a forward residual arc with its
+capacity and a paired reverse arc with capacity 0. The residual arcs are
+sorted by tail into compressed sparse rows (indptr, head, rev), so the arcs
+leaving a node are one contiguous slice. Two engines share the graph:
+
+    push_relabel  FIFO preflow-push with the gap heuristic and periodic
+                  global relabeling (reverse breadth-first search from the sink)
+    dinic         blocking flows on the BFS level graph, found by depth-first
+                  search with current-arc pointers
+
+The breadth-first searches are vectorized over the CSR arrays. The inner
+push and augment loops work on Python lists, which are faster than NumPy
+for scalar access.
+"""
+from collections import deque
+
+import numpy as np
+
+
+class ResidualGraph:
+    """Residual network of n nodes (0..n-1) and arcs tails[e] -> heads[e] with capacity[e]."""
+
+    def __init__(self, n, tails, heads, capacity):
+        tails = np.asarray(tails, dtype=np.int64)
+        heads = np.asarray(heads, dtype=np.int64)
+        m = len(tails)
+        self.n, self.m = n, m
+        # Arc 2e is edge e forward, 2e + 1 its reverse; sort all arcs by tail
+        tail = np.empty(2 * m, dtype=np.int64)
+        tail[0::2], tail[1::2] = tails, heads
+        head = np.empty(2 * m, dtype=np.int64)
+        head[0::2], head[1::2] = heads, tails
+        cap = np.zeros(2 * m)
+        cap[0::2] = capacity
+        order = np.argsort(tail, kind='stable')
+        position = np.empty(2 * m, dtype=np.int64)
+        position[order] = np.arange(2 * m)
+        self.indptr = np.searchsorted(tail[order], np.arange(n + 1))
+        self.tail = tail[order]
+        self.head = head[order]
+        self.rev = position[order ^ 1]             # partner of every sorted arc
+        self.capacity = cap[order]
+        self.edge_arc = position[0::2]             # sorted position of each forward arc
+        self.residual = self.capacity.copy()
+
+    def reset(self):
+        self.residual = self.capacity.copy()
+
+    def _frontier_arcs(self, frontier):
+        # All arc positions leaving the frontier nodes, from the CSR row pointers
+        starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+        counts = ends - starts
+        total = counts.sum()
+        if total == 0:
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return offsets + np.arange(total)
+
+    def bfs(self, root, reverse=False, stop=None):
+        """Breadth-first distances from root over arcs with residual capacity.
+
+        With reverse=True the distances are to root (arcs are followed backwards).
+        Unreached nodes get -1. With stop, the search ends after the level of stop.
+        """
+        residual = np.asarray(self.residual)
+        dist = np.full(self.n, -1, dtype=np.int64)
+        dist[root] = 0
+        frontier = np.array([root])
+        d = 0
+        while len(frontier):
+            arcs = self._frontier_arcs(frontier)
+            usable = residual[self.rev[arcs]] > 0 if reverse else residual[arcs] > 0
+            nxt = self.head[arcs[usable]]
+            nxt = np.unique(nxt[dist[nxt] < 0])
+            d += 1
+            dist[nxt] = d
+            if stop is not None and dist[stop] >= 0:
+                break
+            frontier = nxt
+        return dist
+
+    def flows(self):
+        """Flow on every original edge."""
+        return self.capacity[self.edge_arc] - np.asarray(self.residual)[self.edge_arc]
+
+    def min_cut(self, source):
+        """Nodes on the source side of a minimum cut and the saturated edges crossing it."""
+        reachable = self.bfs(source) >= 0
+        forward_tail = self.tail[self.edge_arc]
+        forward_head = self.head[self.edge_arc]
+        cut = np.flatnonzero(reachable[forward_tail] & ~reachable[forward_head])
+        return reachable, cut
+
+
+def dinic(graph, source, sink):
+    """Maximum flow value by Dinic's algorithm; leaves the flow in graph.residual."""
+    n = graph.n
+    indptr = graph.indptr.tolist()
+    head = graph.head.tolist()
+    rev = graph.rev.tolist()
+    tail = graph.tail.tolist()
+    value = 0
+    while True:
+        graph.residual = np.asarray(graph.residual)
+        level = graph.bfs(source, stop=sink)
+        if level[sink] < 0:
+            break
+        level = level.tolist()
+        res = graph.residual.tolist()
+        current = indptr[:n]
+        end = indptr[1:]
+        # Blocking flow: advance along level arcs, retreat from dead ends
+        path = []
+        u = source
+        while True:
+            if u == sink:
+                f = min(res[a] for a in path)
+                for a in path:
+                    res[a] -= f
+                    res[rev[a]] += f
+                value += f
+                # Restart from the tail of the first saturated arc
+                k = next(k for k, a in enumerate(path) if res[a] == 0)
+                u = tail[path[k]]
+                del path[k:]
+                continue
+            a = current[u]
+            stop = end[u]
+            lu = level[u] + 1
+            while a < stop and (res[a] <= 0 or level[head[a]] != lu):
+                a += 1
+            current[u] = a
+            if a < stop:
+                path.append(a)
+                u = head[a]
+            elif u == source:
+                break
+            else:
+                level[u] = -1  # dead end for the rest of the phase
+                a = path.pop()
+                u = tail[a]
+                current[u] += 1
+        graph.residual = np.array(res)
+    graph.residual = np.asarray(graph.residual)
+    return value
+
+
+def push_relabel(graph, source, sink, global_relabel_frequency=1.0):
+    """Maximum flow value by FIFO push-relabel; leaves the flow in graph.residual.
+
+    Heights are recomputed exactly by a global relabel after about
+    global_relabel_frequency * (n + m) units of relabel work, and the gap
+    heuristic lifts every node above an emptied height to n + 1. Excess that
+    cannot reach the sink is returned to the source, so the result is a flow.
+    """
+    n = graph.n
+    indptr = graph.indptr.tolist()
+    head = graph.head.tolist()
+    rev = graph.rev.tolist()
+    res = np.asarray(graph.residual, dtype=float).tolist()
+    excess = [0.0] * n
+    height = [0] * n
+    count = [0] * (2 * n + 2)        # nodes per height below 2n, for the gap heuristic
+    current = indptr[:n]
+    end = indptr[1:]
+    active = deque()
+    in_queue = [False] * n
+
+    def global_relabel():
+        graph.residual = np.array(res)
+        to_sink = graph.bfs(sink, reverse=True)
+        to_source = graph.bfs(source, reverse=True)
+        h = np.where(to_sink >= 0, to_sink, np.where(to_source >= 0, n + to_source, 2 * n))
+        h[source] = n
+        height[:] = h.tolist()
+        count[:] = np.bincount(np.minimum(h, 2 * n + 1), minlength=2 * n + 2).tolist()
+        current[:] = indptr[:n]
+
+    # Saturate the source arcs
+    for a in range(indptr[source], indptr[source + 1]):
+        f = res[a]
+        if f > 0:
+            v = head[a]
+            res[a] = 0.0
+            res[rev[a]] += f
+            excess[v] += f
+            excess[source] -= f
+            if v != sink and not in_queue[v]:
+                active.append(v)
+                in_queue[v] = True
+    global_relabel()
+
+    work = 0
+    threshold = global_relabel_frequency * (n + graph.m)
+    while active:
+        u = active.popleft()
+        in_queue[u] = False
+        if height[u] >= 2 * n:
+            continue
+        while excess[u] > 0:
+            a = current[u]
+            if a == end[u]:
+                # Relabel to one above the lowest residual neighbour
+                old = height[u]
+                lowest = 2 * n
+                for b in range(indptr[u], end[u]):
+                    if res[b] > 0 and height[head[b]] < lowest:
+                        lowest = height[head[b]]
+                new = lowest + 1
+                work += end[u] - indptr[u] + 12
+                count[old] -= 1
+                if old < n and count[old] == 0:
+                    # Gap: nothing below can reach the heights above old any more
+                    h = np.array(height)
+                    for v in np.flatnonzero((h > old) & (h < n)).tolist():
+                        count[height[v]] -= 1
+                        height[v] = n + 1
+                        count[n + 1] += 1
+                    new = max(new, n + 1)
+                height[u] = min(new, 2 * n)
+                count[height[u]] += 1
+                current[u] = indptr[u]
+                if height[u] >= 2 * n:
+                    break
+                continue
+            v = head[a]
+            if res[a] > 0 and height[u] == height[v] + 1:
+                f = min(excess[u], res[a])
+                res[a] -= f
+                res[rev[a]] += f
+                excess[u] -= f
+                excess[v] += f
+                if v != source and v != sink and not in_queue[v]:
+                    active.append(v)
+                    in_queue[v] = True
+            else:
+                current[u] = a + 1
+        if work > threshold:
+            work = 0
+            global_relabel()
+    graph.residual = np.array(res)
+    return excess[sink]
+
+
+ENGINES = {'push_relabel': push_relabel, 'dinic': dinic}
+
+
+def max_flow(nodes, edges, capacities, source, sink, method='push_relabel'):
+    """Maximum flow from source to sink on labelled nodes and edges (i, j) with capacities[e].
+
+    Returns a dict with the flow value, the flow per edge, the source and
+    sink sides of a minimum cut and the cut edges.
+    """
+    if method not in ENGINES:
+        raise ValueError(f"Unknown max-flow method '{method}', use one of {sorted(ENGINES)}")
+    nodes, edges = list(nodes), list(edges)
+    index = {node: k for k, node in enumerate(nodes)}
+    graph = ResidualGraph(len(nodes), [index[i] for i, _ in edges], [index[j] for _, j in edges],
+                          [capacities[e] for e in edges])
+    value = ENGINES[method](graph, index[source], index[sink])
+    reachable, cut = graph.min_cut(index[source])
+    return {'value': value, 'flow': dict(zip(edges, graph.flows().tolist())),
+            'source_side': {node for node, r in zip(nodes, reachable) if r},
+            'sink_side': {node for node, r in zip(nodes, reachable) if not r},
+            'cut': [edges[e] for e in cut]}
@@ -0,0 +1,170 @@
+"""Lockstep multi-start gradient descent with backtracking.
+
+All starting points advance together as one (N, n) array. Every start keeps
+its own step size, the Armijo test of the backtracking line search runs on
+all rows at once under a per-row mask, and converged rows retire from the
+active set. The converged points are clustered into a table of distinct
+local minima.
+"""
+import time
+
+import numpy as np
+
+from optlib.autodiff import batch_value_and_grad
+from optlib.derivatives import batch_gradient
+
+
+def _batch_derivatives(f, gradient):
+    if gradient == 'autodiff':
+        return lambda X: batch_value_and_grad(f, X)
+    return lambda X: batch_gradient(f, X, scheme=gradient)
+
+
+# Vectorized backtracking line search
+def batch_backtracking_line_search(f, X, F, G, t, alpha=0.4, beta=0.5, t_min=1e-12):
+    """Armijo backtracking for every row of X along -G, starting from the per-row steps t.
+
+    Only the rows that still fail the Armijo test are re-evaluated. A row whose
+    step falls below t_min without passing the test has failed: it keeps its
+    point and value. Returns the accepted steps, the new points and their
+    values, the number of points evaluated and the mask of failed rows.
+    """
+    t = t.copy()
+    slope = np.sum(G * G, axis=1)
+    X_new = X - t[:, None] * G
+    F_new = f(X_new)
+    nfev = len(X)
+    failing = ~(F_new <= F - alpha * t * slope)  # nan counts as a failure
+    failed = np.zeros(len(X), dtype=bool)
+    while failing.any():
+        rows = np.flatnonzero(failing)
+        t[rows] *= beta
+        X_new[rows] = X[rows] - t[rows, None] * G[rows]
+        F_new[rows] = f(X_new[rows])
+        nfev += len(rows)
+        failing[rows] = ~(F_new[rows] <= F[rows] - alpha * t[rows] * slope[rows])
+        # Rows below the smallest step give up instead of taking a step that does not decrease f
+        exhausted = rows[failing[rows] & (t[rows] <= t_min)]
+        failed[exhausted] = True
+        failing[exhausted] = False
+    X_new[failed], F_new[failed] = X[failed], F[failed]
+    return t, X_new, F_new, nfev, failed
+
+
+def multistart_gradient_descent(f, X0, gradient='autodiff', alpha=0.4, beta=0.5, max_iter=1000, tol=1e-5,
+                                t_max=1.0):
+    """Gradient descent from every row of X0 in lockstep.
+
+    gradient is 'autodiff' or a finite-difference scheme ('forward', 'central',
+    'complex'). Each row starts its line search from its last accepted step
+    divided by beta (capped at t_max), so a start keeps the step size it has
+    learned. Returns a dict with the final points, their values and gradient
+    norms, the iteration at which each row retired, a converged mask, a mask of
+    the rows whose line search failed (retired at their last point, not
+    converged) and evaluation counts.
+    """
+    derivatives = _batch_derivatives(f, gradient)
+    X = np.array(X0, dtype=float)
+    N = len(X)
+    F = np.full(N, np.nan)
+    grad_norm = np.full(N, np.nan)
+    step = np.full(N, t_max)
+    nit = np.full(N, max_iter)
+    converged = np.zeros(N, dtype=bool)
+    failed = np.zeros(N, dtype=bool)
+    active = np.arange(N)
+    nfev = ngev = 0
+
+    for k in range(max_iter):
+        Fa, Ga = derivatives(X[active])
+        ngev += len(active)
+        F[active] = Fa
+        grad_norm[active] = np.linalg.norm(Ga, axis=1)
+
+        # Retire converged rows and rows that left the domain of f
+        done = grad_norm[active] < tol
+        lost = ~np.isfinite(Fa) | ~np.isfinite(grad_norm[active])
+        converged[active[done]] = True
+        nit[active[done | lost]] = k
+        keep = ~(done | lost)
+        active, Fa, Ga = active[keep], Fa[keep], Ga[keep]
+        if len(active) == 0:
+            break
+
+        t0 = np.minimum(step[active] / beta, t_max)
+        t, X_new, _, evaluations, stuck = batch_backtracking_line_search(f, X[active], Fa, Ga, t0, alpha, beta)
+        nfev += evaluations
+        step[active] = t
+        X[active] = X_new
+        # Rows without an acceptable step retire where they are
+        failed[active[stuck]] = True
+        nit[active[stuck]] = k
+        active = active[~stuck]
+        if len(active) == 0:
+            break
+
+    return {'x': X, 'f': F, 'grad_norm': grad_norm, 'nit': nit, 'converged': converged,
+            'failed': failed, 'nfev': nfev, 'ngev': ngev}
+
+
+def distinct_minima(X, F, mask=None, tol=1e-3):
+    """Cluster points that lie within tol of each other (infinity norm).
+
+    Returns a table sorted by objective value with one row per local minimum:
+    the mean location, the best objective value and how many points reached it.
+    """
+    if mask is not None:
+        X, F = X[mask], F[mask]
+    # Snap to a grid of spacing tol; points split across a cell boundary are merged below
+    keys = np.round(X / tol).astype(np.int64)
+    _, labels = np.unique(keys, axis=0, return_inverse=True)
+    labels = labels.ravel()
+    k = labels.max() + 1 if len(labels) else 0
+    counts = np.bincount(labels, minlength=k)
+    centers = np.zeros((k, X.shape[1]))
+    np.add.at(centers, labels, X)
+    centers /= counts[:, None]
+    best = np.full(k, np.inf)
+    np.minimum.at(best, labels, F)
+
+    # Merge neighbouring cells
+    order = np.argsort(best)
+    kept = []
+    for i in order:
+        for j in kept:
+            if np.max(np.abs(centers[i] - centers[j])) <= 2 * tol:
+                counts[j] += counts[i]
+                break
+        else:
+            kept.append(i)
+    kept = np.array(kept, dtype=int)
+    return {'x': centers[kept], 'f': best[kept], 'count': counts[kept]}
+
+
+def print_minima(table):
+    print(f"{'#':>3} {'f':>12} {'count':>7}  x")
+    for i, (x, fx, count) in enumerate(zip(table['x'], table['f'], table['count'])):
+        print(f"{i + 1:>3} {fx:>12.6f} {count:>7}  {np.array2string(x, precision=4)}")
+
+
+# Demo: python -m optlib.multistart
+if __name__ == '__main__':
+    from optlib.problems import six_hump_camel, styblinski_tang
+
+    rng = np.random.default_rng(0)
+
+    # Map the six local minima of the six-hump camel function from 10000 starts
+    X0 = rng.uniform([-2, -1], [2, 1], size=(10000, 2))
+    start = time.perf_counter()
+    result = multistart_gradient_descent(six_hump_camel, X0, t_max=0.1)
+    elapsed = time.perf_counter() - start
+    print(f"Six-hump camel: {result['converged'].sum()} of {len(X0)} starts converged in {elapsed:.2f} s")
+    print_minima(distinct_minima(result['x'], result['f'], result['converged']))
+
+    # Styblinski-Tang in 4 variables has 2^4 = 16 local minima
+    X0 = rng.uniform(-5, 5, size=(5000, 4))
+    start = time.perf_counter()
+    result = multistart_gradient_descent(styblinski_tang, X0, t_max=0.05)
+    elapsed = time.perf_counter() - start
+    print(f"Styblinski-Tang (n = 4): {result['converged'].sum()} of {len(X0)} starts converged in {elapsed:.2f} s")
+    print_minima(distinct_minima(result['x'], result['f'], result['converged']))
@@ -0,0 +1,114 @@
+"""Min-cost flow networks as used in HW6.
+
+A network is given by the dictionaries of HW6_5_2.py: a list of nodes, a
+list of arcs (i, j), demands per node (inflow - outflow, negative at
+supplies), costs per arc and capacities per arc (float('inf') when
+uncapacitated). The in-arc and out-arc lists of every node are built once,
+so the Pyomo model is generated in O(N + E) instead of testing every node
+pair against the arc list.
+"""
+import math
+
+import numpy as np
+import pyomo.environ as pyo
+
+
+def adjacency(nodes, edges):
+    """In-arc and out-arc lists of every node."""
+    in_arcs = {node: [] for node in nodes}
+    out_arcs = {node: [] for node in nodes}
+    for i, j in edges:
+        out_arcs[i].append((i, j))
+        in_arcs[j].append((i, j))
+    return in_arcs, out_arcs
+
+
+def min_cost_flow_model(nodes, edges, demands, costs, capacities):
+    """Pyomo transshipment model of HW6_5_2.py built from adjacency indexes.
+
+    The components keep the names of the homework model. CapacityConstraints
+    is indexed by the arcs with a finite capacity only.
+    """
+    in_arcs, out_arcs = adjacency(nodes, edges)
+    capacitated = [e for e in edges if not math.isinf(capacities[e])]
+
+    model = pyo.ConcreteModel()
+
+    # Sets
+    model.Nodes = pyo.Set(initialize=nodes)
+    model.Edges = pyo.Set(dimen=2, initialize=edges)
+    model.CapacitatedEdges = pyo.Set(dimen=2, within=model.Edges, initialize=capacitated)
+
+    # Parameters
+    model.Demands = pyo.Param(model.Nodes, initialize=demands)
+    model.Costs = pyo.Param(model.Edges, initialize=costs)
+    model.Capacities = pyo.Param(model.CapacitatedEdges, initialize={e: capacities[e] for e in capacitated})
+
+    # Variables
+    model.Flow = pyo.Var(model.Edges, within=pyo.NonNegativeReals)
+
+    # Objective
+    model.Objective = pyo.Objective(expr=pyo.quicksum(costs[e] * model.Flow[e] for e in edges),
+                                    sense=pyo.minimize)
+
+    # Constraints
+    def flow_conservation_rule(model, node):
+        inflows = pyo.quicksum(model.Flow[e] for e in in_arcs[node])
+        outflows = pyo.quicksum(model.Flow[e] for e in out_arcs[node])
+        return inflows - outflows == model.Demands[node]
+
+    model.FlowConservation = pyo.Constraint(model.Nodes, rule=flow_conservation_rule)
+
+    def capacity_constraints(model, i, j):
+        return model.Flow[(i, j)] <= model.Capacities[(i, j)]
+
+    model.CapacityConstraints = pyo.Constraint(model.CapacitatedEdges, rule=capacity_constraints)
+    return model
+
+
+def random_network(n_nodes, arcs_per_node=4, supply_fraction=0.1, capacitated_fraction=0.3, seed=0):
+    """Random feasible transshipment instance in the format of HW6_5_2.py.
+
+    A Hamiltonian cycle of expensive uncapacitated arcs keeps every demand
+    pattern feasible; the other arcs are random with costs 1..100, and a
+    fraction of them gets a finite capacity. Supplies and demands are integers
+    that balance to zero.
+    """
+    rng = np.random.default_rng(seed)
+    nodes = list(range(1, n_nodes + 1))
+    order = rng.permutation(nodes)
+    cycle = set(zip(order.tolist(), np.roll(order, -1).tolist()))
+
+    # Extra arcs without self-loops or duplicates
+    n_extra = max(0, arcs_per_node * n_nodes - len(cycle))
+    tails = rng.integers(1, n_nodes + 1, size=2 * n_extra)
+    heads = rng.integers(1, n_nodes + 1, size=2 * n_extra)
+    extra = []
+    seen = set(cycle)
+    for arc in zip(tails.tolist(), heads.tolist()):
+        if len(extra) == n_extra:
+            break
+        if arc[0] != arc[1] and arc not in seen:
+            seen.add(arc)
+            extra.append(arc)
+    edges = list(cycle) + extra
+
+    costs = {e: 1000 for e in cycle}
+    costs.update(zip(extra, rng.integers(1, 101, size=len(extra)).tolist()))
+    capacities = {e: float('inf') for e in edges}
+    limited = rng.random(len(extra)) < capacitated_fraction
+    capacities.update((e, int(c)) for e, c, l in zip(extra, rng.integers(50, 500, size=len(extra)), limited) if l)
+
+    # Balanced integer supplies (negative) and demands (positive)
+    n_terminals = max(1, int(supply_fraction * n_nodes))
+    terminals = rng.choice(nodes, size=min(2 * n_terminals, n_nodes), replace=False).tolist()
+    sources, sinks = terminals[:len(terminals) // 2], terminals[len(terminals) // 2:]
+    demands = dict.fromkeys(nodes, 0)
+    amounts = rng.integers(100, 1000, size=len(sources))
+    for node, amount in zip(sources, amounts.tolist()):
+        demands[node] = -amount
+    share = np.full(len(sinks), amounts.sum() // len(sinks))
+    share[:amounts.sum() % len(sinks)] += 1
+    for node, amount in zip(sinks, share.tolist()):
+        demands[node] = amount
+    return nodes, edges, demands, costs, capacities
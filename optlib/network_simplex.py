@@ -0,0 +1,261 @@
+"""Primal network simplex for the transshipment (min-cost flow) problem.
+
+Works on the dictionaries of HW6_5_2.py: nodes, arcs (i, j), demands
+(inflow - outflow), costs and capacities (float('inf') when uncapacitated).
+
+The basis is a spanning tree rooted at an artificial node, stored in flat
+arrays: parent, the arc to the parent, subtree size, and a preorder thread
+(next, prev, last descendant) that lists any subtree without a search. Every
+node starts with an expensive artificial arc to the root (big-M phase one).
+Entering arcs are priced by candidate list: blocks of arcs are scanned until
+enough eligible arcs are collected, and then several pivots take the best
+arc from that list before it is rebuilt. Reduced costs, flows and potentials
+are NumPy arrays, so pricing and the flow and potential updates are
+vectorized; the tree updates are O(depth) list operations.
+
+The leaving arc is the last blocking arc on the cycle met from the apex in
+the direction of the flow change, which keeps the tree strongly feasible
+and rules out cycling.
+"""
+import math
+
+import numpy as np
+
+
+def network_simplex(nodes, edges, demands, costs, capacities, list_size=None, minor_iterations=None,
+                    max_iter=None):
+    """Minimum-cost flow by the primal network simplex method.
+
+    Returns a dict with the flow and reduced cost per arc, the node potentials
+    (the duals of the conservation rows inflow - outflow = demand, zero at the
+    first node), the total cost, the status ('optimal', 'infeasible' or
+    'unbounded') and the number of pivots.
+
+    The potentials are optimal duals: reduced costs c_ij + pi_i - pi_j are
+    >= 0 on arcs at zero flow, <= 0 on arcs at capacity and 0 on arcs in
+    between. They are unique (up to the constant fixed by the first node)
+    only when the optimal flow is nondegenerate; otherwise they are one of
+    many optimal duals and may differ from the duals an LP solver returns.
+    """
+    n, m = len(nodes), len(edges)
+    index = {node: k for k, node in enumerate(nodes)}
+    d = np.array([demands[node] for node in nodes], dtype=float)
+    if abs(d.sum()) > 1e-9 * max(1.0, np.abs(d).sum()):
+        raise ValueError('Total supply and demand are not balanced')
+    root = n
+
+    # Real arcs 0..m-1, then one artificial arc per node (m + k for node k)
+    S = np.empty(m + n, dtype=np.int64)
+    T = np.empty(m + n, dtype=np.int64)
+    S[:m] = [index[i] for i, _ in edges]
+    T[:m] = [index[j] for _, j in edges]
+    C = np.empty(m + n)
+    C[:m] = [costs[e] for e in edges]
+    U = np.empty(m + n)
+    U[:m] = [capacities[e] for e in edges]
+    infinite = np.isinf(U[:m])
+
+    # Big M: larger than the cost of any flow that avoids the artificial arcs
+    finite_capacity = U[:m][~infinite].sum()
+    faux_inf = 3 * max(np.abs(C[:m]).sum(), finite_capacity, np.abs(d).sum(), 1.0)
+    U[:m][infinite] = faux_inf
+    tol = 1e-12 * faux_inf
+
+    supply = d <= 0
+    k = np.arange(n)
+    S[m:] = np.where(supply, k, root)
+    T[m:] = np.where(supply, root, k)
+    C[m:] = faux_inf
+    U[m:] = faux_inf
+    x = np.zeros(m + n)
+    x[m:] = np.abs(d)
+    pi = np.append(np.where(supply, faux_inf, -faux_inf), 0.0)
+
+    # Spanning tree: every node hangs from the root by its artificial arc
+    parent = [root] * n + [None]
+    pred = list(range(m, m + n)) + [None]
+    size = [1] * n + [n + 1]
+    next_ = list(range(1, n + 1)) + [0]
+    prev = [root] + list(range(n))
+    last = list(range(n)) + [n - 1]
+
+    def reduced_costs(arcs):
+        c = C[arcs] - pi[S[arcs]] + pi[T[arcs]]
+        return np.where(x[arcs] == 0, c, -c)
+
+    def find_apex(p, q):
+        size_p, size_q = size[p], size[q]
+        while True:
+            while size_p < size_q:
+                p = parent[p]
+                size_p = size[p]
+            while size_p > size_q:
+                q = parent[q]
+                size_q = size[q]
+            if size_p == size_q:
+                if p == q:
+                    return p
+                p, q = parent[p], parent[q]
+                size_p, size_q = size[p], size[q]
+
+    def trace_path(p, w):
+        path_nodes, path_arcs = [p], []
+        while p != w:
+            path_arcs.append(pred[p])
+            p = parent[p]
+            path_nodes.append(p)
+        return path_nodes, path_arcs
+
+    def find_cycle(i, p, q):
+        # Cycle of the entering arc i oriented p -> q, listed from the apex through p, i and q
+        w = find_apex(p, q)
+        cycle_nodes, cycle_arcs = trace_path(p, w)
+        cycle_nodes.reverse()
+        cycle_arcs.reverse()
+        if cycle_arcs != [i]:
+            cycle_arcs.append(i)
+        q_nodes, q_arcs = trace_path(q, w)
+        del q_nodes[-1]
+        return cycle_nodes + q_nodes, cycle_arcs + q_arcs
+
+    def remove_arc(s, t):
+        # Detach the subtree of t from its parent s
+        size_t, prev_t, last_t = size[t], prev[t], last[t]
+        next_last_t = next_[last_t]
+        parent[t] = pred[t] = None
+        next_[prev_t] = next_last_t
+        prev[next_last_t] = prev_t
+        next_[last_t] = t
+        prev[t] = last_t
+        while s is not None:
+            size[s] -= size_t
+            if last[s] == last_t:
+                last[s] = prev_t
+            s = parent[s]
+
+    def make_root(q):
+        # Re-hang the detached subtree from q
+        ancestors = []
+        while q is not None:
+            ancestors.append(q)
+            q = parent[q]
+        ancestors.reverse()
+        for p, q in zip(ancestors, ancestors[1:]):
+            size_p, last_p, prev_q, last_q = size[p], last[p], prev[q], last[q]
+            next_last_q = next_[last_q]
+            parent[p], parent[q] = q, None
+            pred[p], pred[q] = pred[q], None
+            size[p], size[q] = size_p - size[q], size_p
+            next_[prev_q] = next_last_q
+            prev[next_last_q] = prev_q
+            next_[last_q] = q
+            prev[q] = last_q
+            if last_p == last_q:
+                last[p] = last_p = prev_q
+            prev[p] = last_q
+            next_[last_q] = p
+            next_[last_p] = q
+            prev[q] = last_p
+            last[q] = last_p
+
+    def add_arc(i, p, q):
+        # Attach the subtree rooted at q below p through arc i
+        last_p, size_q, last_q = last[p], size[q], last[q]
+        next_last_p = next_[last_p]
+        parent[q], pred[q] = p, i
+        next_[last_p] = q
+        prev[q] = last_p
+        prev[next_last_p] = last_q
+        next_[last_q] = next_last_p
+        while p is not None:
+            size[p] += size_q
+            if last[p] == last_p:
+                last[p] = last_q
+            p = parent[p]
+
+    def thread(first, stop):
+        # Nodes on the preorder thread from first through stop
+        members = [first]
+        while first != stop:
+            first = next_[first]
+            members.append(first)
+        return members
+
+    def pivot(i):
+        if x[i] == 0:
+            p, q = S[i], T[i]
+        else:
+            p, q = T[i], S[i]
+        p, q = int(p), int(q)
+        cycle_nodes, cycle_arcs = find_cycle(i, p, q)
+        arcs = np.array(cycle_arcs)
+        forward = S[arcs] == np.array(cycle_nodes)
+        residual = np.where(forward, U[arcs] - x[arcs], x[arcs])
+        # Last blocking arc on the cycle
+        k = len(arcs) - 1 - int(np.argmin(residual[::-1]))
+        j, s = cycle_arcs[k], cycle_nodes[k]
+        t = int(T[j] if S[j] == s else S[j])
+        delta = residual[k]
+        if delta:
+            x[arcs] += np.where(forward, delta, -delta)
+        if i == j:
+            return
+        if parent[t] != s:
+            s, t = t, s
+        if cycle_arcs.index(i) > k:
+            p, q = q, p
+        remove_arc(s, t)
+        make_root(q)
+        add_arc(i, p, q)
+        # Potentials of the moved subtree shift so that arc i gets a zero reduced cost. Only
+        # differences matter, so when the subtree is the larger side the rest shifts instead.
+        shift = pi[p] - C[i] - pi[q] if q == T[i] else pi[p] + C[i] - pi[q]
+        if 2 * size[q] <= n + 1:
+            pi[thread(q, last[q])] += shift
+        else:
+            pi[thread(next_[last[q]], prev[q])] -= shift
+
+    # Candidate-list pricing over the real arcs; zero-capacity arcs never enter
+    priced = np.flatnonzero(U[:m] > 0)
+    block = max(1, int(math.ceil(math.sqrt(len(priced)))))
+    list_size = list_size or max(10, block // 4)
+    minor_iterations = minor_iterations or max(5, list_size // 2)
+    max_iter = max_iter or 100 * (m + n)
+    start = 0
+    iterations = 0
+    while iterations < max_iter and len(priced):
+        candidates = []
+        found = scanned = 0
+        while found < list_size and scanned < len(priced):
+            arcs = priced[np.arange(start, start + block) % len(priced)]
+            start = (start + block) % len(priced)
+            scanned += block
+            eligible = arcs[reduced_costs(arcs) < -tol]
+            candidates.append(eligible)
+            found += len(eligible)
+        if not found:
+            break
+        candidates = np.unique(np.concatenate(candidates))
+        for _ in range(minor_iterations):
+            rc = reduced_costs(candidates)
+            best = int(np.argmin(rc))
+            if rc[best] >= -tol:
+                break
+            pivot(int(candidates[best]))
+            iterations += 1
+
+    if np.any(x[m:] > tol):
+        status = 'infeasible'
+    elif np.any(x[:m][infinite] * 2 > faux_inf):
+        status = 'unbounded'
+    elif iterations >= max_iter:
+        status = 'max_iter'
+    else:
+        status = 'optimal'
+
+    flow = x[:m]
+    potential = pi[0] - pi[:n]
+    rc = C[:m] - pi[S[:m]] + pi[T[:m]]
+    return {'flow': dict(zip(edges, flow.tolist())), 'potential': dict(zip(nodes, potential.tolist())),
+            'reduced_cost': dict(zip(edges, rc.tolist())), 'cost': float(C[:m] @ flow), 'status': status,
+            'iterations': iterations}
@@ -0,0 +1,151 @@
+"""Newton's method with Cholesky solves, Hessian reuse and a trust-region fallback.
+
+The Newton system is never inverted. Each Hessian is factored once with a
+modified Cholesky factorization (a multiple of the identity is added until
+the factorization succeeds), so indefinite Hessians still give descent
+directions. A factorization can be reused for several iterations, and when
+the line search along the Newton direction fails the step is recomputed
+inside a trust region.
+"""
+import numpy as np
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, solve_triangular
+
+from optlib.derivatives import FiniteDifference
+from optlib.line_search import LineSearch
+
+
+def modified_cholesky(H, beta=1e-3, max_attempts=60):
+    """Cholesky factor of H + tau*I with the smallest tau from a geometric sequence that works.
+
+    Returns the factor (for cho_solve), tau and the number of factorizations tried.
+    """
+    H = 0.5 * (H + H.T)
+    diag_min = np.min(np.diag(H))
+    tau = 0.0 if diag_min > 0 else beta - diag_min
+    for attempt in range(1, max_attempts + 1):
+        try:
+            factor = cho_factor(H + tau * np.eye(len(H)), lower=True, check_finite=False)
+            return factor, tau, attempt
+        except LinAlgError:
+            tau = max(2 * tau, beta)
+    raise LinAlgError('Modified Cholesky failed: Hessian is not finite')
+
+
+def newton_direction(H, g, beta=1e-3):
+    """Newton direction -(H + tau*I)^-1 g from a modified Cholesky factorization of H."""
+    factor, tau, _ = modified_cholesky(H, beta)
+    return -cho_solve(factor, g, check_finite=False), tau
+
+
+def trust_region_step(H, g, radius, max_iter=5):
+    """Approximate solution of min g'p + p'Hp/2 subject to ||p|| <= radius.
+
+    Newton iteration on the secular equation 1/radius - 1/||p(lam)|| = 0 with
+    p(lam) = -(H + lam*I)^-1 g (Nocedal and Wright, Algorithm 4.3).
+    Returns the step and the number of factorizations.
+    """
+    n = len(g)
+    if n <= 500:
+        eigmin = np.linalg.eigvalsh(H)[0]
+    else:
+        # Gershgorin lower bound on the smallest eigenvalue
+        eigmin = np.min(2 * np.diag(H) - np.abs(H).sum(axis=1))
+    lam = max(0.0, -eigmin + 1e-10 * max(1.0, abs(eigmin)))
+    nfact = 0
+    for _ in range(max_iter):
+        factor, tau, tries = modified_cholesky(H + lam * np.eye(n))
+        lam += tau
+        nfact += tries
+        p = -cho_solve(factor, g, check_finite=False)
+        p_norm = np.linalg.norm(p)
+        if p_norm <= radius * (1 + 1e-2) and (lam == 0 or p_norm >= radius * (1 - 1e-2)):
+            break
+        q = solve_triangular(factor[0], p, lower=True, check_finite=False)
+        lam = max(lam + (p_norm / np.linalg.norm(q))**2 * (p_norm - radius) / radius, lam / 10)
+    if p_norm > radius:
+        p *= radius / p_norm
+    return p, nfact
+
+
+def newton_method(f, x0, derivatives=None, tol=1e-8, max_iter=200, freeze=0, alpha=1e-4, beta=0.5,
+                  max_backtracks=20, radius=1.0, max_radius=1e3, line_search=None):
+    """Globalized Newton's method.
+
+    Each iteration takes the modified-Cholesky Newton direction with an
+    Armijo backtracking line search. With freeze=k a Hessian factorization is
+    reused for up to k further iterations and refreshed as soon as a frozen
+    direction fails. When a fresh direction still fails the line search, the
+    step is taken from the trust-region subproblem and the radius is adapted
+    from the ratio of actual to predicted reduction.
+
+    Returns a dict with the solution, objective, gradient norm, iteration
+    count, counts of Hessian evaluations and factorizations, the derivative
+    backend and the line search (whose counters hold the evaluations).
+    """
+    d = derivatives or FiniteDifference(f, scheme='central')
+    ls = line_search or LineSearch('armijo', c1=alpha, beta=beta, alpha_min=beta**(max_backtracks - 1))
+    x = np.array(x0, dtype=float)
+    fx = d.value(x)
+    factor = None
+    age = 0
+    nhev = nfact = ntrust = 0
+    status = 'max_iter'
+
+    for k in range(max_iter):
+        g = d.gradient(x)
+        if not np.all(np.isfinite(g)):
+            status = 'diverged'
+            break
+        if np.linalg.norm(g) < tol:
+            status = 'converged'
+            break
+
+        fresh = factor is None or age > freeze
+        while True:
+            if fresh:
+                H = d.hessian(x)
+                nhev += 1
+                if not np.all(np.isfinite(H)):
+                    break
+                factor, tau, tries = modified_cholesky(H)
+                nfact += tries
+                age = 0
+            p = -cho_solve(factor, g, check_finite=False)
+            t, f_new, _ = ls(d.value, x, p, fx, g)
+            if t is not None or fresh:
+                break
+            fresh = True  # the frozen factorization stopped working
+        if not np.all(np.isfinite(H)):
+            status = 'diverged'
+            break
+
+        if t is not None:
+            x = x + t * p
+            fx = f_new
+            age += 1
+            radius = min(max(radius, 2 * t * np.linalg.norm(p)), max_radius)
+            continue
+
+        # Trust-region fallback
+        ntrust += 1
+        while True:
+            p, tries = trust_region_step(H, g, radius)
+            nfact += tries
+            predicted = -(g @ p + 0.5 * p @ H @ p)
+            f_new = d.value(x + p)
+            rho = (fx - f_new) / predicted if predicted > 0 and np.isfinite(f_new) else -1.0
+            if rho < 0.25:
+                radius *= 0.25
+            elif rho > 0.75 and np.linalg.norm(p) >= 0.99 * radius:
+                radius = min(2 * radius, max_radius)
+            if rho > 1e-4 or radius < 1e-14:
+                break
+        if rho <= 1e-4:
+            status = 'stalled'
+            break
+        x = x + p
+        fx = f_new
+        factor = None
+
+    return {'x': x, 'fun': fx, 'grad_norm': np.linalg.norm(d.gradient(x)), 'nit': k, 'status': status,
+            'nhev': nhev, 'nfact': nfact, 'ntrust': ntrust, 'derivatives': d, 'line_search': ls}
@@ -0,0 +1,163 @@
+"""Parametric analysis of the min-cost flow LP of HW6 with a persistent HiGHS model.
+
+ParametricFlow loads the transshipment LP of optlib.network once into a
+highspy.Highs instance. Capacities, costs and demands are changed in place
+(column bounds, column costs, row bounds), and every re-solve starts from
+the optimal basis of the previous one, so a sweep over hundreds of values
+costs a few simplex pivots per value instead of a model build and a cold
+solve.
+
+For one parameter t the optimal cost z(t) is piecewise linear: convex in a
+capacity or a demand shift (right-hand sides), concave in a cost. Its slope
+at a solved point comes from the LP itself (reduced costs of the swept
+arcs, the row duals of the shifted demands, or the flow on the swept arcs),
+and the breakpoints are located by intersecting the lines of neighbouring
+points, with a re-solve to confirm each one.
+"""
+import highspy
+import numpy as np
+
+from optlib.sparse_lp import incidence_matrix
+
+
+class ParametricFlow:
+    """Transshipment LP min c'x s.t. B x = demands, 0 <= x <= capacities, kept warm between solves."""
+
+    def __init__(self, nodes, edges, demands, costs, capacities):
+        self.nodes, self.edges = list(nodes), list(edges)
+        B, self.node_index = incidence_matrix(self.nodes, self.edges)
+        self.edge_index = {e: k for k, e in enumerate(self.edges)}
+        self.demands = np.array([demands[i] for i in self.nodes], dtype=float)
+        self.costs = np.array([costs[e] for e in self.edges], dtype=float)
+        self.capacities = np.array([capacities[e] for e in self.edges], dtype=float)
+
+        inf = highspy.kHighsInf
+        B = B.tocsc()
+        self.highs = highspy.Highs()
+        self.highs.setOptionValue('output_flag', False)
+        self.highs.addRows(len(self.nodes), self.demands, self.demands, 0, np.zeros(len(self.nodes), dtype=np.int32),
+                           np.zeros(0, dtype=np.int32), np.zeros(0))
+        self.highs.addCols(len(self.edges), self.costs, np.zeros(len(self.edges)),
+                           np.where(np.isinf(self.capacities), inf, self.capacities), B.nnz,
+                           B.indptr[:-1].astype(np.int32), B.indices.astype(np.int32), B.data.astype(float))
+        self.iterations = 0
+
+    def set_capacity(self, edge, value):
+        k = self.edge_index[edge]
+        self.capacities[k] = value
+        self.highs.changeColBounds(k, 0.0, highspy.kHighsInf if np.isinf(value) else float(value))
+
+    def set_cost(self, edge, value):
+        k = self.edge_index[edge]
+        self.costs[k] = value
+        self.highs.changeColCost(k, float(value))
+
+    def set_demand(self, node, value):
+        i = self.node_index[node]
+        self.demands[i] = value
+        self.highs.changeRowBounds(i, float(value), float(value))
+
+    def solve(self):
+        """Re-solve from the current basis.
+
+        Returns a dict with the status ('optimal', 'infeasible', ...), the
+        objective (None unless optimal), the flow and reduced cost per edge,
+        the node potentials (row duals, d cost / d demand) and the simplex
+        iterations of this solve.
+        """
+        self.highs.run()
+        status = self.highs.getModelStatus()
+        info = self.highs.getInfo()
+        self.iterations += info.simplex_iteration_count
+        result = {'status': self.highs.modelStatusToString(status).lower(), 'objective': None,
+                  'iterations': info.simplex_iteration_count}
+        if status == highspy.HighsModelStatus.kOptimal:
+            solution = self.highs.getSolution()
+            result['status'] = 'optimal'
+            result['objective'] = info.objective_function_value
+            result['flow'] = np.array(solution.col_value)
+            result['reduced_cost'] = np.array(solution.col_dual)
+            result['potential'] = np.array(solution.row_dual)
+        return result
+
+    def _apply(self, t, capacity, cost, demand, base):
+        for e in capacity:
+            self.set_capacity(e, t)
+        for e in cost:
+            self.set_cost(e, t)
+        for node, weight in demand.items():
+            self.set_demand(node, base[node] + weight * t)
+
+    def _slope(self, result, capacity, cost, demand):
+        # d z / d t from the optimal solution at t; only arcs at their capacity have a negative reduced cost
+        slope = sum(min(result['reduced_cost'][self.edge_index[e]], 0.0) for e in capacity)
+        slope += sum(result['flow'][self.edge_index[e]] for e in cost)
+        slope += sum(weight * result['potential'][self.node_index[node]] for node, weight in demand.items())
+        return float(slope)
+
+    def sweep(self, values, capacity=(), cost=(), demand=None, tol=1e-7, max_refine=30):
+        """Optimal cost over a parameter t taking the given values.
+
+        The capacity and the cost of every edge listed in capacity and cost are
+        set to t; demand maps nodes to weights and shifts their base demands by
+        weight * t (weights summing to zero keep the network balanced). The
+        values are solved in order, each warm-started from the last. Returns a
+        dict with the values, the objective and slope at each (None when
+        infeasible), the simplex iterations per value and the breakpoints
+        (t, z(t)) of the piecewise-linear curve between the values. The model
+        is left at its state before the sweep.
+        """
+        capacity, cost, demand = list(capacity), list(cost), dict(demand or {})
+        base = {node: self.demands[self.node_index[node]] for node in demand}
+        saved = ([self.capacities[self.edge_index[e]] for e in capacity],
+                 [self.costs[self.edge_index[e]] for e in cost])
+
+        def evaluate(t):
+            self._apply(t, capacity, cost, demand, base)
+            result = self.solve()
+            if result['status'] != 'optimal':
+                return None, None, result['iterations']
+            return result['objective'], self._slope(result, capacity, cost, demand), result['iterations']
+
+        values = [float(t) for t in values]
+        points = [evaluate(t) for t in values]
+        objective = [z for z, _, _ in points]
+        slope = [s for _, s, _ in points]
+        iterations = [n for _, _, n in points]
+
+        # Breakpoints: where neighbouring lines z_i + s_i (t - t_i) meet, confirmed by a re-solve
+        breakpoints = []
+        stack = [((values[k], objective[k], slope[k]), (values[k + 1], objective[k + 1], slope[k + 1]))
+                 for k in range(len(values) - 1) if objective[k] is not None and objective[k + 1] is not None]
+        stack.reverse()
+        refinements = 0
+        while stack:
+            (t0, z0, s0), (t1, z1, s1) = stack.pop()
+            scale = tol * max(1.0, abs(s0), abs(s1))
+            if abs(s1 - s0) <= scale:
+                continue
+            t = (z1 - z0 + s0 * t0 - s1 * t1) / (s0 - s1)
+            t = min(max(t, min(t0, t1)), max(t0, t1))
+            line = z0 + s0 * (t - t0)
+            if refinements >= max_refine:
+                breakpoints.append((t, line))
+                continue
+            refinements += 1
+            z, s, _ = evaluate(t)
+            if z is not None and abs(z - line) <= tol * max(1.0, abs(z)):
+                breakpoints.append((t, z))
+            elif z is not None and t0 != t != t1:
+                stack.append(((t, z, s), (t1, z1, s1)))
+                stack.append(((t0, z0, s0), (t, z, s)))
+
+        for e, value in zip(capacity, saved[0]):
+            self.set_capacity(e, value)
+        for e, value in zip(cost, saved[1]):
+            self.set_cost(e, value)
+        for node, value in base.items():
+            self.set_demand(node, value)
+        breakpoints.sort()
+        breakpoints = [b for k, b in enumerate(breakpoints)
+                       if k == 0 or b[0] - breakpoints[k - 1][0] > tol * max(1.0, abs(b[0]))]
+        return {'values': values, 'objective': objective, 'slope': slope, 'iterations': iterations,
+                'breakpoints': breakpoints}
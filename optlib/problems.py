@@ -0,0 +1,110 @@
+"""Test objectives shared by the HW2/HW5 scripts and the benchmarks.
+
+Every objective takes an array whose last axis holds the coordinates and
+returns one value per row, so a whole batch of points is one NumPy call.
+"""
+import numpy as np
+
+
+# HW2 objective, generalized to n variables with z = x[:-1], t = x[-1] and m = n - 1:
+# f(x) = t*log((2/m)*sum_i exp(z_i/t)) + (t - 2)^2 + exp(m/(2*sum_i z_i))
+# For n = 3 this is the HW2 function of (x1, x2, x3). The m/2 scalings keep the
+# minimizer at z_i = 0.9262, t = 1.6534 (f = 3.9081) for every n.
+def log_sum_exp(x):
+    z, t = x[..., :-1], x[..., -1]
+    m = z.shape[-1]
+    return t * np.log(np.sum(np.exp(z / t[..., None]), axis=-1) * (2 / m)) + (t - 2)**2 + np.exp(m / (2 * np.sum(z, axis=-1)))
+
+
+LOG_SUM_EXP_MIN = 3.908113786261869
+
+
+def log_sum_exp_start(n):
+    """HW2 starting point (1.1, ..., 1.1) in n variables."""
+    return np.full(n, 1.1)
+
+
+# Six-hump camel function of Calculation.py, f(a, b) = 4a^2 - 2.1a^4 + a^6/3 + ab - 4b^2 + 4b^4
+# Nonconvex with six local minima, two of them global (f = -1.0316)
+def six_hump_camel(x):
+    a, b = x[..., 0], x[..., 1]
+    return 4*a**2 - 2.1*a**4 + 1/3 * a**6 + a*b - 4*b**2 + 4*b**4
+
+
+# Styblinski-Tang function in n variables, 2^n local minima, global minimum at x_i = -2.9035
+def styblinski_tang(x):
+    return 0.5 * np.sum(x**4 - 16*x**2 + 5*x, axis=-1)
+
+
+# Rosenbrock function in n variables, minimum f = 0 at x = (1, ..., 1)
+def rosenbrock(x):
+    return np.sum(100 * (x[..., 1:] - x[..., :-1]**2)**2 + (1 - x[..., :-1])**2, axis=-1)
+
+
+def rosenbrock_start(n):
+    """Classical starting point (-1.2, 1, -1.2, 1, ...)."""
+    return np.where(np.arange(n) % 2 == 0, -1.2, 1.0)
+
+
+# HW5 problem (HW5_0.py), generalized to n variables:
+# min 3/sum(x) + mean(x[1:]) + exp(x1) + sum_i (x_i - x_{i+1})^2
+# s.t. x >= 0, sum(x^2) <= 2, x_i - x_{i+1} <= 1
+# For n = 2 the optimum is x = (0.6179, 0.8317) with objective 4.8020.
+HW5_SOLUTION = np.array([0.61793911, 0.83171409])
+HW5_MIN = 4.801975247778569
+
+
+def hw5_objective(x):
+    """Value, gradient and Hessian of the HW5 objective."""
+    n = len(x)
+    s = np.sum(x)
+    diff = x[:-1] - x[1:]
+    f = 3 / s + np.mean(x[1:]) + np.exp(x[0]) + np.sum(diff**2)
+
+    grad = np.full(n, -3 / s**2)
+    grad[1:] += 1 / (n - 1)
+    grad[0] += np.exp(x[0])
+    grad[:-1] += 2 * diff
+    grad[1:] -= 2 * diff
+
+    # 6/s^3 everywhere, exp(x1) on (1, 1), and the tridiagonal difference Laplacian
+    hess = np.full((n, n), 6 / s**3)
+    hess[0, 0] += np.exp(x[0])
+    i = np.arange(n - 1)
+    hess[i, i] += 2
+    hess[i + 1, i + 1] += 2
+    hess[i, i + 1] -= 2
+    hess[i + 1, i] -= 2
+    return f, grad, hess
+
+
+def hw5_constraints(x):
+    """Values g(x) <= 0 and Jacobian of the HW5 constraints."""
+    n = len(x)
+    i = np.arange(n - 1)
+    J = np.zeros((2 * n, n))
+    J[np.arange(n), np.arange(n)] = -1          # -x_i <= 0
+    J[n] = 2 * x                                # sum(x^2) - 2 <= 0
+    J[n + 1 + i, i] = 1                         # x_i - x_{i+1} - 1 <= 0
+    J[n + 1 + i, i + 1] = -1
+    g = np.concatenate([-x, [np.sum(x**2) - 2], x[:-1] - x[1:] - 1])
+    return g, J
+
+
+def hw5_constraint_hessian(x, w):
+    """sum_i w_i * Hessian(g_i); only sum(x^2) - 2 is nonlinear."""
+    return 2 * w[len(x)] * np.eye(len(x))
+
+
+def hw5_start(n):
+    """Strictly feasible starting point (0.5, ..., 0.5) scaled into the ball."""
+    return np.full(n, min(0.5, 0.9 / np.sqrt(n)))
+
+
+def random_polytope(n, m, seed=0):
+    """m random half-spaces A x <= b that strictly contain the point hw5_start(n)."""
+    rng = np.random.default_rng(seed)
+    A = rng.normal(size=(m, n))
+    A /= np.linalg.norm(A, axis=1, keepdims=True)
+    b = A @ hw5_start(n) + rng.uniform(0.05, 1.0, size=m)
+    return A, b
@@ -0,0 +1,233 @@
+"""Linear data reconciliation by projection onto the balances (HW1_554/HW1_1.py).
+
+Measurements y of the flows with covariance V are reconciled to
+
+    min (x - y)' V^-1 (x - y)   s.t.  A x = 0,  x >= lower
+
+where every row of A is one balance (+1 for streams in, -1 for streams
+out). Without the bounds the solution is linear in y:
+
+    x = P y,   P = I - V A' (A V A')^-1 A
+
+so the Reconciler computes P once and reconciles a whole batch of
+snapshots Y (one per row) as Y P'. Only the snapshots where a reconciled
+flow falls below its bound are solved again as a bounded QP, in one
+highspy.Highs model whose linear term is changed per snapshot and which
+warm-starts from the previous QP.
+"""
+import highspy
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+
+
+def balance_matrix(streams, balances):
+    """Balance matrix of (inlets, outlets) stream lists per node, columns in the order of streams."""
+    column = {s: k for k, s in enumerate(streams)}
+    A = np.zeros((len(balances), len(column)))
+    for row, (inlets, outlets) in enumerate(balances):
+        for s in inlets:
+            A[row, column[s]] += 1.0
+        for s in outlets:
+            A[row, column[s]] -= 1.0
+    return A
+
+
+class Reconciler:
+    """Weighted least-squares reconciliation of measurements under the balances A x = 0.
+
+    sigma holds the standard deviations of the measurements, or is the full
+    covariance matrix V. lower bounds the reconciled flows (None for no
+    bounds).
+    """
+
+    def __init__(self, A, sigma, lower=0.0, tol=1e-9):
+        self.A = np.atleast_2d(np.asarray(A, dtype=float))
+        n = self.A.shape[1]
+        sigma = np.asarray(sigma, dtype=float)
+        self.V = sigma if sigma.ndim == 2 else np.diag(sigma**2)
+        self.lower = None if lower is None else np.broadcast_to(np.asarray(lower, dtype=float), n)
+        self.tol = tol
+        self.dof = np.linalg.matrix_rank(self.A)    # independent balances
+        # Projection onto the balances in the metric of V^-1
+        S = self.A @ self.V @ self.A.T
+        self.S_inv = np.linalg.pinv(S, hermitian=True)
+        self.K = self.V @ self.A.T @ self.S_inv
+        self.P = np.eye(n) - self.K @ self.A
+        self._qp = None
+
+    def _bounded_qp(self):
+        # min x' W x - 2 y' W x  s.t. A x = 0, x >= lower, with W = V^-1; HiGHS takes the Hessian 2W as a lower triangle
+        m, n = self.A.shape
+        self.W = np.linalg.inv(self.V)
+        inf = highspy.kHighsInf
+        lower = self.lower if self.lower is not None else np.full(n, -inf)
+        A = csr_matrix(self.A)
+        H = csc_matrix(np.tril(2 * self.W))
+        qp = highspy.Highs()
+        qp.setOptionValue('output_flag', False)
+        qp.setOptionValue('qp_regularization_value', 0.0)
+        qp.addCols(n, np.zeros(n), lower, np.full(n, inf), 0, np.zeros(n, dtype=np.int32),
+                   np.zeros(0, dtype=np.int32), np.zeros(0))
+        qp.addRows(m, np.zeros(m), np.zeros(m), A.nnz, A.indptr[:-1].astype(np.int32), A.indices.astype(np.int32),
+                   A.data)
+        qp.passHessian(n, H.nnz, highspy.HessianFormat.kTriangular, H.indptr[:-1].astype(np.int32),
+                       H.indices.astype(np.int32), H.data)
+        return qp
+
+    def solve_bounded(self, y):
+        """One snapshot by the bounded QP; returns the reconciled flows."""
+        if self._qp is None:
+            self._qp = self._bounded_qp()
+        n = len(y)
+        self._qp.changeColsCost(n, np.arange(n, dtype=np.int32), -2 * self.W @ y)
+        self._qp.run()
+        if self._qp.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+            raise RuntimeError(f"Bounded reconciliation failed: {self._qp.modelStatusToString(self._qp.getModelStatus())}")
+        return np.array(self._qp.getSolution().col_value)
+
+    def reconcile(self, Y):
+        """Reconcile one snapshot (n,) or a batch (N, n).
+
+        Returns a dict with the reconciled flows x (shape of Y), the balance
+        residuals A y of the measurements, the objective (x - y)' V^-1 (x - y)
+        per snapshot and the snapshots that went through the bounded QP.
+        """
+        Y = np.asarray(Y, dtype=float)
+        batch = np.atleast_2d(Y)
+        residual = batch @ self.A.T
+        X = batch - residual @ self.K.T
+        # Unbounded optimum: (x - y)' V^-1 (x - y) = r' (A V A')^-1 r
+        objective = np.einsum('ij,jk,ik->i', residual, self.S_inv, residual)
+        bounded = np.zeros(0, dtype=np.int64)
+        if self.lower is not None:
+            bounded = np.flatnonzero(np.any(X < self.lower - self.tol, axis=1))
+            for k in bounded.tolist():
+                X[k] = self.solve_bounded(batch[k])
+                d = X[k] - batch[k]
+                objective[k] = d @ self.W @ d
+        if Y.ndim == 1:
+            return {'x': X[0], 'residual': residual[0], 'objective': objective[0], 'bounded': bounded}
+        return {'x': X, 'residual': residual, 'objective': objective, 'bounded': bounded}
+
+
+def random_flowsheet(n_units, n_paths=None, seed=0):
+    """Random flowsheet with consistent true flows, for benchmarks.
+
+    Material enters from and leaves to the environment along n_paths random
+    routes through the units; every unit-to-unit or environment connection
+    used becomes one stream whose true flow is the sum over the routes. The
+    standard deviations are 2% of the flows plus 0.1. Returns the streams,
+    the (inlets, outlets) balance of every unit, the true flows and sigma.
+    """
+    rng = np.random.default_rng(seed)
+    n_paths = n_paths or 2 * n_units
+    flows = {}
+    for _ in range(n_paths):
+        route = [0] + (1 + rng.permutation(n_units)[:rng.integers(1, min(n_units, 6) + 1)]).tolist() + [0]
+        amount = rng.uniform(1, 100)
+        for arc in zip(route[:-1], route[1:]):
+            flows[arc] = flows.get(arc, 0.0) + amount
+    streams = list(flows)
+    balances = [([s for s in streams if s[1] == u], [s for s in streams if s[0] == u]) for u in range(1, n_units + 1)]
+    balances = [b for b in balances if b[0] or b[1]]
+    x = np.array([flows[s] for s in streams])
+    return streams, balances, x, 0.02 * x + 0.1
+
+
+def read_samples(path, delimiter=','):
+    """Measurement vectors from a text file, one sample per line, read lazily.
+
+    A first line that does not parse is taken as a header and skipped, as
+    are blank lines; any other line that does not parse raises ValueError.
+    """
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield np.array(line.split(delimiter), dtype=float)
+            except ValueError:
+                if number == 1:
+                    continue
+                raise ValueError(f"{path}, line {number}: not a sample: {line.strip()!r}") from None
+
+
+class StreamingReconciler:
+    """Reconciliation of a measurement stream over a sliding window of the last window samples.
+
+    Every new sample y_t is reconciled as x_t = y_t - K r_t with the balance
+    residual r_t = A y_t, and the window estimate of the steady state is the
+    reconciled window mean. With adaptive=False the gain K is the fixed
+    projection of the prior standard deviations sigma. With adaptive=True,
+    once the window is full, K = Cov(y, r) Cov(r)^-1 uses the covariances of
+    the samples in the window: moving the window by one sample is a rank-2
+    update of Cov(r), applied to its inverse by two Sherman-Morrison steps,
+    and a rank-3 update of Cov(y, r), so nothing is refactorized per sample.
+    The inverse is recomputed from Cov(r) every refresh samples to stop
+    rounding errors from accumulating. Memory is the window buffer and the
+    n x m and m x m sums, independent of the stream length.
+    """
+
+    def __init__(self, A, sigma, window=60, adaptive=True, refresh=None):
+        self.prior = Reconciler(A, sigma, lower=None)
+        self.A = self.prior.A
+        m, n = self.A.shape
+        self.window, self.adaptive = window, adaptive
+        if adaptive and window <= m + 1:
+            raise ValueError(f"The window needs more than {m + 1} samples to estimate the covariance of {m} balances")
+        self.refresh = refresh or 10 * window
+        self.buffer_y = np.zeros((window, n))
+        self.buffer_r = np.zeros((window, m))
+        self.count = 0                  # samples seen
+        self.mean_y, self.mean_r = np.zeros(n), np.zeros(m)
+        self.C_rr = np.zeros((m, m))    # scatter of the residuals in the window
+        self.C_yr = np.zeros((n, m))    # cross scatter of measurements and residuals
+        self.C_rr_inv = None
+        self.K = self.prior.K
+
+    def update(self, y):
+        """Add one sample; returns the reconciled sample and the reconciled window mean."""
+        y = np.asarray(y, dtype=float)
+        r = self.A @ y
+        k = self.count % self.window
+        W = min(self.count + 1, self.window)
+        y_old, r_old = self.buffer_y[k], self.buffer_r[k]
+        if self.count < self.window:
+            # Growing window (Welford)
+            dy, dr = y - self.mean_y, r - self.mean_r
+            self.mean_y += dy / W
+            self.mean_r += dr / W
+            if self.adaptive:
+                self.C_rr += np.outer(dr, r - self.mean_r)
+                self.C_yr += np.outer(dy, r - self.mean_r)
+                if W == self.window:
+                    self.C_rr_inv = np.linalg.inv(self.C_rr)
+        else:
+            # Slide: y_old leaves, y enters
+            dy, dr = y - y_old, r - r_old
+            if self.adaptive:
+                u_r = r_old - self.mean_r
+                self.C_yr += np.outer(y_old - self.mean_y, dr) + np.outer(dy, u_r + dr * (1 - 1 / W))
+                # C_rr += u d' + d u' = ((u + d)(u + d)' - (u - d)(u - d)') / 2 with u = r_old - mean + d (W - 1) / 2W
+                u = u_r + dr * ((W - 1) / (2 * W))
+                update = np.outer(u, dr)
+                self.C_rr += update + update.T
+                if (self.count + 1) % self.refresh == 0:
+                    self.C_rr_inv = np.linalg.inv(self.C_rr)
+                else:
+                    inv = self.C_rr_inv
+                    for v, sign in ((u + dr, 0.5), (u - dr, -0.5)):
+                        w = inv @ v
+                        inv -= np.outer(w, w) * (sign / (1 + sign * (v @ w)))
+            self.mean_y += dy / W
+            self.mean_r += dr / W
+        self.count += 1
+        self.buffer_y[k], self.buffer_r[k] = y, r
+        if self.C_rr_inv is not None:
+            self.K = self.C_yr @ self.C_rr_inv
+        return y - self.K @ r, self.mean_y - self.K @ self.mean_r
+
+    def stream(self, samples):
+        """Reconcile an iterable of samples (a generator, or read_samples of a file) lazily."""
+        for y in samples:
+            yield self.update(y)
@@ -0,0 +1,218 @@
+"""Solver-log capture and a JSON-lines store of solver metrics.
+
+instrument(solver) wraps the solve method of a Pyomo solver. Every solve
+runs with the solver log on, the log is captured (and still echoed when
+the caller asked for tee=True), and parse_log turns it into numbers:
+iterations, barrier and crossover iterations, phase times, branch-and-bound
+nodes, gap, presolve reductions and the model size the solver saw. One
+record per solve, with the script, solver, options, termination condition
+and wall time, is appended to a JSONL file so runs can be compared across
+settings and over time (benchmarks/solver_runs.py prints them).
+
+The parsers cover the logs of Gurobi, CPLEX (also inside a GAMS log),
+HiGHS, IPOPT and CBC. A quantity a log does not report is left out of the
+record, and a log of any other solver gives no metrics (log_solver 'unknown').
+"""
+import io
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+import pyomo.environ as pyo
+from pyomo.common.tee import capture_output
+
+STORE = os.environ.get('OPTLIB_SOLVER_RUNS', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'results', 'solver_runs.jsonl'))
+
+_NUMBER = r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|[-+]?inf)'
+
+
+def _percent(text):
+    return float(text) / 100
+
+
+# Per solver: a text that identifies its log, and (regex, keys) pairs; the last match wins
+PATTERNS = {
+    'gurobi': ('Gurobi Optimizer', [
+        (r'Optimize a model with (\d+) rows, (\d+) columns and (\d+) nonzeros', ('rows', 'columns', 'nonzeros')),
+        (r'Presolve removed (\d+) rows and (\d+) columns', ('presolve_rows_removed', 'presolve_columns_removed')),
+        (rf'Presolve time: {_NUMBER}s', ('presolve_time',)),
+        (rf'Barrier solved model in (\d+) iterations and {_NUMBER} seconds', ('barrier_iterations', 'barrier_time')),
+        (rf'Root relaxation: objective \S+, (\d+) iterations, {_NUMBER} seconds', ('root_iterations', 'root_time')),
+        (rf'Solved in (\d+) iterations and {_NUMBER} seconds', ('iterations', 'solve_time')),
+        (rf'Explored (\d+) nodes \((\d+) simplex iterations\) in {_NUMBER} seconds', ('nodes', 'iterations', 'solve_time')),
+        (rf'Optimal objective\s+{_NUMBER}', ('objective',)),
+        (rf'Best objective {_NUMBER}, best bound {_NUMBER}, gap {_NUMBER}%', ('objective', 'best_bound', ('gap', _percent))),
+    ]),
+    'cplex': ('CPLEX', [
+        (r'(?:LP|MIP) Presolve eliminated (\d+) rows and (\d+) columns', ('presolve_rows_removed', 'presolve_columns_removed')),
+        (rf'Presolve time = {_NUMBER} sec', ('presolve_time',)),
+        (r'Reduced (?:LP|MIP) has (\d+) rows, (\d+) columns, and (\d+) nonzeros',
+         ('presolved_rows', 'presolved_columns', 'presolved_nonzeros')),
+        (rf'Barrier time = {_NUMBER} sec', ('barrier_time',)),
+        (rf'Root relaxation solution time = {_NUMBER} sec', ('root_time',)),
+        (rf'Solution time =\s*{_NUMBER} sec\.\s+Iterations = (\d+)', ('solve_time', 'iterations')),
+        (r'Solution time =.*Nodes = (\d+)', ('nodes',)),
+        (rf'Total \(root\+branch&cut\) =\s*{_NUMBER} sec', ('solve_time',)),
+        (rf'gap = {_NUMBER}, {_NUMBER}%', ('absolute_gap', ('gap', _percent))),
+        (rf'Objective\s*[=:]\s*{_NUMBER}', ('objective',)),
+        # Solve summary of the GAMS link
+        (rf'MIP Solution:\s+{_NUMBER}\s+\((\d+) iterations, (\d+) nodes\)', ('objective', 'iterations', 'nodes')),
+        (rf'Best possible:\s+{_NUMBER}', ('best_bound',)),
+        (rf'Relative gap:\s+{_NUMBER}', ('gap',)),
+    ]),
+    'highs': ('HiGHS', [
+        (r'has (\d+) rows; (\d+) cols; (\d+) nonzeros', ('rows', 'columns', 'nonzeros')),
+        (r'[Rr]eductions: rows \d+\(-(\d+)\); columns \d+\(-(\d+)\)', ('presolve_rows_removed', 'presolve_columns_removed')),
+        (rf'{_NUMBER} \(Presolve\)', ('presolve_time',)),
+        (r'Simplex\s+iterations:\s*(\d+)', ('iterations',)),
+        (r'IPM\s+iterations:\s*(\d+)', ('barrier_iterations',)),
+        (r'Crossover iterations:\s*(\d+)', ('crossover_iterations',)),
+        (rf'Objective value\s*:\s*{_NUMBER}', ('objective',)),
+        (rf'HiGHS run time\s*:\s*{_NUMBER}', ('solve_time',)),
+        (rf'^\s*Primal bound\s+{_NUMBER}', ('objective',)),
+        (rf'^\s*Dual bound\s+{_NUMBER}', ('best_bound',)),
+        (rf'^\s*Gap\s+{_NUMBER}%', (('gap', _percent),)),
+        (rf'^\s*Timing\s+{_NUMBER}', ('solve_time',)),
+        (r'^\s*Nodes\s+(\d+)', ('nodes',)),
+        (r'^\s*LP iterations\s+(\d+)', ('iterations',)),
+    ]),
+    'ipopt': ('Ipopt', [
+        (r'Total number of variables\.+:\s*(\d+)', ('columns',)),
+        (r'Number of Iterations\.+:\s*(\d+)', ('iterations',)),
+        (rf'Objective\.+:\s*\S+\s+{_NUMBER}', ('objective',)),
+        (rf'Total (?:CPU secs|seconds) in IPOPT[^=]*=\s*{_NUMBER}', ('solve_time',)),
+        (rf'Number of objective function evaluations\s*=\s*(\d+)', ('objective_evaluations',)),
+    ]),
+    'cbc': ('Cbc', [
+        (rf'Objective value:\s+{_NUMBER}', ('objective',)),
+        (r'Enumerated nodes:\s+(\d+)', ('nodes',)),
+        (r'Total iterations:\s+(\d+)', ('iterations',)),
+        (rf'Gap:\s+{_NUMBER}', ('gap',)),
+        (rf'Time \(CPU seconds\):\s+{_NUMBER}', ('solve_time',)),
+    ]),
+}
+
+
+def _number(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def detect(text):
+    """Name of the solver that wrote the log, or None."""
+    for name, (signature, _) in PATTERNS.items():
+        if signature in text:
+            return name
+    return None
+
+
+def parse_log(text, solver=None):
+    """Metrics of one solver log as a flat dict; solver picks the parser, otherwise it is detected.
+
+    A log of no known solver gives {}: the patterns of the other families
+    could match it and report wrong numbers.
+    """
+    solver = solver if solver in PATTERNS else detect(text)
+    if solver is None:
+        return {}
+    metrics = {}
+    for pattern, keys in PATTERNS[solver][1]:
+        for match in re.finditer(pattern, text, flags=re.MULTILINE):
+            for key, group in zip(keys, match.groups()):
+                key, convert = key if isinstance(key, tuple) else (key, None)
+                value = _number(group)
+                if value is not None:
+                    metrics[key] = convert(group) if convert else value
+    return metrics
+
+
+def model_size(model):
+    """Active variables, integer variables and constraints of a Pyomo model."""
+    variables = list(model.component_data_objects(pyo.Var, active=True, descend_into=True))
+    return {'variables': len(variables),
+            'integer_variables': sum(1 for v in variables if v.is_integer()),
+            'constraints': sum(1 for _ in model.component_data_objects(pyo.Constraint, active=True, descend_into=True))}
+
+
+def append(record, path=STORE):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record, default=str) + '\n')
+
+
+def load(path=STORE):
+    """All records of a store, oldest first."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class _Echo(io.StringIO):
+    # Keeps the log and passes it on to the real stdout
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+
+    def write(self, text):
+        self.stream.write(text)
+        return super().write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def instrument(solver, store=STORE, tag=None, keep_log=False):
+    """Wrap solver.solve so that every solve is logged, parsed and appended to store.
+
+    The wrapped solve takes the same arguments; tee=True still prints the
+    log. The record of the last solve is kept in solver.last_run, and with
+    keep_log the raw log is stored in the record as well; an
+    optlib.solvers.Solver adds its write/solve/load times. A solve that
+    raises is recorded with status 'error' before the exception propagates.
+    """
+    solve = solver.solve
+    # GAMSShell has no name; its subsolver is in the options
+    name = getattr(solver, 'name', None) or type(solver).__name__.lower().replace('shell', '')
+
+    def instrumented_solve(model, *args, **kwargs):
+        echo = kwargs.pop('tee', False)
+        buffer = _Echo(sys.stdout) if echo else io.StringIO()
+        record = {'time': datetime.now().isoformat(timespec='seconds'),
+                  'script': os.path.relpath(os.path.abspath(sys.argv[0])) if sys.argv and sys.argv[0] else None,
+                  'solver': name, 'options': dict(solver.options), 'tag': tag, 'model': model_size(model)}
+        start = time.perf_counter()
+        try:
+            with capture_output(buffer):
+                results = solve(model, *args, tee=True, **kwargs)
+        except Exception as error:
+            record.update(wall_time=time.perf_counter() - start, status='error', message=str(error))
+            raise
+        else:
+            record['wall_time'] = time.perf_counter() - start
+            record['status'] = str(results.solver.status)
+            record['termination'] = str(results.solver.termination_condition)
+            if getattr(solver, 'last_timing', None) is not None:
+                # optlib.solvers.Solver: write/solve/load split of the solve
+                record['timing'] = solver.last_timing
+            return results
+        finally:
+            text = buffer.getvalue()
+            record['log_solver'] = detect(text) or 'unknown'
+            record['metrics'] = parse_log(text)
+            if keep_log:
+                record['log'] = text
+            solver.last_run = record
+            append(record, store)
+
+    solver.solve = instrumented_solve
+    solver.last_run = None
+    return solver
@@ -0,0 +1,310 @@
+"""Solver selection that runs on machines without Gurobi, CPLEX or GAMS.
+
+select(problem) returns a Solver for the first available candidate of
+CANDIDATES[problem]. The candidates go from in-process persistent
+interfaces (appsi Gurobi and HiGHS, which keep the model in solver memory
+between solves of the same model and only push what changed), through
+solvers that go through a file (appsi CPLEX/Cbc/IPOPT, the executables,
+GAMS), to scipy's trust-constr for continuous nonlinear models, which
+runs in process on the Pyomo expressions and returns a local optimum
+(polished by SLSQP, so that active bounds and constraints hold exactly).
+
+Every solve is split into
+    write   getting the model into the solver (set_instance/update, or the
+            LP/NL/GMS file)
+    solve   the solver itself
+    load    getting the solution back into the Pyomo variables
+and the times are kept in Solver.last_timing and Solver.timings. Files go
+through Pyomo's report_timing, so they have a resolution of 10 ms.
+"""
+import io
+import re
+import sys
+import time
+import warnings
+
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.common.tee import capture_output
+from pyomo.common.timing import HierarchicalTimer
+from pyomo.contrib.appsi.base import SolverFactory as AppsiFactory
+from pyomo.contrib.appsi.base import legacy_solver_status_map, legacy_termination_condition_map
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+from scipy.optimize import Bounds, NonlinearConstraint, approx_fprime, minimize
+
+from optlib.solver_log import _Echo
+
+_MILP = ['appsi_gurobi', 'appsi_highs', 'appsi_cplex', 'appsi_cbc', 'cbc', 'glpk', 'gams:cplex']
+CANDIDATES = {
+    'lp': _MILP,
+    'milp': _MILP,
+    'qp': ['appsi_gurobi', 'appsi_highs', 'appsi_cplex', 'appsi_ipopt', 'ipopt', 'gams:cplex', 'scipy'],
+    'miqp': ['appsi_gurobi', 'appsi_cplex', 'gams:cplex'],
+    'qcp': ['appsi_gurobi', 'appsi_cplex', 'appsi_ipopt', 'ipopt', 'gams:conopt', 'scipy'],
+    'nlp': ['appsi_ipopt', 'ipopt', 'gams:conopt', 'gams:ipopt', 'scipy'],
+    'global': ['gams:baron', 'baron', 'scip', 'appsi_maingo', 'scipy'],
+}
+# appsi timer sections of the solver run and of the solution load; everything else is the write
+_SOLVE_TIMERS = {'optimize', 'subprocess', 'cplex solve', 'MAiNGO solve'}
+_LOAD_TIMERS = {'load solution', 'parse solution'}
+_REPORT_TIMING = re.compile(r'^\s*([\d.]+) seconds required for (presolve|solver|postsolve)', re.M)
+
+
+class Solver:
+    """One solver behind the legacy solve(model, tee) interface of the homework scripts.
+
+    name is an appsi solver ('appsi_highs'), a Pyomo solver ('glpk'), a GAMS
+    subsolver ('gams:cplex') or 'scipy' (trust-constr). The appsi solver
+    object is kept, so solving the same model again is an update of the
+    loaded model. solve returns Pyomo SolverResults and loads the solution
+    into the model.
+    """
+
+    def __init__(self, name, problem=None):
+        self.name = name
+        self.problem = problem
+        self.options = {}
+        self.timings = []
+        self.last_timing = None
+        if name.startswith('appsi_'):
+            self.kind, self._solver = 'appsi', AppsiFactory(name[len('appsi_'):])
+        elif name.startswith('gams:'):
+            self.kind, self._solver = 'gams', pyo.SolverFactory('gams', solver=name[len('gams:'):])
+        elif name == 'scipy':
+            self.kind, self._solver = 'scipy', None
+        else:
+            self.kind, self._solver = 'pyomo', pyo.SolverFactory(name)
+
+    def __repr__(self):
+        return f"Solver({self.name!r})"
+
+    def available(self, exception_flag=False):
+        if self.kind == 'scipy':
+            return True
+        try:
+            return bool(self._solver.available() if self.kind == 'appsi'
+                        else self._solver.available(exception_flag=False))
+        except Exception:
+            if exception_flag:
+                raise
+            return False
+
+    def solve(self, model, tee=False, time_limit=None, mip_gap=None, load_solutions=True, **kwargs):
+        """Solve and load the model; the write/solve/load times go to last_timing.
+
+        time_limit [s] and mip_gap (relative) are translated for every
+        solver. options (a dict, over Solver.options) goes to every backend:
+        the <solver>_options of an appsi solver, the options of a Pyomo
+        solver, or the trust-constr options of scipy.optimize.minimize. Other
+        keyword arguments go to Pyomo solvers as they are; the appsi and
+        scipy backends raise TypeError naming them.
+        """
+        start = time.perf_counter()
+        solve = {'appsi': self._solve_appsi, 'scipy': self._solve_scipy}.get(self.kind, self._solve_file)
+        results, timing = solve(model, tee, time_limit, mip_gap, load_solutions, **kwargs)
+        timing['total'] = time.perf_counter() - start
+        self.last_timing = timing
+        self.timings.append(timing)
+        return results
+
+    def _unsupported(self, kwargs):
+        if kwargs:
+            raise TypeError(f"The {self.name} backend does not accept {', '.join(sorted(kwargs))}; "
+                            "pass solver settings as options={...}")
+
+    def _solve_appsi(self, model, tee, time_limit, mip_gap, load_solutions, options=None, **kwargs):
+        self._unsupported(kwargs)
+        opt = self._solver
+        setattr(opt, self.name[len('appsi_'):] + '_options', {**self.options, **(options or {})})
+        opt.config.stream_solver = tee
+        opt.config.load_solution = False
+        opt.config.time_limit = time_limit
+        if 'mip_gap' in opt.config:
+            opt.config.mip_gap = mip_gap
+        timer = HierarchicalTimer()
+        appsi_results = opt.solve(model, timer=timer)
+        sections = timer.get_timers()
+        timing = {'write': sum(timer.get_total_time(s) for s in sections
+                               if '.' not in s and s not in _SOLVE_TIMERS | _LOAD_TIMERS),
+                  'solve': sum(timer.get_total_time(s) for s in sections if s in _SOLVE_TIMERS)}
+        start = time.perf_counter()
+        if load_solutions and appsi_results.best_feasible_objective is not None:
+            appsi_results.solution_loader.load_vars()
+        timing['load'] = time.perf_counter() - start
+
+        results = SolverResults()
+        results.solver.name = self.name
+        results.solver.status = legacy_solver_status_map[appsi_results.termination_condition]
+        results.solver.termination_condition = legacy_termination_condition_map[appsi_results.termination_condition]
+        results.solver.termination_message = str(appsi_results.termination_condition)
+        sense = next(model.component_data_objects(pyo.Objective, active=True)).sense
+        bounds = (appsi_results.best_objective_bound, appsi_results.best_feasible_objective)
+        results.problem.lower_bound, results.problem.upper_bound = bounds if sense == pyo.minimize else bounds[::-1]
+        results.solver.wallclock_time = timing['solve']
+        return results, timing
+
+    def _solve_file(self, model, tee, time_limit, mip_gap, load_solutions, **kwargs):
+        opt = self._solver
+        options = dict(self.options)
+        solver = self.name.split(':')[-1]
+        if self.kind == 'gams':
+            add_options = list(kwargs.pop('add_options', []))
+            if time_limit is not None:
+                add_options.append(f'option reslim = {time_limit};')
+            if mip_gap is not None:
+                add_options.append(f'option optcr = {mip_gap};')
+            kwargs['add_options'] = add_options
+        else:
+            names = {'cbc': ('seconds', 'ratio'), 'glpk': ('tmlim', 'mipgap'), 'ipopt': ('max_cpu_time', None)}
+            limit_name, gap_name = names.get(solver, ('timelimit', 'mipgap'))
+            if time_limit is not None:
+                options[limit_name] = time_limit
+            if mip_gap is not None and gap_name:
+                options[gap_name] = mip_gap
+            kwargs['options'] = {**options, **kwargs.get('options', {})}
+        buffer = _Echo(sys.stdout) if tee else io.StringIO()
+        start = time.perf_counter()
+        with capture_output(buffer):
+            results = opt.solve(model, tee=tee, report_timing=True, load_solutions=load_solutions, **kwargs)
+        elapsed = time.perf_counter() - start
+        phases = {name: float(value) for value, name in _REPORT_TIMING.findall(buffer.getvalue())}
+        if not phases:
+            # Solvers without report_timing (the in-process contrib interfaces): no split
+            return results, {'write': None, 'solve': elapsed, 'load': None}
+        return results, {'write': phases.get('presolve'), 'solve': phases.get('solver'),
+                         'load': phases.get('postsolve')}
+
+    def _solve_scipy(self, model, tee, time_limit, mip_gap, load_solutions, options=None, **kwargs):
+        # Local NLP solve by scipy's trust-constr on the Pyomo expressions, derivatives by reverse-mode
+        # differentiation of the expressions. The interior point of trust-constr stops about 1e-4 inside
+        # active bounds and constraints, so its point is polished by SLSQP (an active-set method that
+        # lands on them), which is kept when it is feasible and no worse
+        self._unsupported(kwargs)
+        tol = 1e-8
+        settings = {'maxiter': 1000, 'gtol': tol, 'xtol': tol, 'verbose': 2 if tee else 0,
+                    **self.options, **(options or {})}
+        start = time.perf_counter()
+        objective = next(model.component_data_objects(pyo.Objective, active=True))
+        constraints = list(model.component_data_objects(pyo.Constraint, active=True))
+        variables, seen = [], set()
+        for expr in [objective.expr] + [con.body for con in constraints]:
+            for v in identify_variables(expr, include_fixed=False):
+                if id(v) not in seen:
+                    seen.add(id(v))
+                    variables.append(v)
+        if any(v.is_integer() for v in variables):
+            raise ValueError("The scipy backend solves continuous models only; the model has integer variables")
+        lower = np.array([-np.inf if v.lb is None else v.lb for v in variables], dtype=float)
+        upper = np.array([np.inf if v.ub is None else v.ub for v in variables], dtype=float)
+        # Start from the variable values, or the middle of the bounds (the finite bound, 0) when unset
+        middle = np.where(np.isfinite(lower) & np.isfinite(upper), (lower + upper) / 2,
+                          np.where(np.isfinite(lower), lower, np.where(np.isfinite(upper), upper, 0.0)))
+        x0 = np.array([middle[k] if v.value is None else v.value for k, v in enumerate(variables)], dtype=float)
+        sign = 1.0 if objective.sense == pyo.minimize else -1.0
+
+        def set_values(x):
+            for v, value in zip(variables, x):
+                v.set_value(float(value), skip_validation=True)
+
+        def gradient(expr, x, f):
+            set_values(x)
+            try:
+                return np.array(differentiate(expr, wrt_list=variables, mode=differentiate.Modes.reverse_numeric),
+                                dtype=float)
+            except (ZeroDivisionError, ValueError, OverflowError):
+                # Undefined derivative (sqrt or log at 0): forward differences instead
+                return approx_fprime(x, f, 1e-8)
+
+        def evaluator(expr):
+            def value(x):
+                set_values(x)
+                return pyo.value(expr)
+            return value
+
+        objective_value = evaluator(objective.expr)
+        bodies = [con.body for con in constraints]
+        body_values = [evaluator(body) for body in bodies]
+
+        def f(x):
+            return sign * objective_value(x)
+
+        def g(x):
+            set_values(x)
+            return np.array([pyo.value(body) for body in bodies])
+
+        def g_jac(x):
+            return np.array([gradient(body, x, value) for body, value in zip(bodies, body_values)])
+
+        g_lower = np.array([-np.inf if con.lower is None else pyo.value(con.lower) for con in constraints])
+        g_upper = np.array([np.inf if con.upper is None else pyo.value(con.upper) for con in constraints])
+        rows = [NonlinearConstraint(g, g_lower, g_upper, jac=g_jac)] if bodies else []
+
+        def violation(x):
+            bounds = np.max(np.maximum(lower - x, x - upper), initial=0.0)
+            if not bodies:
+                return bounds
+            gx = g(x)
+            return max(bounds, np.max(np.maximum(g_lower - gx, gx - g_upper), initial=0.0))
+
+        timing = {'write': time.perf_counter() - start}
+
+        start = time.perf_counter()
+        def jac(x):
+            return sign * gradient(objective.expr, x, objective_value)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            result = minimize(f, x0, jac=jac, method='trust-constr', bounds=Bounds(lower, upper), constraints=rows,
+                              options=settings)
+            if result.status in (1, 2):
+                with np.errstate(all='ignore'):
+                    polished = minimize(f, result.x, jac=jac, method='SLSQP', bounds=Bounds(lower, upper),
+                                        constraints=rows, options={'maxiter': 100, 'ftol': 1e-12})
+                if polished.success and violation(polished.x) <= 1e-9 and polished.fun <= result.fun + 1e-9:
+                    result.x, result.fun = polished.x, polished.fun
+                    result.constr_violation = violation(polished.x)
+        timing['solve'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        set_values(result.x if load_solutions else x0)
+        timing['load'] = time.perf_counter() - start
+
+        results = SolverResults()
+        results.solver.name = self.name
+        feasible = result.constr_violation <= 1e-6
+        if result.status in (1, 2) and feasible:
+            results.solver.status, condition = SolverStatus.ok, TerminationCondition.locallyOptimal
+        elif result.status == 0:
+            results.solver.status, condition = SolverStatus.warning, TerminationCondition.maxIterations
+        else:
+            results.solver.status, condition = SolverStatus.warning, TerminationCondition.other
+        results.solver.termination_condition = condition
+        results.solver.termination_message = result.message
+        results.solver.wallclock_time = timing['solve']
+        results.problem.lower_bound = results.problem.upper_bound = sign * result.fun
+        return results, timing
+
+
+def candidates(problem='milp', prefer=()):
+    """The candidate names for a problem class, with the preferred ones first."""
+    if problem not in CANDIDATES:
+        raise ValueError(f"Unknown problem class '{problem}', use one of {sorted(CANDIDATES)}")
+    prefer = [prefer] if isinstance(prefer, str) else list(prefer)
+    return prefer + [name for name in CANDIDATES[problem] if name not in prefer]
+
+
+def select(problem='milp', prefer=()):
+    """The first available solver for the problem class ('lp', 'milp', 'qp', 'miqp', 'qcp', 'nlp', 'global').
+
+    prefer puts solver names ahead of the default order, e.g.
+    select('lp', prefer='gams:cplex'). Raises RuntimeError listing the
+    candidates when none is available.
+    """
+    names = candidates(problem, prefer)
+    for name in names:
+        solver = Solver(name, problem)
+        if solver.available():
+            return solver
+    raise RuntimeError(f"No solver for '{problem}' is available; tried {', '.join(names)}")
@@ -0,0 +1,169 @@
+"""Matrix-form LPs assembled as scipy.sparse arrays and solved by HiGHS in memory.
+
+A LinearProgram collects named blocks of variables and constraints, each
+indexed by the labels of the original model (nodes, arcs, (commodity, arc)
+pairs, ...). Coefficients are added as COO triplets, the matrix is built
+once in CSR form and handed to scipy.optimize.linprog(method='highs'), so no
+Pyomo expressions or LP files are generated. Solutions and duals come back
+as dictionaries keyed by the same labels.
+"""
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix, csr_matrix, vstack
+
+
+class LinearProgram:
+    """min (or max) c'x subject to lower <= A x <= upper and bounds on x, with labelled blocks."""
+
+    def __init__(self, sense='minimize'):
+        if sense not in ('minimize', 'maximize'):
+            raise ValueError(f"Unknown sense '{sense}', use 'minimize' or 'maximize'")
+        self.sense = sense
+        self.columns = {}   # block name -> (labels, column indices)
+        self.rows = {}      # block name -> (labels, row indices)
+        self.c, self.x_lower, self.x_upper = [], [], []
+        self.row_lower, self.row_upper = [], []
+        self.triplets = []
+        self.n_columns = 0
+        self.n_rows = 0
+
+    def add_variables(self, name, labels, cost=0.0, lower=0.0, upper=np.inf):
+        """Add one variable per label; returns the dict label -> column index."""
+        labels = list(labels)
+        k = len(labels)
+        index = np.arange(self.n_columns, self.n_columns + k)
+        self.columns[name] = (labels, index)
+        self.c.append(np.broadcast_to(np.asarray(cost, dtype=float), k))
+        self.x_lower.append(np.broadcast_to(np.asarray(lower, dtype=float), k))
+        self.x_upper.append(np.broadcast_to(np.asarray(upper, dtype=float), k))
+        self.n_columns += k
+        return dict(zip(labels, index.tolist()))
+
+    def add_constraints(self, name, labels, rows, cols, values, lower=-np.inf, upper=np.inf):
+        """Add one row per label from COO triplets.
+
+        rows index into labels (0..len(labels)-1), cols are column indices
+        returned by add_variables. Duplicate (row, col) entries are summed.
+        """
+        labels = list(labels)
+        k = len(labels)
+        self.rows[name] = (labels, np.arange(self.n_rows, self.n_rows + k))
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=float), rows.shape)
+        self.triplets.append((rows + self.n_rows, np.asarray(cols, dtype=np.int64), values))
+        self.row_lower.append(np.broadcast_to(np.asarray(lower, dtype=float), k))
+        self.row_upper.append(np.broadcast_to(np.asarray(upper, dtype=float), k))
+        self.n_rows += k
+
+    def matrix(self):
+        """Constraint matrix in CSR form."""
+        if not self.triplets:
+            return csr_matrix((self.n_rows, self.n_columns))
+        rows, cols, values = (np.concatenate(a) for a in zip(*self.triplets))
+        return coo_matrix((values, (rows, cols)), shape=(self.n_rows, self.n_columns)).tocsr()
+
+    def solve(self, method='highs', **options):
+        """Solve with HiGHS; returns a dict with status, objective, and x and duals per block.
+
+        Duals are d(objective)/d(right-hand side) of each row, the convention
+        of Pyomo's dual suffix.
+        """
+        A = self.matrix()
+        c = np.concatenate(self.c) if self.c else np.zeros(0)
+        sign = 1.0 if self.sense == 'minimize' else -1.0
+        lower = np.concatenate(self.row_lower) if self.row_lower else np.zeros(0)
+        upper = np.concatenate(self.row_upper) if self.row_upper else np.zeros(0)
+
+        # linprog takes A_eq x = b_eq and A_ub x <= b_ub; lower bounds become -A x <= -lower
+        equal = lower == upper
+        has_upper = ~equal & np.isfinite(upper)
+        has_lower = ~equal & np.isfinite(lower)
+        eq, ub, lb = np.flatnonzero(equal), np.flatnonzero(has_upper), np.flatnonzero(has_lower)
+        A_ub = b_ub = A_eq = b_eq = None
+        if len(ub) + len(lb):
+            A_ub = vstack([A[ub], -A[lb]], format='csr')
+            b_ub = np.concatenate([upper[ub], -lower[lb]])
+        if len(eq):
+            A_eq, b_eq = A[eq], upper[eq]
+        result = linprog(sign * c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                         bounds=np.column_stack([np.concatenate(self.x_lower), np.concatenate(self.x_upper)]),
+                         method=method, options=options or None)
+
+        solution = {'status': result.status, 'message': result.message, 'success': result.success,
+                    'objective': None, 'x': {}, 'duals': {}, 'x_array': result.x}
+        if not result.success:
+            return solution
+        solution['objective'] = sign * result.fun
+        for name, (labels, index) in self.columns.items():
+            solution['x'][name] = dict(zip(labels, result.x[index].tolist()))
+
+        duals = np.zeros(self.n_rows)
+        if len(eq):
+            duals[eq] = result.eqlin.marginals
+        if A_ub is not None:
+            marginals = result.ineqlin.marginals
+            duals[ub] += marginals[:len(ub)]
+            duals[lb] -= marginals[len(ub):]
+        duals *= sign
+        for name, (labels, index) in self.rows.items():
+            solution['duals'][name] = dict(zip(labels, duals[index].tolist()))
+        return solution
+
+
+def incidence_matrix(nodes, edges):
+    """Node-arc incidence matrix (inflow - outflow) in CSR form, with the node index map."""
+    index = {node: k for k, node in enumerate(nodes)}
+    tails = np.array([index[i] for i, _ in edges], dtype=np.int64)
+    heads = np.array([index[j] for _, j in edges], dtype=np.int64)
+    arcs = np.arange(len(edges))
+    B = coo_matrix((np.concatenate([np.ones(len(edges)), -np.ones(len(edges))]),
+                    (np.concatenate([heads, tails]), np.concatenate([arcs, arcs]))),
+                   shape=(len(nodes), len(edges)))
+    return B.tocsr(), index
+
+
+def min_cost_flow_lp(nodes, edges, demands, costs, capacities):
+    """Transshipment problem of HW6_5_2.py in matrix form.
+
+    Returns the LinearProgram; its solution has x['Flow'] per arc and
+    duals['FlowConservation'] per node.
+    """
+    lp = LinearProgram()
+    lp.add_variables('Flow', edges, cost=[costs[e] for e in edges], upper=[capacities[e] for e in edges])
+    B, _ = incidence_matrix(nodes, edges)
+    B = B.tocoo()
+    d = [demands[node] for node in nodes]
+    lp.add_constraints('FlowConservation', nodes, B.row, B.col, B.data, lower=d, upper=d)
+    return lp
+
+
+def multicommodity_flow_lp(nodes, edges, commodities, source, sink, demands, costs, capacities):
+    """Multicommodity min-cost flow of HW2_4.py in matrix form.
+
+    Commodity k ships demands[k] from source[k] to sink[k]; the arcs share
+    their capacities. The conservation rows are the block-diagonal
+    kron(I_K, B) of the incidence matrix B, and the capacity rows are K
+    identity blocks side by side. The solution has x['flow'] per
+    (commodity, arc), duals['capacity'] per arc and duals['flow_conservation']
+    per (node, commodity).
+    """
+    nodes, edges, commodities = list(nodes), list(edges), list(commodities)
+    n, m, K = len(nodes), len(edges), len(commodities)
+    lp = LinearProgram()
+    cost = np.array([costs[e] for e in edges], dtype=float)
+    lp.add_variables('flow', [(k, e) for k in commodities for e in edges], cost=np.tile(cost, K))
+
+    arcs = np.tile(np.arange(m), K)
+    lp.add_constraints('capacity', edges, arcs, np.arange(K * m), 1.0, upper=[capacities[e] for e in edges])
+
+    B, index = incidence_matrix(nodes, edges)
+    B = B.tocoo()
+    offsets = np.repeat(np.arange(K), len(B.data))
+    rhs = np.zeros((K, n))
+    for c, k in enumerate(commodities):
+        rhs[c, index[source[k]]] = -demands[k]
+        rhs[c, index[sink[k]]] = demands[k]
+    lp.add_constraints('flow_conservation', [(node, k) for k in commodities for node in nodes],
+                       np.tile(B.row, K) + n * offsets, np.tile(B.col, K) + m * offsets, np.tile(B.data, K),
+                       lower=rhs.ravel(), upper=rhs.ravel())
+    return lp
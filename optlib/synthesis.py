@@ -0,0 +1,386 @@
+"""Process-synthesis MILP of HW7 with every datum a mutable Param.
+
+The model of HW7_1_1.py and HW7_1_2.py: A is bought (or not) and converted
+to B in process 1, B is bought and/or produced and converted to C in either
+process 2 or process 3, and C is sold up to its demand CUB. Case 2 of the
+homework sells up to CXUB more C at the price p_extra, so case 1 is the
+same model with CXUB = 0.
+
+Supply and demand limits, prices, costs and conversions are mutable
+Params, and the big-M bounds are expressions of them, so a scenario only
+changes Param values. scenario_sweep solves the scenarios with one
+persistent appsi solver: the model is loaded once, and before every solve
+only the Param values that changed are set and pushed to the solver as
+coefficient, bound and cost updates.
+
+superstructure_model generates the same kind of model for any number of
+processes from a process table and a substance table (read_table reads
+them from CSV files), with one indexed balance per substance and one
+indexed activation constraint per process.
+"""
+import csv
+import math
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+from pyomo.contrib.appsi.base import TerminationCondition
+from pyomo.contrib.appsi.solvers import Highs
+
+SUBSTANCES = ['A', 'B', 'C']
+PROCESSES = [1, 2, 3]
+C_FIX = {1: 10, 2: 15, 3: 20}                   # Fixed cost of process i [100$/hr]
+C_VAR = {1: 2.5, 2: 4, 3: 5.5}                  # Variable cost of process i [100$/ton raw]
+CONVERSION = {1: 0.9, 2: 0.82, 3: 0.95}         # Conversion of process i [*]
+PRICES = {'A': 5, 'B': 9.5, 'C': -18}           # Buying (if positive) or selling (if negative) price [100$/ton]
+
+
+def process_model(AUB=16, CUB=10, CXUB=0, p_extra=-15, c_fix=None, c_var=None, x=None, p_s=None):
+    """HW7 model; CXUB=0 is case 1 (HW7_1_1.py) and CXUB=5 case 2 (HW7_1_2.py).
+
+    The components keep the names of the homework model, with the limits
+    AUB, CUB, CXUB and the extra price p_extra as scalar Params.
+    """
+    m = pyo.ConcreteModel()
+
+    # SETS
+    m.S = pyo.Set(initialize=SUBSTANCES)    # Substances
+    m.I = pyo.Set(initialize=PROCESSES)     # Processes
+
+    # PARAMETERS
+    m.c_fix = pyo.Param(m.I, initialize=c_fix or C_FIX, mutable=True)
+    m.c_var = pyo.Param(m.I, initialize=c_var or C_VAR, mutable=True)
+    m.x = pyo.Param(m.I, initialize=x or CONVERSION, mutable=True)
+    m.p_s = pyo.Param(m.S, initialize=p_s or PRICES, mutable=True)
+    m.AUB = pyo.Param(initialize=AUB, mutable=True)         # Maximum supply of A [ton/hr]
+    m.CUB = pyo.Param(initialize=CUB, mutable=True)         # Maximum demand of C [ton/hr]
+    m.CXUB = pyo.Param(initialize=CXUB, mutable=True)       # Maximum excess sale of C [ton/hr]
+    m.p_extra = pyo.Param(initialize=p_extra, mutable=True) # Price of the excess C [100$/ton]
+
+    # Total demand of C, B needed for it in process 2 or 3 (BUB of the homework, per process since the
+    # conversions are Params), and the larger of the two for the B that is bought or produced
+    CTOT = m.CUB + m.CXUB
+    BUB = {i: CTOT / m.x[i] for i in (2, 3)}
+    BMAX = (BUB[2] + BUB[3] + abs(BUB[2] - BUB[3])) / 2
+
+    # VARIABLES
+    m.y = pyo.Var(m.I, within=pyo.Binary)                          # If we install process p
+    m.A = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, m.AUB))  # The amount of A we buy [ton/hr]
+    m.B_buy = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, BMAX))  # The amount of B we buy [ton/hr]
+    m.B_prod = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, BMAX)) # B produced in process 1 [ton/hr]
+    m.B2 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, BUB[2]))   # B put in process 2 [ton/hr]
+    m.B3 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, BUB[3]))   # B put in process 3 [ton/hr]
+    m.C2 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, CTOT))  # C produced in process 2 [ton/hr]
+    m.C3 = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, CTOT))  # C produced in process 3 [ton/hr]
+    m.C = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, m.CUB))  # C sold up to the demand [ton/hr]
+    m.C_extra = pyo.Var(within=pyo.NonNegativeReals, bounds=(0, m.CXUB))  # C sold as excess [ton/hr]
+    m.C_total = pyo.Expression(expr=m.C + m.C_extra)
+
+    # CONSTRAINTS
+    m.exclusive = pyo.Constraint(expr=m.y[2] + m.y[3] == 1)
+    m.balance_A = pyo.Constraint(expr=m.A * m.x[1] == m.B_prod)
+    m.balance_B = pyo.Constraint(expr=m.B_buy + m.B_prod == m.B2 + m.B3)
+    m.balance_C = pyo.Constraint(expr=m.C2 + m.C3 == m.C + m.C_extra)
+    m.balance_C2 = pyo.Constraint(expr=m.C2 == m.B2 * m.x[2])
+    m.balance_C3 = pyo.Constraint(expr=m.C3 == m.B3 * m.x[3])
+    m.A_activation = pyo.Constraint(expr=m.A <= m.AUB * m.y[1])
+    m.B_product_activation = pyo.Constraint(expr=m.B_prod <= BMAX * m.y[1])
+    m.b_act_2 = pyo.Constraint(expr=m.B2 <= BUB[2] * m.y[2])
+    m.b_act_3 = pyo.Constraint(expr=m.B3 <= BUB[3] * m.y[3])
+    m.c_act_2 = pyo.Constraint(expr=m.C2 <= CTOT * m.y[2])
+    m.c_act_3 = pyo.Constraint(expr=m.C3 <= CTOT * m.y[3])
+
+    fixed_costs = sum(m.c_fix[i] * m.y[i] for i in m.I)
+    variable_costs = m.c_var[1] * m.A + m.c_var[2] * m.B2 + m.c_var[3] * m.B3
+    prices = m.p_s['A'] * m.A + m.p_s['B'] * m.B_buy + m.p_s['C'] * m.C + m.p_extra * m.C_extra
+    m.obj = pyo.Objective(expr=fixed_costs + variable_costs + prices)
+    return m
+
+
+def _param_values(model, scenario):
+    # (label, ParamData, value) for every entry of a scenario {name: value or {index: value}}
+    for name, value in scenario.items():
+        param = model.component(name)
+        if param is None or param.ctype is not pyo.Param:
+            raise KeyError(f"{name} is not a Param of the model")
+        if isinstance(value, dict):
+            for index, v in value.items():
+                yield f'{name}[{index}]', param[index], v
+        else:
+            yield name, param, value
+
+
+def _variables(model):
+    """Columns of the default report: the value of every variable, rounded."""
+    return {v.name: round(pyo.value(v), 4) for v in model.component_data_objects(pyo.Var)}
+
+
+def scenario_sweep(model, scenarios, solver=None, report=_variables):
+    """Solve the model for every scenario with one persistent solver.
+
+    A scenario is a dict of Param names to values, or to {index: value} for
+    indexed Params. solver is an appsi solver (appsi Highs by default; Gurobi,
+    CPLEX and Cbc have the same interface). Only the Params that differ from
+    the previous solve are set, and the solver is told that nothing but Param
+    values changed, so it updates those coefficients in place instead of
+    regenerating the model. The Params are restored afterwards. The big-M
+    values of a superstructure_model follow the data: update_big_m runs
+    after every scenario is set.
+
+    Returns one row per scenario: the scenario values, the termination
+    status, the objective, the solve time and report(model) (all variables by
+    default) when optimal.
+    """
+    opt = solver or Highs()
+    opt.config.load_solution = False
+    original = {}
+    rows = []
+    refresh = hasattr(model, '_streams')
+    try:
+        opt.set_instance(model)
+        config = opt.update_config
+        config.check_for_new_or_removed_constraints = False
+        config.check_for_new_or_removed_vars = False
+        config.check_for_new_or_removed_params = False
+        config.check_for_new_objective = False
+        config.update_constraints = False
+        config.update_vars = False
+        config.update_named_expressions = False
+        config.update_params = False
+        for scenario in scenarios:
+            row = {}
+            for label, param, value in _param_values(model, scenario):
+                original.setdefault(label, (param, param.value))
+                if param.value != value:
+                    param.set_value(value)
+                row[label] = value
+            if refresh:
+                update_big_m(model)
+            start = time.perf_counter()
+            opt.update_params()
+            results = opt.solve(model)
+            row['time'] = time.perf_counter() - start
+            row['status'] = results.termination_condition.name
+            row['objective'] = None
+            if results.termination_condition == TerminationCondition.optimal:
+                results.solution_loader.load_vars()
+                row['objective'] = pyo.value(model.obj)
+                row.update(report(model))
+            rows.append(row)
+    finally:
+        for param, value in original.values():
+            param.set_value(value)
+        if refresh:
+            update_big_m(model)
+    return rows
+
+
+def format_table(rows, columns=None, digits=2):
+    """Rows of scenario_sweep as a text table (columns default to the keys of the first row)."""
+    columns = columns or (list(rows[0]) if rows else [])
+    cells = [[c for c in columns]]
+    for row in rows:
+        cells.append(['-' if row.get(c) is None else
+                      f'{round(row[c], digits) + 0.0:.{digits}f}' if isinstance(row[c], float) else str(row[c])
+                      for c in columns])
+    widths = [max(len(line[k]) for line in cells) for k in range(len(columns))]
+    return '\n'.join(' '.join(cell.rjust(w) for cell, w in zip(line, widths)) for line in cells)
+
+
+def read_table(path, delimiter=','):
+    """Rows of a text table with a header line as dicts; numeric fields become floats ('inf' too)."""
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f, delimiter=delimiter))
+    for row in rows:
+        for key, value in row.items():
+            try:
+                row[key] = float(value)
+            except (TypeError, ValueError):
+                pass
+    return rows
+
+
+def _propagate(base, incoming):
+    # bound[s] = base[s] + sum(gain * bound[t] for t, gain in incoming[s]) in topological order (Kahn);
+    # substances on a cycle or behind one are never ready and keep bound inf
+    outgoing = {s: [] for s in base}
+    for s in base:
+        for t, _ in incoming[s]:
+            outgoing[t].append(s)
+    pending = {s: len(incoming[s]) for s in base}
+    ready = [s for s in base if not pending[s]]
+    bound = dict.fromkeys(base, math.inf)
+    while ready:
+        s = ready.pop()
+        bound[s] = base[s] + sum(gain * bound[t] for t, gain in incoming[s])
+        for u in outgoing[s]:
+            pending[u] -= 1
+            if not pending[u]:
+                ready.append(u)
+    return bound
+
+
+def big_m(processes, substances):
+    """Upper bound of the feed of every process from the supply and demand limits.
+
+    The feed of p is at most the input available to it (the supply of its
+    input plus what every process making it could produce) and at most what
+    its output can go to (the demand of the output plus what every process
+    using it could take, over the conversion). As in superstructure_model,
+    missing limits are no supply and no demand.
+    """
+    supply = {s['name']: s.get('supply', 0.0) for s in substances}
+    demand = {s['name']: s.get('demand', 0.0) for s in substances}
+    makers = {s: [] for s in supply}
+    users = {s: [] for s in supply}
+    for p in processes:
+        makers[p['output']].append((p['input'], p['conversion']))
+        users[p['input']].append((p['output'], 1 / p['conversion']))
+    available = _propagate(supply, makers)
+    absorbed = _propagate(demand, users)
+    return {p['name']: min(available[p['input']], absorbed[p['output']] / p['conversion']) for p in processes}
+
+
+def superstructure_model(processes, substances, required=()):
+    """Synthesis MILP of a process superstructure given as tables.
+
+    processes has one row per candidate process: name, input, output,
+    conversion (ton output per ton input), fixed_cost, variable_cost (per ton
+    input) and optionally group. substances has one row per substance: name,
+    price and supply (buying price and limit), value and demand (selling
+    price and limit); missing limits are no supply and no demand, and a
+    supply of inf is unlimited. Processes of one group are alternatives, at
+    most one of them is installed, or exactly one for the groups in required.
+
+    For every substance, bought + made = sold + fed to processes; the feed of
+    a process is at most M y with M from big_m. Prices, limits, costs and
+    conversions are mutable Params as in process_model, so the model works
+    with scenario_sweep. M is a mutable Param too: it is computed from the
+    data when the model is built, and update_big_m recomputes it from the
+    current Param values (scenario_sweep does so before every solve).
+    """
+    names = [p['name'] for p in processes]
+    if len(set(names)) != len(names):
+        raise ValueError("Process names must be unique")
+    M = big_m(processes, substances)
+    unbounded = [p for p in names if math.isinf(M[p])]
+    if unbounded:
+        raise ValueError(f"No supply or demand limit bounds the feed of processes {unbounded}")
+    # Processes making and using every substance, and the members of every group
+    makers = {s['name']: [] for s in substances}
+    users = {s['name']: [] for s in substances}
+    groups = {}
+    for p in processes:
+        makers[p['output']].append(p['name'])
+        users[p['input']].append(p['name'])
+        if p.get('group') not in (None, ''):
+            groups.setdefault(p['group'], []).append(p['name'])
+    missing = [g for g in required if g not in groups]
+    if missing:
+        raise ValueError(f"Required groups {missing} have no processes")
+
+    m = pyo.ConcreteModel()
+
+    # SETS
+    m.S = pyo.Set(initialize=[s['name'] for s in substances])  # Substances
+    m.P = pyo.Set(initialize=names)                             # Candidate processes
+    m.G = pyo.Set(initialize=list(groups))                      # Groups of alternative processes
+
+    # PARAMETERS
+    m.conversion = pyo.Param(m.P, initialize={p['name']: p['conversion'] for p in processes}, mutable=True)
+    m.c_fix = pyo.Param(m.P, initialize={p['name']: p['fixed_cost'] for p in processes}, mutable=True)
+    m.c_var = pyo.Param(m.P, initialize={p['name']: p['variable_cost'] for p in processes}, mutable=True)
+    m.M = pyo.Param(m.P, initialize=M, mutable=True)
+    m.price = pyo.Param(m.S, initialize={s['name']: s.get('price', 0.0) for s in substances}, mutable=True)
+    m.supply = pyo.Param(m.S, initialize={s['name']: s.get('supply', 0.0) for s in substances}, mutable=True)
+    m.value = pyo.Param(m.S, initialize={s['name']: s.get('value', 0.0) for s in substances}, mutable=True)
+    m.demand = pyo.Param(m.S, initialize={s['name']: s.get('demand', 0.0) for s in substances}, mutable=True)
+    # Input and output of every process, for update_big_m
+    m._streams = {p['name']: (p['input'], p['output']) for p in processes}
+
+    # VARIABLES
+    m.y = pyo.Var(m.P, within=pyo.Binary)                              # If we install process p
+    m.feed = pyo.Var(m.P, within=pyo.NonNegativeReals)                 # Feed of process p [ton/hr]
+    m.buy = pyo.Var(m.S, within=pyo.NonNegativeReals, bounds=lambda m, s: (0, m.supply[s]))
+    m.sell = pyo.Var(m.S, within=pyo.NonNegativeReals, bounds=lambda m, s: (0, m.demand[s]))
+
+    # CONSTRAINTS
+    @m.Constraint(m.S)
+    def balance(m, s):
+        made = pyo.quicksum(m.conversion[p] * m.feed[p] for p in makers[s])
+        used = pyo.quicksum(m.feed[p] for p in users[s])
+        return m.buy[s] + made == m.sell[s] + used
+
+    @m.Constraint(m.P)
+    def activation(m, p):
+        return m.feed[p] <= m.M[p] * m.y[p]
+
+    @m.Constraint(m.G)
+    def select(m, g):
+        chosen = pyo.quicksum(m.y[p] for p in groups[g])
+        return chosen == 1 if g in required else chosen <= 1
+
+    @m.Objective()
+    def obj(m):
+        fixed_costs = pyo.quicksum(m.c_fix[p] * m.y[p] for p in m.P)
+        variable_costs = pyo.quicksum(m.c_var[p] * m.feed[p] for p in m.P)
+        prices = pyo.quicksum(m.price[s] * m.buy[s] - m.value[s] * m.sell[s] for s in m.S)
+        return fixed_costs + variable_costs + prices
+
+    return m
+
+
+def update_big_m(model):
+    """Recompute M of a superstructure_model from its current conversions, supplies and demands.
+
+    Returns the processes whose M changed. Raises ValueError when the
+    limits no longer bound the feed of a process.
+    """
+    processes = [{'name': p, 'input': i, 'output': o, 'conversion': pyo.value(model.conversion[p])}
+                 for p, (i, o) in model._streams.items()]
+    substances = [{'name': s, 'supply': pyo.value(model.supply[s]), 'demand': pyo.value(model.demand[s])}
+                  for s in model.S]
+    M = big_m(processes, substances)
+    unbounded = [p for p in M if math.isinf(M[p])]
+    if unbounded:
+        raise ValueError(f"No supply or demand limit bounds the feed of processes {unbounded}")
+    changed = [p for p in M if model.M[p].value != M[p]]
+    for p in changed:
+        model.M[p].set_value(M[p])
+    return changed
+
+
+def hw7_tables():
+    """The network of HW7_1_1.py (case 1) as process and substance tables, with processes 2 and 3 in one group."""
+    processes = [{'name': i, 'input': 'A' if i == 1 else 'B', 'output': 'B' if i == 1 else 'C',
+                  'conversion': CONVERSION[i], 'fixed_cost': C_FIX[i], 'variable_cost': C_VAR[i],
+                  'group': None if i == 1 else 'C'} for i in PROCESSES]
+    substances = [{'name': 'A', 'price': PRICES['A'], 'supply': 16},
+                  {'name': 'B', 'price': PRICES['B'], 'supply': math.inf},
+                  {'name': 'C', 'value': -PRICES['C'], 'demand': 10}]
+    return processes, substances
+
+
+def random_superstructure(n_processes, layers=3, seed=0):
+    """Random superstructure tables for benchmarks.
+
+    Substances sit in layers: raw materials (limited supply), intermediates
+    (bought at a premium, unlimited) and products (limited demand) when
+    layers=3. Every process converts a substance of one layer into one of the
+    next, and the processes making the same substance are alternatives.
+    """
+    rng = np.random.default_rng(seed)
+    width = max(1, round(math.sqrt(n_processes / (layers - 1))))
+    layer = [[f'S{k}_{j}' for j in range(width)] for k in range(layers)]
+    substances = [{'name': s, 'price': rng.uniform(3, 8), 'supply': rng.uniform(10, 30)} for s in layer[0]]
+    for k in range(1, layers - 1):
+        substances += [{'name': s, 'price': rng.uniform(8, 14), 'supply': math.inf} for s in layer[k]]
+    substances += [{'name': s, 'value': rng.uniform(15, 30), 'demand': rng.uniform(5, 20)} for s in layer[-1]]
+    processes = []
+    for i in range(n_processes):
+        k = i % (layers - 1)
+        output = layer[k + 1][rng.integers(width)]
+        processes.append({'name': f'P{i}', 'input': layer[k][rng.integers(width)], 'output': output,
+                          'conversion': rng.uniform(0.6, 0.98), 'fixed_cost': rng.uniform(5, 25),
+                          'variable_cost': rng.uniform(1, 6), 'group': output})
+    return processes, substances